@@ -1,3 +1,7 @@
-import pandas as pd
-df = pd.read_csv("datasets/clean/clean_reviews.csv")
-print(df.columns)
+from src.data.schema import file_version, read_header, Plan
+
+PATH = "datasets/clean/haile_reviews_cleaned.csv"
+
+# Header only: columns as readers see them after the schema migrations
+header = read_header(PATH)
+print(Plan(header, file_version(PATH, header)).columns)
@@ -0,0 +1,137 @@
+# src/benchmarks/dashboard_latency.py
+"""Cold start and per-interaction latency of the Streamlit dashboard.
+
+    python -m src.benchmarks.dashboard_latency
+    python -m src.benchmarks.dashboard_latency --script /tmp/old_streamlit_app.py
+
+Cold start runs the script once in a fresh interpreter (imports included).
+Per-interaction latency is the time of what actually re-executes: a full
+script rerun for sidebar changes, and only the fragment body for widgets
+that live inside an `st.fragment` section.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+SCRIPT = "src/dashboard/streamlit_app.py"
+HEAVY_MODULES = ["matplotlib", "sklearn", "joblib", "scipy"]
+TFIDF_LABEL = "Select sentiment for TF-IDF"
+
+_COLD_START = """
+import sys, time, json
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({script!r}, default_timeout=300).run()
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "errors": len(at.exception),
+                  "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def cold_start(script=SCRIPT, runs=3):
+    times, loaded = [], []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", _COLD_START.format(script=script, heavy=HEAVY_MODULES)],
+                             capture_output=True, text=True, check=True)
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        if r["errors"]:
+            raise RuntimeError(f"{script} raised during the cold start run")
+        times.append(r["seconds"])
+        loaded = r["loaded"]
+    return statistics.median(times), loaded
+
+
+def _timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def full_reruns(script=SCRIPT, repeat=5):
+    """Rerun time of the whole script after each kind of widget interaction."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(script, default_timeout=300).run()
+    results = {}
+
+    hotels = at.sidebar.selectbox[0].options
+    state = {"i": 0}
+
+    def change_hotel():
+        state["i"] += 1
+        at.sidebar.selectbox[0].select(hotels[state["i"] % len(hotels)]).run()
+    results["sidebar hotel filter"] = _timed(change_hotel, repeat)
+
+    def widget(elements, label):
+        return next(e for e in elements if e.label.startswith(label))
+
+    options = widget(at.selectbox, TFIDF_LABEL).options
+
+    def change_tfidf():
+        state["i"] += 1
+        widget(at.selectbox, TFIDF_LABEL).select(options[state["i"] % len(options)]).run()
+    results["tf-idf sentiment select"] = _timed(change_tfidf, repeat)
+
+    def predict():
+        widget(at.text_area, "Enter a review").input("The shower was cold and the staff ignored us.")
+        widget(at.button, "Predict Sentiment").click().run()
+    results["predict sentiment"] = _timed(predict, repeat)
+    return results
+
+
+def fragment_reruns(repeat=5):
+    """Rerun time of each fragment body on its own, as Streamlit executes it."""
+    from streamlit.testing.v1 import AppTest
+    from src.dashboard import layout
+
+    results = {}
+    for name, section in layout.FRAGMENTS.items():
+        at = AppTest.from_function(_run_section, args=(section,), default_timeout=300).run()
+        if at.exception:
+            raise RuntimeError(f"fragment {section} raised: {at.exception[0].message}")
+        results[name] = _timed(at.run, repeat)
+    return results
+
+
+def _run_section(section):
+    # Runs inside AppTest: load the shared data, then only the named section
+    import os
+    import sys
+    import inspect
+    sys.path.insert(0, os.getcwd())
+    from src.dashboard import layout
+    from src.dashboard.callbacks import load_data
+    render = getattr(layout, section)
+    if "filtered_df" in inspect.signature(render).parameters:
+        render(load_data())
+    else:
+        render()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure dashboard latency.")
+    parser.add_argument("--script", default=SCRIPT)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--fragments", action="store_true",
+                        help="also time each fragment body (restructured app only)")
+    args = parser.parse_args(argv)
+    args.script = os.path.abspath(args.script)
+
+    seconds, loaded = cold_start(args.script, runs=args.runs)
+    print(f"cold start                 {seconds * 1000:>8.0f} ms  heavy modules loaded: {loaded or 'none'}")
+    for name, s in full_reruns(args.script).items():
+        print(f"full rerun: {name:<26} {s * 1000:>8.1f} ms")
+    if args.fragments:
+        for name, s in fragment_reruns().items():
+            print(f"fragment:   {name:<26} {s * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# src/benchmarks/lemma_memo_check.py
+"""Agreement and throughput of the lemma-memo cleaning path against clean_text.
+
+    python -m src.benchmarks.lemma_memo_check --rows 1000000 --reference-rows 20000
+
+The reference (`clean_text`, spaCy on every review) runs on the first
+`--reference-rows` reviews; the fast path runs on all `--rows` from an
+empty memo, so its throughput includes filling the memo.
+"""
+import time
+import argparse
+from collections import Counter
+
+from src.benchmarks.synthetic_reviews import generate_reviews
+from src.data.clean_reviews import (
+    MEMO_SIZE, LemmaMemo, clean_text, clean_texts_fast, get_nlp, get_stop_words,
+)
+
+
+def agreement(reference, fast):
+    """Share of reviews cleaned identically, and token-level F1 over all reviews."""
+    same = sum(r == f for r, f in zip(reference, fast))
+    overlap = n_ref = n_fast = 0
+    for r, f in zip(reference, fast):
+        r, f = Counter(r.split()), Counter(f.split())
+        overlap += sum((r & f).values())
+        n_ref += sum(r.values())
+        n_fast += sum(f.values())
+    f1 = 2 * overlap / (n_ref + n_fast) if n_ref + n_fast else 1.0
+    return same / max(len(reference), 1), f1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the lemma memo with clean_text.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--reference-rows", type=int, default=20_000)
+    parser.add_argument("--memo-size", type=int, default=MEMO_SIZE)
+    args = parser.parse_args(argv)
+
+    get_nlp(), get_stop_words()  # model loading is not part of either timing
+    texts = generate_reviews(args.rows)["review_comment"].tolist()
+    reference_texts = texts[:args.reference_rows]
+
+    start = time.perf_counter()
+    reference = [clean_text(t) for t in reference_texts]
+    ref_seconds = time.perf_counter() - start
+
+    memo = LemmaMemo(args.memo_size)
+    start = time.perf_counter()
+    fast = clean_texts_fast(texts, memo)
+    fast_seconds = time.perf_counter() - start
+
+    exact, f1 = agreement(reference, fast[:len(reference)])
+    print(f"agreement on {len(reference):,} reviews: {exact:.2%} identical, token F1 {f1:.4f}")
+    print(f"clean_text        {len(reference) / ref_seconds:>12,.0f} reviews/s")
+    print(f"clean_texts_fast  {len(texts) / fast_seconds:>12,.0f} reviews/s "
+          f"({memo.hits:,} by lookup, {memo.misses:,} through spaCy, {len(memo):,} words in memo)")
+
+
+if __name__ == "__main__":
+    main()
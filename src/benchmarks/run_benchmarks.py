@@ -0,0 +1,452 @@
+# src/benchmarks/run_benchmarks.py
+"""Time and memory-profile every pipeline stage on synthetic data.
+
+    python -m src.benchmarks.run_benchmarks                      # compare with baseline
+    python -m src.benchmarks.run_benchmarks --save-baseline      # record a new baseline
+    python -m src.benchmarks.run_benchmarks --sizes 1000000 --stages dashboard_filter
+
+Exits with status 1 when a stage is slower (or uses more memory) than the
+saved baseline by more than the regression threshold.
+"""
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+
+from src.benchmarks.synthetic_reviews import generate_reviews, write_raw_dir
+
+BASELINE_PATH = "reports/benchmarks/baseline.json"
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+THRESHOLD = 0.25
+# Ignore differences below these, timer and allocator noise dominate there
+MIN_SECONDS_DELTA = 0.05
+MIN_MB_DELTA = 1.0
+
+
+# ------------------------------
+# STAGES
+# Each stage is (prepare, run, max_rows). prepare(n, workdir) builds the
+# inputs outside the measured region; run(inputs) is what gets measured.
+# prepare also imports the code under test and passes it on, so module
+# imports (streamlit, spaCy, scikit-learn) are never timed.
+# ------------------------------
+def _prep_combine(n, workdir):
+    from src.data.combine_csvs import combine_reviews
+    raw_dir = os.path.join(workdir, "raw")
+    write_raw_dir(n, raw_dir)
+    return combine_reviews, raw_dir, os.path.join(workdir, "combined.csv")
+
+
+def _run_combine(args):
+    combine_reviews, raw_dir, out_file = args
+    combine_reviews(raw_dir=raw_dir, out_file=out_file)
+
+
+def _prep_clean_text(n, workdir):
+    from src.data.clean_reviews import clean_text  # loads spaCy outside the timer
+    return clean_text, generate_reviews(n)["review_comment"].tolist()
+
+
+def _run_clean_text(args):
+    clean_text, texts = args
+    for t in texts:
+        clean_text(t)
+
+
+def _prep_clean_text_fast(n, workdir):
+    from src.data.clean_reviews import LemmaMemo, clean_texts_fast, get_nlp, get_stop_words
+    get_nlp(), get_stop_words()
+    return LemmaMemo, clean_texts_fast, generate_reviews(n)["review_comment"].tolist()
+
+
+def _run_clean_text_fast(args):
+    # Starts from an empty memo: the measured time includes filling it
+    LemmaMemo, clean_texts_fast, texts = args
+    clean_texts_fast(texts, LemmaMemo())
+
+
+def _prep_language_id(n, workdir):
+    from src.preprocessing.language_id import LanguageIdentifier, review_language_texts
+    return LanguageIdentifier(), review_language_texts(generate_reviews(n)).tolist()
+
+
+def _run_language_id(args):
+    identifier, texts = args
+    identifier.detect(texts)
+
+
+def _prep_tfidf(n, workdir):
+    from src.modeling.sentiment_pipeline import make_vectorizer
+    return make_vectorizer, generate_reviews(n)["clean_full_text"].fillna("").tolist()
+
+
+def _run_tfidf(args):
+    make_vectorizer, texts = args
+    make_vectorizer().fit_transform(texts)
+
+
+def _prep_train(n, workdir):
+    from src.modeling.sentiment_pipeline import prepare_data, train_and_save
+    df = prepare_data(generate_reviews(n))
+    out_dir = os.path.join(workdir, "sentiment")
+    os.makedirs(out_dir, exist_ok=True)
+    return train_and_save, df, out_dir
+
+
+def _run_train(args):
+    train_and_save, df, out_dir = args
+    train_and_save(df, out_dir=out_dir)
+
+
+def _prep_lda(n, workdir):
+    from src.modeling.topic_modeling import lda_topics
+    out_dir = os.path.join(workdir, "topics")
+    os.makedirs(out_dir, exist_ok=True)
+    return lda_topics, generate_reviews(n), out_dir
+
+
+def _run_lda(args):
+    lda_topics, df, out_dir = args
+    lda_topics(df, n_topics=8, model_dir=out_dir)
+
+
+def _prep_dashboard(n, workdir):
+    from src.dashboard import callbacks
+    import src.data.shared_table  # noqa: F401 (filter_reviews imports it on first call)
+    df = generate_reviews(n)
+    hotel = df["hotel_name"].iloc[0]
+    topic = df["lda_topic"].iloc[0]
+    combos = [
+        ("All Hotels", "All Sentiments", "All Topics"),
+        (hotel, "All Sentiments", "All Topics"),
+        ("All Hotels", "negative", "All Topics"),
+        (hotel, "positive", topic),
+    ]
+    return callbacks, df, combos
+
+
+def _run_dashboard(args):
+    callbacks, df, combos = args
+    for hotel, sentiment, topic in combos:
+        filtered = callbacks.filter_reviews(df, hotel, sentiment, topic)
+        callbacks.compute_kpis(filtered)
+        callbacks.topic_frequencies(filtered)
+
+
+def _prep_search(n, workdir):
+    from src.search.inverted_index import ReviewIndex
+    df = generate_reviews(n)
+    candidates = (df["hotel_name"] == df["hotel_name"].iloc[0]).to_numpy()
+    return ReviewIndex.build(df), candidates
+
+
+def _run_search(args):
+    index, candidates = args
+    for query in ["shower", "pool staff", "slow wifi internet", "breakfast buffet"]:
+        index.search(query, limit=50)
+        index.search(query, limit=50, candidates=candidates)
+
+
+def _prep_browser(n, workdir):
+    from src.dashboard.browser import ReviewBrowser
+    df = generate_reviews(n)
+    mask = (df["sentiment"] == "negative").to_numpy()
+    browser = ReviewBrowser(df)
+    browser.page(mask, "negative", sort_by="Rating")  # first request builds the view
+    return browser, mask
+
+
+def _run_browser(args):
+    browser, mask = args
+    for page in [0, 10, 1_000, 100_000]:
+        for ascending in (True, False):
+            browser.page(mask, "negative", sort_by="Rating", ascending=ascending, page=page)
+
+
+def _prep_rollups(n, workdir):
+    from src.eda.rollups import RollupStore
+    return RollupStore.build(generate_reviews(n)), generate_reviews(1_000, seed=7, start_id=n)
+
+
+def _run_rollups(args):
+    store, batch = args
+    store.ingest(batch)
+    hotel = batch["hotel_name"].iloc[0]
+    for granularity in ["day", "week", "month"]:
+        store.trend(granularity, hotel, window=4)
+        store.trend(granularity, window=4)
+
+
+def _prep_aspects(n, workdir):
+    from src.preprocessing.topic_labeling import AspectTagger, review_texts
+    return AspectTagger(), review_texts(generate_reviews(n))
+
+
+def _run_aspects(args):
+    tagger, texts = args
+    tagger.tag(texts)
+
+
+def _run_aspects_naive(args):
+    # Reference point: one regex scan over every review per keyword
+    import re
+    import numpy as np
+    from src.preprocessing.topic_labeling import ASPECT_LEXICON  # loaded by _prep_aspects
+    _, texts = args
+    lower = texts.str.lower()
+    hits = np.zeros((len(texts), len(ASPECT_LEXICON)), dtype=bool)
+    for j, phrases in enumerate(ASPECT_LEXICON.values()):
+        for phrase in phrases:
+            hits[:, j] |= lower.str.contains(rf"\b{re.escape(phrase)}\b", regex=True).to_numpy()
+
+
+def _prep_explain(n, workdir):
+    from src.modeling.explain import LinearExplainer, format_explanations
+    return LinearExplainer.load(), format_explanations, generate_reviews(n)["clean_full_text"].fillna("").tolist()
+
+
+def _run_explain(args):
+    explainer, format_explanations, texts = args
+    _, terms, values = explainer.explain(texts)
+    format_explanations(terms, values)
+
+
+def _run_explain_naive(args):
+    # Reference point: one sparse row and one sort per review
+    import numpy as np
+    explainer, _, texts = args
+    X = explainer.tfidf.transform(texts).tocsr()
+    for i in range(X.shape[0]):
+        row = X.getrow(i)
+        c = int(np.argmax(explainer.weights @ row.toarray().ravel() + explainer.intercepts))
+        contrib = row.data * explainer.weights[c, row.indices]
+        top = np.argsort(-contrib)[:3]
+        ", ".join(f"{explainer.terms[row.indices[j]]} (+{contrib[j]:.2f})" for j in top if contrib[j] > 0)
+
+
+def _prep_similarity(n, workdir):
+    from src.search.similarity import SimilarityIndex, load_tfidf, review_texts
+    return SimilarityIndex, load_tfidf(), review_texts(generate_reviews(n))
+
+
+def _run_similarity(args):
+    SimilarityIndex, tfidf, texts = args
+    SimilarityIndex.build(texts, tfidf)
+
+
+def _prep_similarity_add(n, workdir):
+    from src.search.similarity import SimilarityIndex, load_tfidf, review_texts
+    tfidf = load_tfidf()
+    index = SimilarityIndex.build(review_texts(generate_reviews(n)), tfidf)
+    return index, review_texts(generate_reviews(1_000, seed=7, start_id=n))
+
+
+def _run_similarity_add(args):
+    index, batch = args
+    index.add_texts(batch)
+    for doc_id in range(0, index.n_docs, max(index.n_docs // 20, 1)):
+        index.similar(doc_id, n=10)
+    index.query("cold shower and no hot water", n=10)
+
+
+def _prep_drift(n, workdir):
+    from src.monitoring import drift
+    vocabularies, predict = drift.load_models()
+    snapshot = drift.TrainingSnapshot(generate_reviews(1_000), vocabularies, predict)
+    return drift, snapshot, predict, generate_reviews(n, seed=7)
+
+
+def _run_drift(args):
+    drift, snapshot, predict, batch = args
+    store = drift.MonitorStore()
+    store.ingest(batch, snapshot, predict)
+    drift.drift_report(store.merged(), snapshot)
+
+
+def _prep_schema(n, workdir):
+    # A file from schema version 1: old rating column name, no sentiment column
+    path = os.path.join(workdir, "reviews_v1.csv")
+    df = generate_reviews(n).rename(columns={"rating_0_5": "rating_1_5"}).drop(columns="sentiment")
+    df.to_csv(path, index=False)
+    from src.data.schema import read_reviews
+    return read_reviews, path
+
+
+def _run_schema(args):
+    read_reviews, path = args
+    read_reviews(path, columns=["hotel_name", "review_comment", "date", "rating_0_5", "sentiment"])
+
+
+STAGES = {
+    "combine_reviews": (_prep_combine, _run_combine, None),
+    "clean_text": (_prep_clean_text, _run_clean_text, 20_000),
+    "clean_text_fast": (_prep_clean_text_fast, _run_clean_text_fast, None),
+    "language_id": (_prep_language_id, _run_language_id, None),
+    "tfidf_fit": (_prep_tfidf, _run_tfidf, None),
+    "train_and_save": (_prep_train, _run_train, 100_000),
+    "lda_topics": (_prep_lda, _run_lda, 10_000),
+    "dashboard_filter": (_prep_dashboard, _run_dashboard, None),
+    "search_query": (_prep_search, _run_search, None),
+    "review_browser_page": (_prep_browser, _run_browser, None),
+    "rollup_ingest_trend": (_prep_rollups, _run_rollups, None),
+    "aspect_tagging": (_prep_aspects, _run_aspects, None),
+    "aspect_tagging_naive": (_prep_aspects, _run_aspects_naive, None),
+    "drift_ingest_report": (_prep_drift, _run_drift, None),
+    "schema_migrate_read": (_prep_schema, _run_schema, None),
+    "explain_reviews": (_prep_explain, _run_explain, None),
+    "explain_reviews_naive": (_prep_explain, _run_explain_naive, 10_000),
+    # All-pairs precomputation is quadratic; 100k rows take minutes
+    "similarity_build": (_prep_similarity, _run_similarity, 20_000),
+    "similarity_add_query": (_prep_similarity_add, _run_similarity_add, 20_000),
+}
+
+
+# ------------------------------
+# MEASUREMENT
+# ------------------------------
+def measure(stage, n, repeat=1, memory=True):
+    prepare, run, _ = STAGES[stage]
+    workdir = tempfile.mkdtemp(prefix=f"bench_{stage}_")
+    sink = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(sink):
+            inputs = prepare(n, workdir)
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run(inputs)
+                best = min(best, time.perf_counter() - start)
+
+            peak_mb = None
+            if memory:
+                # Separate pass: tracemalloc overhead must not leak into timings
+                tracemalloc.start()
+                run(inputs)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                peak_mb = round(peak / 2**20, 2)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {"seconds": round(best, 4), "peak_mb": peak_mb, "rows_per_sec": round(n / best, 1)}
+
+
+def run_suite(stages, sizes, repeat=1, memory=True, no_cap=False):
+    results = {}
+    for stage in stages:
+        max_rows = STAGES[stage][2]
+        results[stage] = {}
+        for n in sizes:
+            if max_rows and n > max_rows and not no_cap:
+                print(f"{stage:<18} {n:>10,}  skipped (above cap of {max_rows:,} rows)")
+                continue
+            try:
+                r = measure(stage, n, repeat=repeat, memory=memory)
+            except Exception as e:
+                # e.g. spaCy model or NLTK data missing on this machine
+                lines = str(e).strip("*\n ").splitlines()
+                print(f"{stage:<18} {n:>10,}  failed: {type(e).__name__} {lines[0] if lines else ''}")
+                continue
+            results[stage][str(n)] = r
+            mem = f"{r['peak_mb']:>9.1f} MB" if r["peak_mb"] is not None else ""
+            print(f"{stage:<18} {n:>10,}  {r['seconds']:>9.3f} s  {mem}")
+    return results
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Return a list of human readable regressions against `baseline`."""
+    regressions = []
+    for stage, by_size in results.items():
+        for n, r in by_size.items():
+            base = baseline.get("results", {}).get(stage, {}).get(n)
+            if not base:
+                continue
+            if (r["seconds"] > base["seconds"] * (1 + threshold)
+                    and r["seconds"] - base["seconds"] > MIN_SECONDS_DELTA):
+                regressions.append(
+                    f"{stage} @ {n} rows: {r['seconds']:.3f}s vs baseline {base['seconds']:.3f}s")
+            if (r["peak_mb"] is not None and base.get("peak_mb") is not None
+                    and r["peak_mb"] > base["peak_mb"] * (1 + threshold)
+                    and r["peak_mb"] - base["peak_mb"] > MIN_MB_DELTA):
+                regressions.append(
+                    f"{stage} @ {n} rows: {r['peak_mb']:.1f} MB vs baseline {base['peak_mb']:.1f} MB")
+    return regressions
+
+
+def unchecked(results, baseline):
+    """"stage @ n rows" for every measurement the baseline has no entry to compare with."""
+    known = baseline.get("results", {})
+    return [f"{stage} @ {n} rows" for stage, by_size in results.items() for n in by_size
+            if n not in known.get(stage, {})]
+
+
+def save_baseline(results, path=BASELINE_PATH, threshold=THRESHOLD):
+    """Write `results` as the baseline; sizes and stages not measured keep their old entries."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    merged = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            merged = json.load(f).get("results", {})
+    for stage, by_size in results.items():
+        merged[stage] = {**merged.get(stage, {}), **by_size}
+    payload = {
+        "threshold": threshold,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        # A stage that failed everywhere (e.g. no spaCy model) has nothing to record
+        "results": {stage: by_size for stage, by_size in merged.items() if by_size},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    print("Saved baseline to", path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the review pipeline stages.")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="allowed slowdown as a fraction (default: baseline's, else 0.25)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--no-cap", action="store_true", help="ignore per-stage row caps")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.stages, args.sizes, repeat=args.repeat,
+                        memory=not args.no_memory, no_cap=args.no_cap)
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline, args.threshold or THRESHOLD)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline at", args.baseline, "- run with --save-baseline first.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    threshold = args.threshold or baseline.get("threshold", THRESHOLD)
+    missing = unchecked(results, baseline)
+    if missing:
+        print(f"\nNot in {args.baseline}, so not checked: {', '.join(missing)}")
+    regressions = compare(results, baseline, threshold)
+    if regressions:
+        print(f"\nREGRESSIONS (threshold {threshold:.0%}):")
+        for r in regressions:
+            print(" -", r)
+        return 1
+    print(f"\nNo regressions against {args.baseline} (threshold {threshold:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
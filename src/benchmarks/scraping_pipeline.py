@@ -0,0 +1,120 @@
+# src/benchmarks/scraping_pipeline.py
+"""Sequential scraping vs the fetch/parse/write pipeline on local pages.
+
+    python -m src.benchmarks.scraping_pipeline --hotels 6 --pages 40 --latency 0.05
+
+Writes chained Booking-style review pages built from synthetic reviews,
+then crawls them twice: the old way (fetch, parse and collect on one
+thread, one DataFrame written at the end) and with ScrapePipeline. Each
+fetch sleeps `--latency` seconds to stand in for the network. Memory is
+the peak traced in the main process, in a second untimed run.
+"""
+import os
+import html
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+import pandas as pd
+
+from src.benchmarks.synthetic_reviews import generate_reviews
+from src.scraping.booking_scraper import BookingSource, parse_booking_page
+from src.scraping.pipeline import ScrapePipeline
+
+REVIEWS_PER_PAGE = 10
+
+
+class SlowBookingSource(BookingSource):
+    """Booking parser over local pages, with a fixed delay per fetch."""
+    latency = 0.05
+
+    def fetch(self, url):
+        time.sleep(self.latency)
+        return super().fetch(url)
+
+
+def write_pages(root, n_hotels, n_pages):
+    """Chained review pages per hotel; returns hotel_key -> first page URL."""
+    df = generate_reviews(n_hotels * n_pages * REVIEWS_PER_PAGE)
+    urls = {}
+    for h in range(n_hotels):
+        hotel_dir = os.path.join(root, f"hotel_{h}")
+        os.makedirs(hotel_dir)
+        for p in range(n_pages):
+            start = (h * n_pages + p) * REVIEWS_PER_PAGE
+            items = "\n".join(
+                f'<li class="review_list_item" data-review-id="{r.review_id}">'
+                f'<div class="review-score-badge">{r.rating_raw}</div>'
+                f'<div class="review_item_header_content">{html.escape(str(r.review_title))}</div>'
+                f'<div class="review_item_review_content">{html.escape(str(r.review_comment))}</div>'
+                f'<p class="review_item_date">Reviewed: {r.date}</p></li>'
+                for r in df.iloc[start:start + REVIEWS_PER_PAGE].itertuples()
+            )
+            nxt = f'<a id="review_next_page_link" href="page{p + 2}.html">Next</a>' if p + 1 < n_pages else ""
+            with open(os.path.join(hotel_dir, f"page{p + 1}.html"), "w", encoding="utf-8") as f:
+                f.write(f"<html><body><ul>{items}</ul>{nxt}</body></html>")
+        urls[f"hotel_{h}"] = "file://" + os.path.abspath(os.path.join(hotel_dir, "page1.html"))
+    return urls
+
+
+def sequential(source, urls, out_dir, max_pages):
+    """The previous scraper loop: one thread, every row kept until the end."""
+    for hotel_key, url in urls.items():
+        reviews = []
+        for _ in range(max_pages):
+            rows, url = parse_booking_page(source.fetch(url), url)
+            reviews.extend(rows)
+            if not url:
+                break
+        os.makedirs(out_dir, exist_ok=True)
+        pd.DataFrame(reviews).to_csv(os.path.join(out_dir, f"{hotel_key}.csv"), index=False)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    # Separate pass: tracemalloc slows the traced (main) process down
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2**20
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scraping pipeline.")
+    parser.add_argument("--hotels", type=int, default=6)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated seconds per fetch")
+    parser.add_argument("--fetch-workers", type=int, default=4)
+    parser.add_argument("--parse-workers", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    SlowBookingSource.latency = args.latency
+    source = SlowBookingSource()
+    workdir = tempfile.mkdtemp(prefix="bench_scrape_")
+    try:
+        urls = write_pages(os.path.join(workdir, "pages"), args.hotels, args.pages)
+        n_rows = args.hotels * args.pages * REVIEWS_PER_PAGE
+
+        seq_s, seq_mb = timed(lambda: sequential(source, urls, os.path.join(workdir, "seq"), args.pages))
+        pipeline = ScrapePipeline(max_pages=args.pages, out_root=os.path.join(workdir, "pipe"),
+                                  fetch_workers=args.fetch_workers, parse_workers=args.parse_workers, delay=0)
+        jobs = [(source, key, url) for key, url in urls.items()]
+        pipe_s, pipe_mb = timed(lambda: pipeline.run(jobs))
+        if pipeline.stats["errors"] or pipeline.stats["rows"] != n_rows:
+            raise RuntimeError(f"pipeline wrote {pipeline.stats['rows']} of {n_rows} rows: {pipeline.stats['errors'][:3]}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{args.hotels} hotels x {args.pages} pages, {n_rows:,} reviews, {args.latency * 1000:.0f} ms per fetch")
+    print(f"sequential  {seq_s:>7.2f} s  {seq_mb:>7.1f} MB peak")
+    print(f"pipeline    {pipe_s:>7.2f} s  {pipe_mb:>7.1f} MB peak  "
+          f"({args.fetch_workers} fetchers, {args.parse_workers} parse processes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# src/benchmarks/shared_table_rss.py
+"""Resident memory of N dashboard sessions: per-session copies vs the shared table.
+
+    python -m src.benchmarks.shared_table_rss --rows 200000 --sessions 1 10 50 --workers 4
+
+Each measurement runs in a fresh process. A "session" holds what one
+dashboard session holds during a rerun with a hotel filter, so N sessions
+are N reruns in flight at once:
+
+- copy:   the frame st.cache_data hands out (unpickled from the cached
+          bytes, one copy per session) plus `df[mask]` for the filter
+- shared: the frame of the memory-mapped SharedReviewTable (the same
+          object for every session) plus `select_rows(df, mask)`
+
+RSS is split into anonymous memory (private to the process) and file
+pages (the mapped table, shared through the page cache). With --workers,
+that many processes of one session each run at once, and PSS (each shared
+page divided among the processes mapping it) is summed over them.
+"""
+import os
+import gc
+import pickle
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+
+import pandas as pd
+
+from src.benchmarks.synthetic_reviews import generate_reviews
+from src.data.shared_table import SharedReviewTable, publish, select_rows
+
+
+def _memory():
+    """Process memory in MB from /proc: rss, anon, file, pss."""
+    out = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile"):
+                out[key] = int(value.split()[0]) / 1024
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                out["Pss"] = int(line.split()[1]) / 1024
+    return {"rss": out["VmRSS"], "anon": out["RssAnon"], "file": out["RssFile"], "pss": out["Pss"]}
+
+
+def _open_sessions(mode, n_sessions, csv_path, shared_dir):
+    if mode == "copy":
+        cached = pickle.dumps(pd.read_csv(csv_path))  # st.cache_data stores the pickled frame
+        load = lambda: pickle.loads(cached)           # ... and unpickles a copy per session
+    else:
+        table = SharedReviewTable(shared_dir)
+        load = table.frame
+    sessions = []
+    for i in range(n_sessions):
+        df = load()
+        hotels = df["hotel_name"].unique()
+        mask = (df["hotel_name"] == hotels[i % len(hotels)]).to_numpy(dtype=bool, na_value=False)
+        filtered = df[mask] if mode == "copy" else select_rows(df, mask)
+        filtered["rating_0_5"].mean()  # a KPI: touches the pages it reads
+        sessions.append((df, filtered))
+    return sessions
+
+
+def _child(mode, n_sessions, csv_path, shared_dir, barrier, results):
+    sessions = _open_sessions(mode, n_sessions, csv_path, shared_dir)
+    gc.collect()
+    if barrier is not None:
+        barrier.wait()  # every worker holds its sessions while the others measure
+    results.put(_memory())
+    if barrier is not None:
+        barrier.wait()
+    del sessions
+
+
+def measure(mode, n_sessions, csv_path, shared_dir, workers=1):
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    barrier = ctx.Barrier(workers) if workers > 1 else None
+    procs = [ctx.Process(target=_child, args=(mode, n_sessions, csv_path, shared_dir, barrier, results))
+             for _ in range(workers)]
+    for p in procs:
+        p.start()
+    out = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return {k: sum(r[k] for r in out) for k in out[0]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dashboard memory per session.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--workers", type=int, default=4, help="processes for the multi-process run (0 to skip)")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="bench_shared_")
+    try:
+        df = generate_reviews(args.rows)
+        csv_path = os.path.join(workdir, "reviews.csv")
+        df.to_csv(csv_path, index=False)
+        shared_dir = os.path.join(workdir, "shared")
+        version = publish(df, shared_dir)
+        size = os.path.getsize(os.path.join(shared_dir, version)) / 2**20
+        del df
+
+        print(f"{args.rows:,} reviews, {size:.0f} MB Arrow file")
+        print(f"{'mode':<8}{'sessions':>9}{'RSS MB':>10}{'anon MB':>10}{'file MB':>10}")
+        for n in args.sessions:
+            for mode in ["copy", "shared"]:
+                m = measure(mode, n, csv_path, shared_dir)
+                print(f"{mode:<8}{n:>9}{m['rss']:>10.0f}{m['anon']:>10.0f}{m['file']:>10.0f}")
+        if args.workers > 1:
+            print(f"\n{args.workers} worker processes, one session each (summed over the processes)")
+            print(f"{'mode':<8}{'RSS MB':>10}{'PSS MB':>10}")
+            for mode in ["copy", "shared"]:
+                m = measure(mode, 1, csv_path, shared_dir, workers=args.workers)
+                print(f"{mode:<8}{m['rss']:>10.0f}{m['pss']:>10.0f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
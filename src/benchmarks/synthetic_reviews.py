@@ -0,0 +1,175 @@
+# src/benchmarks/synthetic_reviews.py
+import os
+import argparse
+import numpy as np
+import pandas as pd
+
+from src.data.schema import read_reviews
+
+SEED_PATH = "datasets/clean/haile_reviews_with_topics.csv"
+
+COLUMNS = [
+    "hotel_name", "source", "review_id", "rating_raw", "rating_0_5",
+    "review_title", "review_comment", "date", "scraped_at", "url",
+    "sentiment", "topics", "source_file", "clean_comment",
+    "clean_full_text", "lda_topic",
+]
+
+# Columns a raw scraped file carries (what combine_reviews reads)
+RAW_COLUMNS = COLUMNS[:12]
+
+HOTEL_PREFIX = {
+    "haile_adama_grand.csv": "AD",
+    "haile_addis_ababa_grand.csv": "AA",
+    "haile_arba_minch_grand.csv": "AM",
+    "haile_gondar.csv": "GD",
+    "haile_hawassa.csv": "HW",
+    "haile_ziway_batu.csv": "ZW",
+}
+
+DATE_START = np.datetime64("2024-01-01")
+DATE_DAYS = 730
+
+# Rare-word tail: real review vocabularies keep growing with volume,
+# the 150 seed reviews alone would cap TF-IDF at a few hundred terms.
+TAIL_VOCAB = 50000
+TAIL_PROB = 0.6
+SYLLABLES = np.array(["ka", "lo", "mi", "re", "tu", "sa", "ne", "bo", "di", "fa",
+                      "gu", "ha", "je", "ko", "ma", "ni", "po", "ru", "se", "ti"])
+
+
+def load_seed(path=SEED_PATH):
+    seed = read_reviews(path)
+    seed["clean_comment"] = seed["clean_comment"].fillna("")
+    seed["topics"] = seed["topics"].fillna("general")
+    return seed
+
+
+def _tail_words(rng, n):
+    """Zipf-distributed pseudo-words, so term frequencies have a long tail."""
+    ranks = np.minimum(rng.zipf(1.3, size=n), TAIL_VOCAB) - 1
+    a = SYLLABLES[ranks % 20]
+    b = SYLLABLES[(ranks // 20) % 20]
+    c = SYLLABLES[(ranks // 400) % 20]
+    return pd.Series(a).str.cat([pd.Series(b), pd.Series(c)])
+
+
+def generate_reviews(n, seed=42, seed_df=None, start_id=0):
+    """Generate `n` synthetic reviews with the schema of haile_reviews_with_topics.csv.
+
+    Each review is one or two sentences resampled from seed reviews of the
+    same sentiment, so the comment lengths, vocabulary and topic mix follow
+    the real sample; an extra Zipf tail word keeps the vocabulary growing.
+    """
+    rng = np.random.default_rng(seed)
+    if seed_df is None:
+        seed_df = load_seed()
+
+    sent_share = seed_df["sentiment"].value_counts(normalize=True)
+    sentiments = rng.choice(sent_share.index.to_numpy(), size=n, p=sent_share.to_numpy())
+
+    first = np.empty(n, dtype=np.int64)
+    second = np.empty(n, dtype=np.int64)
+    for s in sent_share.index:
+        pool = np.flatnonzero(seed_df["sentiment"].to_numpy() == s)
+        mask = sentiments == s
+        first[mask] = rng.choice(pool, size=mask.sum())
+        second[mask] = rng.choice(pool, size=mask.sum())
+    two = rng.random(n) < 0.35
+
+    a = seed_df.iloc[first].reset_index(drop=True)
+    b = seed_df.iloc[second].reset_index(drop=True)
+
+    comment = a["review_comment"].where(~two, a["review_comment"] + " " + b["review_comment"])
+    clean = a["clean_comment"].where(~two, a["clean_comment"] + " " + b["clean_comment"])
+    topics = a["topics"].where(~two, a["topics"] + "|" + b["topics"])
+    topics = topics.str.split("|").map(lambda t: "|".join(dict.fromkeys(t)))
+
+    tail = rng.random(n) < TAIL_PROB
+    if tail.any():
+        words = _tail_words(rng, int(tail.sum()))
+        comment.loc[tail] = comment[tail] + " " + words.to_numpy()
+        clean.loc[tail] = clean[tail] + " " + words.to_numpy()
+
+    files = np.array(list(HOTEL_PREFIX))
+    hotel_of_file = seed_df.groupby("source_file")["hotel_name"].first()
+    file_idx = rng.integers(0, len(files), size=n)
+    source_file = files[file_idx]
+    ids = pd.Series(np.arange(start_id + 1, start_id + n + 1)).astype(str)
+    prefixes = pd.Series(np.array(list(HOTEL_PREFIX.values()))[file_idx])
+    review_id = prefixes + ids
+
+    sources = seed_df["source"].unique()
+    source = rng.choice(sources, size=n)
+    dates = DATE_START + rng.integers(0, DATE_DAYS, size=n).astype("timedelta64[D]")
+
+    df = pd.DataFrame({
+        "hotel_name": hotel_of_file.reindex(source_file).to_numpy(),
+        "source": source,
+        "review_id": review_id,
+        "rating_raw": a["rating_raw"].to_numpy(),
+        "rating_0_5": a["rating_0_5"].to_numpy(),
+        "review_title": a["review_title"].to_numpy(),
+        "review_comment": comment.to_numpy(),
+        "date": pd.to_datetime(dates).strftime("%Y-%m-%d"),
+        "scraped_at": "2025-12-01",
+        "url": "https://" + pd.Series(source).str.lower().str.replace(" ", "") + ".com/" + review_id,
+        "sentiment": sentiments,
+        "topics": topics.to_numpy(),
+        "source_file": source_file,
+        "clean_comment": clean.to_numpy(),
+    })
+    df["clean_full_text"] = (df["review_title"].astype(str) + " " + df["clean_comment"]).str.strip()
+    df["lda_topic"] = a["lda_topic"].to_numpy()
+    return df[COLUMNS]
+
+
+def iter_chunks(n, chunk_size=100_000, seed=42):
+    """Yield DataFrames totalling `n` rows, so 10^7 rows never sit in memory at once."""
+    seed_df = load_seed()
+    done = 0
+    i = 0
+    while done < n:
+        size = min(chunk_size, n - done)
+        yield generate_reviews(size, seed=seed + i, seed_df=seed_df, start_id=done)
+        done += size
+        i += 1
+
+
+def write_raw_dir(n, out_dir, chunk_size=100_000, seed=42):
+    """Write `n` rows as per-hotel raw CSVs, laid out like datasets/raw/haile_reviews."""
+    os.makedirs(out_dir, exist_ok=True)
+    written = set()
+    for chunk in iter_chunks(n, chunk_size=chunk_size, seed=seed):
+        for fname, part in chunk.groupby("source_file"):
+            path = os.path.join(out_dir, fname)
+            # The first write of a run replaces a file left by an earlier run
+            first = fname not in written
+            part[RAW_COLUMNS].to_csv(path, mode="w" if first else "a", index=False,
+                                     header=first, encoding="utf-8")
+            written.add(fname)
+    return out_dir
+
+
+def write_clean_file(n, out_file, chunk_size=100_000, seed=42):
+    """Write `n` rows in the haile_reviews_with_topics.csv schema to one CSV."""
+    os.makedirs(os.path.dirname(out_file) or ".", exist_ok=True)
+    for i, chunk in enumerate(iter_chunks(n, chunk_size=chunk_size, seed=seed)):
+        chunk.to_csv(out_file, mode="w" if i == 0 else "a", index=False,
+                     header=i == 0, encoding="utf-8")
+    return out_file
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic Haile reviews.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--out", required=True, help="CSV file, or directory with --raw")
+    parser.add_argument("--raw", action="store_true", help="write per-hotel raw CSVs")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.raw:
+        write_raw_dir(args.rows, args.out, seed=args.seed)
+    else:
+        write_clean_file(args.rows, args.out, seed=args.seed)
+    print("Wrote", args.rows, "synthetic reviews to", args.out)
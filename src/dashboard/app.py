@@ -0,0 +1,39 @@
+# src/dashboard/app.py
+import streamlit as st
+
+from src.dashboard import layout
+from src.data.shared_table import select_rows
+from src.dashboard.callbacks import (
+    load_data, load_search_index, filter_mask, rows_mask, search_reviews,
+)
+
+
+def main():
+    st.set_page_config(
+        page_title="Haile Hotels & Resorts — Review Analytics",
+        layout="wide",
+    )
+
+    df = load_data()
+
+    hotel, sentiment, topic, search_query = layout.render_sidebar(df)
+
+    mask = filter_mask(df, hotel, sentiment, topic)
+    filtered_df = select_rows(df, mask)  # a view of the shared table where possible
+    if search_query.strip():
+        # The index (and scikit-learn) is only loaded once someone searches
+        filtered_df = search_reviews(df, filtered_df, load_search_index(), search_query)
+        mask = rows_mask(df, filtered_df)
+    filter_key = (hotel, sentiment, topic, search_query.strip())
+
+    layout.render_header()
+    layout.render_kpis(filtered_df)
+    layout.render_rating_distribution(filtered_df)
+    layout.render_sentiment_distribution(filtered_df)
+    layout.render_topic_frequencies(filtered_df)
+    layout.render_aspects(mask)
+    layout.render_trends(hotel)
+    layout.render_tfidf_terms(filtered_df)
+    layout.render_review_table(filtered_df, mask, filter_key)
+    layout.render_similar_reviews(filtered_df)
+    layout.render_predictor()
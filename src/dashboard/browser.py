@@ -0,0 +1,90 @@
+# src/dashboard/browser.py
+"""Server-side paging and sorting over the review table.
+
+Sort orders for every sortable column are computed once over the full
+frame. A filtered, sorted view is the precomputed order with the filter
+mask applied (cached per filter), and a page is a slice of it, so only the
+rows on screen are ever materialised and sent to the browser.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+SORT_COLUMNS = {
+    "Rating": "rating_0_5",
+    "Date": "date",
+    "Hotel": "hotel_name",
+}
+VIEW_CACHE_SIZE = 32
+
+
+class ReviewBrowser:
+    def __init__(self, df, sort_columns=SORT_COLUMNS):
+        self.df = df
+        self.orders = {}
+        for label, col in sort_columns.items():
+            if col not in df.columns:
+                continue
+            values = df[col]
+            if col == "date":
+                values = pd.to_datetime(values, errors="coerce")
+            is_null = values.isna().to_numpy()
+            # Stable ascending order of the non-null values, nulls at the end
+            valid = np.flatnonzero(~is_null)
+            valid = valid[np.argsort(values.to_numpy()[valid], kind="stable")]
+            self.orders[label] = (np.concatenate([valid, np.flatnonzero(is_null)]), is_null)
+        self._views = OrderedDict()
+        # Shared by all dashboard sessions (st.cache_resource)
+        self._lock = threading.Lock()
+
+    @property
+    def sort_options(self):
+        return list(self.orders)
+
+    def _view(self, filter_key, mask, sort_by):
+        """Filtered positions in sort order and how many of them are non-null."""
+        order, is_null = self.orders[sort_by]
+        if mask is not None and filter_key is None:
+            view = order[mask[order]]
+            return view, int((~is_null[view]).sum())
+
+        key = (filter_key, sort_by)
+        with self._lock:
+            if key in self._views:
+                self._views.move_to_end(key)
+                return self._views[key]
+        view = order if mask is None else order[mask[order]]
+        result = view, int((~is_null[view]).sum())
+        with self._lock:
+            self._views[key] = result
+            if len(self._views) > VIEW_CACHE_SIZE:
+                self._views.popitem(last=False)
+        return result
+
+    def page(self, mask=None, filter_key=None, sort_by="Date", ascending=False,
+             page=0, page_size=50, columns=None):
+        """Return (rows of the requested page, total rows in the filtered view).
+
+        `mask` is a boolean array over the rows of the browser's frame and
+        `filter_key` any hashable that identifies it (e.g. the sidebar
+        selections), so repeat requests for the same filter skip the mask.
+        """
+        view, n_valid = self._view(filter_key, mask, sort_by)
+        total = view.size
+        start = min(max(page, 0) * page_size, total)
+        stop = min(start + page_size, total)
+
+        if ascending:
+            positions = view[start:stop]
+        else:
+            # Non-null values descending, nulls still last; no re-sort needed
+            idx = np.arange(start, stop)
+            positions = np.where(idx < n_valid, view[np.clip(n_valid - 1 - idx, 0, None)],
+                                 view[np.minimum(idx, total - 1)])
+
+        rows = self.df.iloc[positions]
+        if columns is not None:
+            rows = rows[[c for c in columns if c in rows.columns]]
+        return rows, total
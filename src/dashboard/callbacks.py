@@ -0,0 +1,216 @@
+# src/dashboard/callbacks.py
+# Data loading and computations behind the dashboard sections. Nothing here
+# draws to the page; heavy libraries are imported inside the functions that
+# need them so the first page render does not pay for them.
+import os
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+DATA_PATH = "datasets/clean/haile_reviews_with_topics.csv"
+MODEL_DIR = "models/sentiment"
+
+ALL_HOTELS = "All Hotels"
+ALL_SENTIMENTS = "All Sentiments"
+ALL_TOPICS = "All Topics"
+
+
+@st.cache_resource
+def shared_table():
+    # One memory-mapped table per process; every session reads the same frame
+    from src.data.shared_table import SharedReviewTable
+    return SharedReviewTable.open_or_publish(DATA_PATH)
+
+
+def load_data():
+    """The current published reviews (read-only, shared by all sessions)."""
+    return shared_table().frame()
+
+
+def data_version():
+    table = shared_table()
+    table.frame()  # picks up a newly published version
+    return table.version
+
+
+@st.cache_resource
+def load_models():
+    import joblib
+    tfidf = joblib.load(os.path.join(MODEL_DIR, "tfidf.joblib"))
+    model = joblib.load(os.path.join(MODEL_DIR, "logreg.joblib"))
+    return tfidf, model
+
+
+@st.cache_resource
+def load_explainer():
+    from src.modeling.explain import LinearExplainer
+    return LinearExplainer(*load_models())
+
+
+# Structures derived from the reviews are cached per published version, so
+# a new version rebuilds them once and the previous one can be released.
+def load_search_index():
+    return _load_search_index(data_version())
+
+
+@st.cache_resource(max_entries=2)
+def _load_search_index(version):
+    # Loads the on-disk index and only indexes rows added since last run
+    from src.search.inverted_index import load_or_build
+    return load_or_build(load_data())
+
+
+def load_browser():
+    return _load_browser(data_version())
+
+
+@st.cache_resource(max_entries=2)
+def _load_browser(version):
+    from src.dashboard.browser import ReviewBrowser
+    return ReviewBrowser(load_data())
+
+
+def load_rollups():
+    return _load_rollups(data_version())
+
+
+@st.cache_resource(max_entries=2)
+def _load_rollups(version):
+    from src.eda.rollups import load_or_build
+    return load_or_build(load_data())
+
+
+def load_aspects():
+    """Aspect tagger and the review x aspect matrix for the loaded reviews."""
+    return _load_aspects(data_version())
+
+
+@st.cache_resource(max_entries=2)
+def _load_aspects(version):
+    from src.preprocessing.topic_labeling import AspectTagger, review_texts
+    tagger = AspectTagger()
+    df = load_data()
+    if "topics" in df.columns:
+        return tagger, tagger.matrix(df["topics"])
+    # A table published without the pipeline's aspect tags
+    _, matrix = tagger.tag(review_texts(df))
+    return tagger, matrix
+
+
+def load_similarity():
+    return _load_similarity(data_version())
+
+
+@st.cache_resource(max_entries=2)
+def _load_similarity(version):
+    # Loads the on-disk index and only adds rows appended since last run
+    from src.search.similarity import load_or_build
+    tfidf, _ = load_models()
+    return load_or_build(load_data(), tfidf)
+
+
+def similar_reviews(df, doc_id, n=10):
+    """The `n` reviews of `df` most similar to row `doc_id`, with their cosine similarity."""
+    doc_ids, scores = load_similarity().similar(doc_id, n)
+    return df.iloc[doc_ids].assign(similarity=scores.round(3))
+
+
+def aspect_sentiment_counts(df, mask):
+    """Aspect x sentiment review counts over the rows selected by `mask`."""
+    from src.preprocessing.topic_labeling import SENTIMENTS, aspect_sentiment_matrix
+    tagger, matrix = load_aspects()
+    rows = np.flatnonzero(mask)
+    counts = aspect_sentiment_matrix(matrix[rows], df["sentiment"].to_numpy()[rows])
+    return pd.DataFrame(counts.toarray(), index=tagger.aspects, columns=SENTIMENTS)
+
+
+def filter_mask(df, hotel=ALL_HOTELS, sentiment=ALL_SENTIMENTS, topic=ALL_TOPICS):
+    """Boolean array over the rows of `df` matching the sidebar filters."""
+    mask = np.ones(len(df), dtype=bool)
+
+    # Missing values never match (Arrow-backed comparisons return them as NA)
+    if hotel != ALL_HOTELS:
+        mask &= (df["hotel_name"] == hotel).to_numpy(dtype=bool, na_value=False)
+
+    if sentiment != ALL_SENTIMENTS:
+        mask &= (df["sentiment"] == sentiment).to_numpy(dtype=bool, na_value=False)
+
+    if topic != ALL_TOPICS:
+        mask &= (df["lda_topic"] == topic).to_numpy(dtype=bool, na_value=False)
+
+    return mask
+
+
+def filter_reviews(df, hotel=ALL_HOTELS, sentiment=ALL_SENTIMENTS, topic=ALL_TOPICS):
+    """Apply the sidebar filters; builds one combined mask instead of chained copies."""
+    from src.data.shared_table import select_rows
+    return select_rows(df, filter_mask(df, hotel, sentiment, topic))
+
+
+def rows_mask(df, subset):
+    """Boolean array over `df` marking the rows present in `subset`."""
+    mask = np.zeros(len(df), dtype=bool)
+    mask[df.index.get_indexer(subset.index)] = True
+    return mask
+
+
+def compute_kpis(df):
+    """Values shown on the KPI cards; no average rating for a selection without ratings."""
+    mean = df["rating_0_5"].mean()  # NA, not NaN, over an empty Arrow column
+    return {
+        "total": len(df),
+        "avg_rating": None if pd.isna(mean) else round(float(mean), 2),
+        "positive": int((df["sentiment"] == "positive").sum()),
+        "negative": int((df["sentiment"] == "negative").sum()),
+    }
+
+
+def topic_frequencies(df):
+    topic_counts = df["lda_topic"].value_counts().reset_index()
+    topic_counts.columns = ["Topic", "Count"]
+    return topic_counts
+
+
+def search_reviews(df, filtered_df, index, query, limit=None):
+    """Rank the filtered reviews by BM25 relevance to `query`.
+
+    `index` doc ids are row positions of `df`, so the sidebar filters are
+    passed to the index as a candidate mask instead of re-scanning text.
+    """
+    if not query.strip():
+        return filtered_df
+    doc_ids, scores = index.search(query, limit=limit, candidates=rows_mask(df, filtered_df))
+    return df.iloc[doc_ids].assign(search_score=scores.round(3))
+
+
+@st.cache_data(max_entries=64)
+def tfidf_top_terms(texts, n=15):
+    """Top `n` terms by average TF-IDF score over `texts`."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(
+        stop_words="english",
+        max_features=5000,
+        ngram_range=(1, 2)
+    )
+    X = vectorizer.fit_transform(texts)
+    scores = X.mean(axis=0).A1
+    terms = vectorizer.get_feature_names_out()
+
+    return (
+        pd.DataFrame({"Term": terms, "Score": scores})
+        .sort_values("Score", ascending=False)
+        .head(n)
+    )
+
+
+def predict_sentiment(text):
+    tfidf, model = load_models()
+    return model.predict(tfidf.transform([text]))[0]
+
+
+def explain_sentiment(text, prediction, n=10):
+    """The `n` terms of `text` that weigh most for or against `prediction`."""
+    contrib = load_explainer().contributions(text)[prediction]
+    top = contrib.reindex(contrib.abs().sort_values(ascending=False).index).head(n)
+    return pd.DataFrame({"Term": top.index, "Contribution": top.to_numpy()})
@@ -0,0 +1,326 @@
+# src/dashboard/layout.py
+# One function per dashboard section. Sections with their own widgets are
+# st.fragment, so interacting with them reruns only that section instead of
+# the whole script; sidebar filters still trigger a full rerun.
+import streamlit as st
+import plotly.express as px
+
+from src.dashboard.callbacks import (
+    ALL_HOTELS, ALL_SENTIMENTS, ALL_TOPICS,
+    compute_kpis, topic_frequencies, tfidf_top_terms, predict_sentiment, load_browser,
+    load_rollups, load_data, aspect_sentiment_counts, explain_sentiment,
+    similar_reviews,
+)
+
+DISPLAY_COLS = [
+    "hotel_name", "source", "date", "rating_raw",
+    "rating_0_5", "sentiment", "predicted_sentiment", "explanation",
+    "clean_full_text", "lda_topic", "search_score"
+]
+PAGE_SIZES = [25, 50, 100]
+RELEVANCE = "Relevance"
+SIMILAR_COLS = ["similarity", "hotel_name", "date", "rating_0_5", "sentiment", "review_comment"]
+SIMILAR_CHOICES = 500  # reviews offered in the picker (the first of the current filter)
+
+
+# -------------------------
+# SIDEBAR
+# -------------------------
+def render_sidebar(df):
+    """Draw the filters and return the selected values."""
+    st.sidebar.title("Filters")
+
+    hotel_list = [ALL_HOTELS] + sorted(df["hotel_name"].unique().tolist())
+    selected_hotel = st.sidebar.selectbox("Select Hotel", hotel_list)
+
+    sentiment_list = [ALL_SENTIMENTS, "positive", "neutral", "negative"]
+    selected_sentiment = st.sidebar.selectbox("Sentiment", sentiment_list)
+
+    topic_list = [ALL_TOPICS] + sorted(df["lda_topic"].dropna().unique().tolist())
+    selected_topic = st.sidebar.selectbox("LDA Topic", topic_list)
+
+    search_query = st.sidebar.text_input("Search reviews", placeholder="e.g. shower")
+
+    return selected_hotel, selected_sentiment, selected_topic, search_query
+
+
+# -------------------------
+# HEADER
+# -------------------------
+def render_header():
+    st.title("Haile Hotels & Resorts — Review Analytics Dashboard")
+    st.markdown(
+        "A professional dashboard for **sentiment analysis, ratings, and topic insights** "
+        "based on real customer reviews."
+    )
+
+
+# -------------------------
+# KPI CARDS
+# -------------------------
+def render_kpis(filtered_df):
+    col1, col2, col3, col4 = st.columns(4)
+    kpis = compute_kpis(filtered_df)
+
+    col1.metric("Total Reviews", kpis["total"])
+    col2.metric("Avg Rating (0–5)", kpis["avg_rating"])
+    col3.metric("Positive Reviews", kpis["positive"])
+    col4.metric("Negative Reviews", kpis["negative"])
+
+
+# -------------------------
+# CHARTS
+# -------------------------
+def render_rating_distribution(filtered_df):
+    st.markdown("Rating Distribution")
+    fig = px.histogram(
+        filtered_df,
+        x="rating_0_5",
+        nbins=10,
+        color="hotel_name",
+        title="Rating Distribution",
+        template="plotly_white"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def render_sentiment_distribution(filtered_df):
+    st.markdown("Sentiment Distribution")
+    fig = px.pie(
+        filtered_df,
+        names="sentiment",
+        title="Sentiment Breakdown",
+        color="sentiment",
+        color_discrete_map={
+            "positive": "green",
+            "neutral": "gray",
+            "negative": "red"
+        }
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def render_topic_frequencies(filtered_df):
+    st.markdown("LDA Topic Frequencies")
+    fig = px.bar(
+        topic_frequencies(filtered_df),
+        x="Topic",
+        y="Count",
+        text="Count",
+        title="Most Common Topics",
+        template="plotly_white"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+# -------------------------
+# ASPECTS
+# -------------------------
+def render_aspects(mask):
+    st.markdown("Aspects by Sentiment")
+    counts = aspect_sentiment_counts(load_data(), mask)
+    counts = counts[counts.sum(axis=1) > 0]
+    if counts.empty:
+        st.warning("No aspects mentioned in the selected reviews.")
+        return
+
+    fig = px.bar(
+        counts.reset_index(names="Aspect"),
+        x="Aspect",
+        y=["positive", "neutral", "negative"],
+        labels={"value": "Reviews", "variable": ""},
+        title="Aspect Mentions by Sentiment",
+        color_discrete_map={
+            "positive": "green",
+            "neutral": "gray",
+            "negative": "red"
+        },
+        template="plotly_white"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+# -------------------------
+# TRENDS
+# -------------------------
+@st.fragment
+def render_trends(hotel=ALL_HOTELS):
+    """Rating and sentiment over time, read from the precomputed rollups."""
+    st.markdown("Rating & Sentiment Trends")
+
+    col1, col2 = st.columns(2)
+    granularity = col1.radio("Granularity", ["month", "week", "day"], horizontal=True)
+    window = col2.slider("Rolling window (buckets)", min_value=1, max_value=12, value=3)
+
+    trend = load_rollups().trend(granularity, None if hotel == ALL_HOTELS else hotel, window)
+    if trend.empty:
+        st.warning("No dated reviews available for this hotel.")
+        return
+    trend = trend.reset_index()
+
+    fig = px.line(
+        trend,
+        x="bucket",
+        y=["avg_rating", "rolling_avg_rating"],
+        labels={"bucket": "", "value": "Rating (0–5)", "variable": ""},
+        title="Average Rating",
+        template="plotly_white"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    fig2 = px.bar(
+        trend,
+        x="bucket",
+        y=["n_positive", "n_neutral", "n_negative"],
+        labels={"bucket": "", "value": "Reviews", "variable": ""},
+        title="Reviews by Sentiment",
+        color_discrete_map={
+            "n_positive": "green",
+            "n_neutral": "gray",
+            "n_negative": "red"
+        },
+        template="plotly_white"
+    )
+    st.plotly_chart(fig2, use_container_width=True)
+    st.caption("Trends follow the hotel filter only; sentiment, topic and search filters do not apply.")
+
+
+# -------------------------
+# TF-IDF TERM IMPORTANCE (ACADEMIC REPLACEMENT)
+# -------------------------
+@st.fragment
+def render_tfidf_terms(filtered_df):
+    st.markdown("Important Terms by Sentiment (TF-IDF)")
+
+    tfidf_sentiment = st.selectbox(
+        "Select sentiment for TF-IDF analysis:",
+        filtered_df["sentiment"].unique()
+    )
+
+    subset = filtered_df[filtered_df["sentiment"] == tfidf_sentiment]
+
+    if subset.empty:
+        st.warning("No reviews available for this sentiment.")
+        return
+
+    tfidf_df = tfidf_top_terms(subset["clean_full_text"].dropna().astype(str).tolist())
+
+    # Plotly is already loaded for the other charts; matplotlib added ~0.6 s
+    # of import time to every cold start just for this one figure
+    fig = px.bar(
+        tfidf_df[::-1],
+        x="Score",
+        y="Term",
+        orientation="h",
+        labels={"Score": "Average TF-IDF Score", "Term": ""},
+        title=f"Top TF-IDF Terms — {tfidf_sentiment.capitalize()} Reviews",
+        template="plotly_white"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+# -------------------------
+# REVIEW TABLE
+# -------------------------
+@st.fragment
+def render_review_table(filtered_df, mask=None, filter_key=None):
+    """Paged, sorted review browser; only the visible page is sent to the client."""
+    st.markdown("Review Browser")
+
+    browser = load_browser()
+    searching = "search_score" in filtered_df.columns
+    sort_options = ([RELEVANCE] if searching else []) + browser.sort_options
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    sort_by = col1.selectbox("Sort by", sort_options)
+    ascending = col2.toggle("Ascending", value=False, disabled=sort_by == RELEVANCE)
+    page_size = col3.selectbox("Rows per page", PAGE_SIZES, index=1)
+
+    total = len(filtered_df)
+    n_pages = max((total + page_size - 1) // page_size, 1)
+    page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1) - 1
+
+    if sort_by == RELEVANCE:
+        # Search results are already ranked and bounded by the index
+        rows = filtered_df.iloc[page * page_size:(page + 1) * page_size]
+    else:
+        rows, total = browser.page(mask, filter_key, sort_by=sort_by, ascending=ascending,
+                                   page=page, page_size=page_size)
+        if searching:
+            rows = rows.join(filtered_df["search_score"])
+
+    # predicted_sentiment and explanation are stored with the published table
+    display_cols = [c for c in DISPLAY_COLS if c in rows.columns]
+    st.dataframe(rows[display_cols], use_container_width=True)
+    first = page * page_size + 1 if total else 0
+    st.caption(f"Showing {first}–{min((page + 1) * page_size, total)} of {total} reviews")
+
+
+# -------------------------
+# SIMILAR REVIEWS
+# -------------------------
+@st.fragment
+def render_similar_reviews(filtered_df):
+    st.markdown("Similar Reviews")
+
+    if filtered_df.empty:
+        st.info("No reviews match the current filters.")
+        return
+
+    df = load_data()
+    positions = df.index.get_indexer(filtered_df.index[:SIMILAR_CHOICES])
+    doc_id = st.selectbox(
+        "Find past reviews similar to",
+        positions,
+        format_func=lambda p: f"{df['hotel_name'].iloc[p]} — {str(df['review_comment'].iloc[p])[:90]}",
+    )
+    n = st.slider("Number of similar reviews", 5, 20, 10)
+
+    similar = similar_reviews(df, int(doc_id), n)
+    if similar.empty:
+        st.caption("No other review shares any terms with this one.")
+        return
+    st.dataframe(similar[[c for c in SIMILAR_COLS if c in similar.columns]], use_container_width=True)
+    st.caption("Across all hotels, by cosine similarity of the sentiment model's TF-IDF vectors.")
+
+
+# -------------------------
+# SENTIMENT PREDICTOR
+# -------------------------
+@st.fragment
+def render_predictor():
+    st.markdown("---")
+    st.subheader("Sentiment Predictor")
+
+    user_input = st.text_area("Enter a review comment:", height=150)
+
+    if st.button("Predict Sentiment"):
+        if user_input.strip():
+            prediction = predict_sentiment(user_input)
+            st.success(f"Predicted Sentiment: **{prediction.upper()}**")
+            terms = explain_sentiment(user_input, prediction)
+            if terms.empty:
+                st.caption("None of the words in this text are in the model's vocabulary.")
+            else:
+                fig = px.bar(
+                    terms[::-1], x="Contribution", y="Term", orientation="h",
+                    color=terms[::-1]["Contribution"] > 0,
+                    color_discrete_map={True: "#2ca02c", False: "#d62728"},
+                    labels={"Contribution": f"Weight towards {prediction}", "Term": ""},
+                    title="Why: terms for (green) and against (red) this prediction",
+                    template="plotly_white",
+                )
+                fig.update_layout(showlegend=False)
+                st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.error("Please enter a review text.")
+
+
+# Interactions that rerun only their own section (used by the latency benchmark)
+FRAGMENTS = {
+    "tf-idf sentiment select": "render_tfidf_terms",
+    "review browser page": "render_review_table",
+    "similar reviews": "render_similar_reviews",
+    "trend granularity": "render_trends",
+    "predict sentiment": "render_predictor",
+}
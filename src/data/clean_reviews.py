@@ -1,37 +1,80 @@
 import os
-import pandas as pd
 import re
+import sys
+import argparse
+from collections import OrderedDict
+
+import pandas as pd
 import nltk
-import spacy
 
 from nltk.corpus import stopwords
 
+# Allow `python src/data/clean_reviews.py` from the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.data.schema import read_reviews, write_reviews
+from src.preprocessing.language_id import STOP_WORDS as LANG_STOP_WORDS, ENGLISH_ROUTE, detect_languages
+
 # ---------------------------------------
 # INITIAL SETUP
 # ---------------------------------------
 
 RAW_COMBINED = "datasets/clean/haile_reviews_combined.csv"
 OUT_FILE = "datasets/clean/haile_reviews_cleaned.csv"
+QUARANTINE_FILE = "datasets/clean/haile_reviews_quarantine.csv"
+MEMO_FILE = "datasets/clean/lemma_memo.tsv"
+MEMO_SIZE = 200_000
+FAST_BATCH_SIZE = 1_000
+
+URL_RE = re.compile(r"http\S+|www\S+|https\S+")
+NUMBER_RE = re.compile(r"\d+")
+PUNCT_RE = re.compile(r"[^\w\s]")
+SPACE_RE = re.compile(r"\s+")
+
+# English goes through spaCy; these get the cheap path; text identified as
+# another language (mixed, other) goes to the quarantine table
+LIGHT_LANGUAGES = ["om", "am"]
+
+# Stopwords and the spaCy model are loaded on first use, not on import
+_stop_words = None
+_nlp = None
+
+
+def get_stop_words():
+    global _stop_words
+    if _stop_words is None:
+        # Download stopwords if missing
+        try:
+            words = stopwords.words("english")
+        except LookupError:
+            nltk.download("stopwords")
+            words = stopwords.words("english")
+        _stop_words = set(words)
+    return _stop_words
 
-# Download stopwords if missing
-nltk.download("stopwords")
-stop_words = set(stopwords.words("english"))
 
-# Load spaCy English model (small, fast, perfect for lemmatization)
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    print("Downloading spaCy model...")
-    os.system("python -m spacy download en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+def get_nlp():
+    global _nlp
+    if _nlp is None:
+        import spacy  # ~1 s of imports, only paid when lemmatizing through spaCy
+        # Load spaCy English model (small, fast, perfect for lemmatization)
+        try:
+            _nlp = spacy.load("en_core_web_sm")
+        except OSError:
+            print("Downloading spaCy model...")
+            os.system("python -m spacy download en_core_web_sm")
+            _nlp = spacy.load("en_core_web_sm")
+    return _nlp
 
 
 # ---------------------------------------
 # TEXT CLEANING FUNCTIONS
 # ---------------------------------------
 
-def clean_text(text: str) -> str:
-    """Full cleaning pipeline with normalization, stopwords, lemmatization."""
+def normalize_text(text: str) -> str:
+    """Steps 1-5 of the cleaning pipeline (everything before spaCy)."""
     if pd.isna(text):
         return ""
 
@@ -39,35 +82,169 @@ def clean_text(text: str) -> str:
     text = text.lower()
 
     # 2. Remove URLs
-    text = re.sub(r"http\S+|www\S+|https\S+", "", text)
+    text = URL_RE.sub("", text)
 
     # 3. Remove numbers
-    text = re.sub(r"\d+", "", text)
+    text = NUMBER_RE.sub("", text)
 
     # 4. Remove punctuation & special chars
-    text = re.sub(r"[^\w\s]", " ", text)
+    text = PUNCT_RE.sub(" ", text)
 
     # 5. Remove extra spaces
-    text = re.sub(r"\s+", " ", text).strip()
+    return SPACE_RE.sub(" ", text).strip()
+
+
+def _lemmas(doc):
+    stop_words = get_stop_words()
+    return [token.lemma_ for token in doc if token.text not in stop_words and len(token.text) > 2]
+
+
+def clean_text(text: str) -> str:
+    """Full cleaning pipeline with normalization, stopwords, lemmatization."""
+    if pd.isna(text):
+        return ""
 
     # 6. Remove stopwords & lemmatize
-    doc = nlp(text)
-    clean_tokens = []
+    return " ".join(_lemmas(get_nlp()(normalize_text(text))))
 
-    for token in doc:
-        if token.text not in stop_words and len(token.text) > 2:
-            clean_tokens.append(token.lemma_)
 
-    return " ".join(clean_tokens)
+def clean_text_light(text: str, lang: str) -> str:
+    """Cheap path for non-English reviews: normalization and stopwords, no lemmatizer."""
+    if pd.isna(text):
+        return ""
+    if lang == "om":
+        # The Oromo apostrophe (hudhaa) is part of the word: baay'ee
+        text = text.replace("'", "").replace("’", "")
+    stop = LANG_STOP_WORDS.get(lang, set())
+    # A single Ge'ez character is a whole syllable
+    min_len = 1 if lang == "am" else 2
+    return " ".join(w for w in normalize_text(text).split(" ") if w not in stop and len(w) > min_len)
+
+
+class LemmaMemo:
+    """Bounded word -> cleaned output table with LRU eviction.
+
+    Keys are the space-separated words of a normalized text; values are what
+    `clean_text` emits for that word (its lemma, "" for stopwords, or several
+    lemmas when spaCy splits the word). Entries are learned from spaCy's
+    output for the first text a word is seen in.
+    """
+
+    def __init__(self, max_size=MEMO_SIZE):
+        self.max_size = max_size
+        self.table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.table)
+
+    def lookup(self, words):
+        """Memoised outputs for `words`, or None if any word is unknown."""
+        table = self.table
+        try:
+            outputs = [table[w] for w in words]
+        except KeyError:
+            self.misses += 1
+            return None
+        for w in words:
+            table.move_to_end(w)
+        self.hits += 1
+        return outputs
+
+    def learn(self, doc):
+        """Record every word of a spaCy doc; returns the cleaned text."""
+        stop_words = get_stop_words()
+        words = doc.text.split(" ")
+        parts = [[] for _ in words]
+        # spaCy never merges across whitespace, so each token belongs to one word
+        word, next_start = 0, len(words[0]) + 1
+        for token in doc:
+            while token.idx >= next_start:
+                word += 1
+                next_start += len(words[word]) + 1
+            if token.text not in stop_words and len(token.text) > 2:
+                parts[word].append(token.lemma_)
+
+        table = self.table
+        for w, p in zip(words, parts):
+            if w in table:
+                table.move_to_end(w)
+            else:
+                table[w] = " ".join(p)
+                if len(table) > self.max_size:
+                    table.popitem(last=False)
+        return " ".join(lemma for p in parts for lemma in p)
+
+    def save(self, path=MEMO_FILE):
+        """Write entries least recently used first, so load keeps the order."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for w, out in self.table.items():
+                f.write(f"{w}\t{out}\n")
+        return path
+
+    @classmethod
+    def load(cls, path=MEMO_FILE, max_size=MEMO_SIZE):
+        memo = cls(max_size)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    w, _, out = line.rstrip("\n").partition("\t")
+                    memo.table[w] = out
+            while len(memo.table) > max_size:
+                memo.table.popitem(last=False)
+        return memo
+
+
+def clean_texts_fast(texts, memo=None, batch_size=FAST_BATCH_SIZE):
+    """Clean many texts, running spaCy only on texts with unseen words.
+
+    Texts whose words are all in the memo are cleaned by lookup. The rest
+    go through spaCy in batches (their output is exactly `clean_text`'s)
+    and teach the memo their words, so later batches hit more often.
+    """
+    memo = memo if memo is not None else LemmaMemo()
+    texts = list(texts)
+    out = [""] * len(texts)
+    for start in range(0, len(texts), batch_size):
+        pending, pending_text = [], []
+        for i in range(start, min(start + batch_size, len(texts))):
+            text = normalize_text(texts[i])
+            if not text:
+                continue
+            outputs = memo.lookup(text.split(" "))
+            if outputs is None:
+                pending.append(i)
+                pending_text.append(text)
+            else:
+                out[i] = " ".join(o for o in outputs if o)
+        if pending:
+            for i, doc in zip(pending, get_nlp().pipe(pending_text)):
+                out[i] = memo.learn(doc)
+    return out
+
+
+def language_routes(df):
+    """Boolean masks (english, light, quarantine) over the rows of `df`, from its `lang` column.
+
+    Latin-script text the identifier could not call ("und": too short or
+    ambiguous, e.g. "Good" or "Nice stay") is cleaned as English; only text
+    identified as a language without a cleaning path is quarantined.
+    """
+    english = df["lang"].isin(ENGLISH_ROUTE).to_numpy()
+    light = df["lang"].isin(LIGHT_LANGUAGES).to_numpy()
+    has_text = (df["review_comment"].fillna("").str.strip() != "").to_numpy()
+    return english, light, ~english & ~light & has_text
 
 
 # ---------------------------------------
 # MAIN CLEANING PIPELINE
 # ---------------------------------------
 
-def clean_reviews():
+def clean_reviews(fast=False, memo_file=MEMO_FILE):
     print("Loading dataset...")
-    df = pd.read_csv(RAW_COMBINED)
+    df = read_reviews(RAW_COMBINED)
 
     print("Original rows:", len(df))
 
@@ -85,9 +262,26 @@ def clean_reviews():
     # Remove duplicates
     df.drop_duplicates(subset=["review_comment", "hotel_name"], inplace=True)
 
+    # Route by language: only English text goes to the spaCy lemmatizer
+    print("Detecting languages...")
+    df = detect_languages(df)
+    english, light, quarantine = language_routes(df)
+
     # Apply text cleaning function
     print("Cleaning text... (lemmatization, stopwords, normalization)")
-    df["clean_comment"] = df["review_comment"].apply(clean_text)
+    df["clean_comment"] = ""
+    comments = df.loc[english, "review_comment"]
+    if fast:
+        memo = LemmaMemo.load(memo_file)
+        df.loc[english, "clean_comment"] = clean_texts_fast(comments, memo)
+        memo.save(memo_file)
+        print(f"Lemma memo: {memo.hits} reviews by lookup, {memo.misses} through spaCy, "
+              f"{len(memo)} words saved to {memo_file}")
+    else:
+        df.loc[english, "clean_comment"] = comments.apply(clean_text)
+    df.loc[light, "clean_comment"] = [
+        clean_text_light(text, lang) for text, lang in zip(df.loc[light, "review_comment"], df.loc[light, "lang"])
+    ]
 
     # Optional: combine title + comment for stronger NLP performance
     df["clean_full_text"] = (
@@ -96,16 +290,24 @@ def clean_reviews():
     ).str.strip()
 
     # Save cleaned file
-    os.makedirs(os.path.dirname(OUT_FILE), exist_ok=True)
-    df.to_csv(OUT_FILE, index=False, encoding="utf-8")
+    write_reviews(df, OUT_FILE, encoding="utf-8")
+    write_reviews(df[quarantine], QUARANTINE_FILE, encoding="utf-8")
 
     print("\n=======================================")
     print("CLEANING COMPLETED")
     print("Saved cleaned data:", OUT_FILE)
     print("Total rows after cleaning:", len(df))
+    print("Languages:", ", ".join(f"{lang}={n}" for lang, n in df["lang"].value_counts().items()))
+    print(f"Lemmatized (en): {english.sum()}, light path ({'/'.join(LIGHT_LANGUAGES)}): {light.sum()}, "
+          f"quarantined: {quarantine.sum()} -> {QUARANTINE_FILE}")
     print("=======================================")
 
 
 if __name__ == "__main__":
-    clean_reviews()
+    parser = argparse.ArgumentParser(description="Clean the combined reviews.")
+    parser.add_argument("--fast", action="store_true",
+                        help="lemmatize through the persistent lemma memo, spaCy only for unseen words")
+    parser.add_argument("--memo", default=MEMO_FILE)
+    args = parser.parse_args()
+    clean_reviews(fast=args.fast, memo_file=args.memo)
 
@@ -1,14 +1,31 @@
 import os
+import sys
 import pandas as pd
 
+# Allow `python src/data/combine_csvs.py` from the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.data.schema import SchemaError, duplicate_reviews, read_reviews, review_key, validate, write_reviews
+
 RAW_DIR = "datasets/raw/haile_reviews"
 OUT_FILE = "datasets/clean/haile_reviews_combined.csv"
 
-def combine_reviews():
-    if not os.path.exists(RAW_DIR):
-        raise FileNotFoundError(f"Raw folder not found: {RAW_DIR}")
+def drop_duplicate_reviews(df, name):
+    """Drop repeats of a review (overlapping scrapes), keeping its first row."""
+    dup = duplicate_reviews(df)
+    if dup.any():
+        print(f"[Warning] {name}: dropped {int(dup.sum())} duplicate reviews (same {'/'.join(review_key(df))})")
+        df = df[~dup.to_numpy()]
+    return df
+
 
-    all_files = [f for f in os.listdir(RAW_DIR) if f.endswith(".csv")]
+def combine_reviews(raw_dir=RAW_DIR, out_file=OUT_FILE):
+    if not os.path.exists(raw_dir):
+        raise FileNotFoundError(f"Raw folder not found: {raw_dir}")
+
+    all_files = [f for f in os.listdir(raw_dir) if f.endswith(".csv")]
 
     if not all_files:
         raise ValueError("No CSV files found in the raw reviews directory.")
@@ -19,26 +36,29 @@ def combine_reviews():
 
     dfs = []
     for fname in all_files:
-        path = os.path.join(RAW_DIR, fname)
+        path = os.path.join(raw_dir, fname)
         try:
-            df = pd.read_csv(path)
+            # Migrated to the current schema and validated; a bad file stops the run
+            df = drop_duplicate_reviews(read_reviews(path, validate_rows=False), fname)
+            df = validate(df, name=fname)
             df["source_file"] = fname  # Keep track of origin
             dfs.append(df)
+        except SchemaError:
+            raise
         except Exception as e:
             print(f"[Error] Failed reading {fname}: {e}")
 
-    combined = pd.concat(dfs, ignore_index=True)
-
-    # Create output directory
-    os.makedirs(os.path.dirname(OUT_FILE), exist_ok=True)
+    # The same review can be in two files after overlapping scrapes
+    combined = drop_duplicate_reviews(pd.concat(dfs, ignore_index=True), "combined reviews")
 
     # Save combined file
-    combined.to_csv(OUT_FILE, index=False, encoding="utf-8")
+    write_reviews(combined, out_file, encoding="utf-8")
 
     print("\n====================================")
-    print(f"Combined dataset saved to:\n{OUT_FILE}")
+    print(f"Combined dataset saved to:\n{out_file}")
     print("Total rows:", len(combined))
     print("====================================")
+    return combined
 
 if __name__ == "__main__":
     combine_reviews()
@@ -1,13 +1,21 @@
-import pandas as pd
+# src/data/fix_rating_col.py
+# The rating_1_5 -> rating_0_5 rename is schema migration 2 (src/data/schema.py):
+# readers apply it when they load the file, so the CSV is no longer rewritten.
+# This records the file's schema version next to it and shows what readers apply.
+import os
+import sys
 
-IN_PATH = "datasets/clean/haile_reviews_with_topics.csv"
-OUT_PATH = "datasets/clean/haile_reviews_with_topics.csv"   # overwrite
-
-df = pd.read_csv(IN_PATH)
+# Allow `python src/data/fix_rating_col.py` from the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 
-if "rating_1_5" in df.columns:
-    df = df.rename(columns={"rating_1_5": "rating_0_5"})
+from src.data.schema import CURRENT_VERSION, MIGRATIONS, stamp
 
-df.to_csv(OUT_PATH, index=False)
-print("Rating column fixed.")
+IN_PATH = "datasets/clean/haile_reviews_with_topics.csv"
 
+version = stamp(IN_PATH)
+print(f"{IN_PATH}: schema version {version} of {CURRENT_VERSION}, file left as is.")
+for v in sorted(MIGRATIONS):
+    if v > version:
+        print(f"  applied at read time: {MIGRATIONS[v].description}")
@@ -0,0 +1,329 @@
+# src/data/schema.py
+"""Versioned schema of the review tables, migrated at read time.
+
+Each schema change is a registered `Migration` from version N-1 to N: column
+renames, dtype casts and derived columns. Files are never rewritten to
+follow the schema. A CSV records its version in a sidecar
+(`<file>.schema.json`), and a published Arrow table records it in its schema
+metadata. Readers plan the migrations from the file's version against its
+header alone, parse only the source columns they need, then rename
+(metadata only), cast and derive in memory.
+
+Batches entering the pipeline are checked column by column with `validate`,
+which raises SchemaError on the first batch with bad rows.
+
+    python -m src.data.schema status datasets/clean/*.csv
+    python -m src.data.schema stamp datasets/clean/haile_reviews_with_topics.csv
+"""
+import os
+import json
+import argparse
+
+import numpy as np
+import pandas as pd
+
+BASE_VERSION = 1
+SIDECAR_SUFFIX = ".schema.json"
+SENTIMENTS = ("positive", "neutral", "negative")
+REQUIRED = ("hotel_name", "review_comment")
+
+
+class SchemaError(ValueError):
+    pass
+
+
+class Migration:
+    """One schema version: what changed since the previous one.
+
+    renames: {old_name: new_name}
+    casts:   {column: dtype}, applied with pd.to_numeric for numeric dtypes
+    added:   {column: (input_columns, function(df) -> Series)}, derived only
+             when the column is absent from the file
+    """
+
+    def __init__(self, version, description, renames=None, casts=None, added=None):
+        self.version = version
+        self.description = description
+        self.renames = renames or {}
+        self.casts = casts or {}
+        self.added = added or {}
+
+
+MIGRATIONS = {}
+
+
+def register(migration):
+    if migration.version in MIGRATIONS or migration.version <= BASE_VERSION:
+        raise ValueError(f"Schema version {migration.version} is already taken")
+    MIGRATIONS[migration.version] = migration
+    return migration
+
+
+def sentiment_from_rating(df):
+    """positive (>= 4), neutral (3), negative (<= 2); missing otherwise, as in sentiment_pipeline."""
+    rating = pd.to_numeric(df["rating_0_5"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    labels = np.select([rating >= 4, rating == 3, rating <= 2], SENTIMENTS, default=None)
+    return pd.Series(labels, index=df.index, dtype="str")
+
+
+register(Migration(2, "rating_1_5 renamed to rating_0_5",
+                   renames={"rating_1_5": "rating_0_5"}))
+register(Migration(3, "numeric rating and topic columns",
+                   casts={"rating_0_5": "float64", "lda_topic": "Int64"}))
+register(Migration(4, "sentiment labels derived from the rating when a source has none",
+                   added={"sentiment": (("rating_0_5",), sentiment_from_rating)}))
+
+CURRENT_VERSION = max(MIGRATIONS)
+
+
+# ---------------------------------------
+# VERSIONS
+# ---------------------------------------
+
+def infer_version(columns):
+    """Version of an unstamped table, from its column names.
+
+    Only renames show in a header, so the newest rename whose old or new
+    name is present decides; casts and added columns after it are applied
+    again, which is harmless.
+    """
+    columns = set(columns)
+    for version in sorted(MIGRATIONS, reverse=True):
+        renames = MIGRATIONS[version].renames
+        if columns & set(renames):
+            return version - 1
+        if columns & set(renames.values()):
+            return version
+    return BASE_VERSION
+
+
+def read_header(path):
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def sidecar_path(path):
+    return path + SIDECAR_SUFFIX
+
+
+def file_version(path, header=None):
+    """Schema version of a CSV: its sidecar if it still matches the header, else inferred."""
+    header = read_header(path) if header is None else header
+    try:
+        with open(sidecar_path(path), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("columns") == header:
+            return int(meta["schema_version"])
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+    return infer_version(header)
+
+
+def stamp(path, version=None):
+    """Record the schema version of a CSV in its sidecar; inferred from the header by default."""
+    header = read_header(path)
+    version = infer_version(header) if version is None else version
+    tmp = f"{sidecar_path(path)}.tmp-{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"schema_version": version, "columns": header}, f)
+    os.replace(tmp, sidecar_path(path))
+    return version
+
+
+# ---------------------------------------
+# MIGRATION PLAN
+# ---------------------------------------
+
+class Plan:
+    """How to bring a table with `columns` at `version` to CURRENT_VERSION.
+
+    `typed` says whether the storage keeps dtypes (Arrow). A CSV does not,
+    so all casts of the schema apply to it, not only those after its version.
+    """
+
+    def __init__(self, columns, version, typed=False):
+        self.sources = {c: c for c in columns}  # current name -> source column, None if derived
+        self.derived = {}
+        self.casts = {}
+        for v in sorted(MIGRATIONS):
+            m = MIGRATIONS[v]
+            if v > version:
+                for old, new in m.renames.items():
+                    if old in self.sources:
+                        self.sources = {new if c == old else c: s for c, s in self.sources.items()}
+                        self.casts = {new if c == old else c: t for c, t in self.casts.items()}
+                for col, (inputs, derive) in m.added.items():
+                    if col not in self.sources and all(c in self.sources for c in inputs):
+                        self.sources[col] = None
+                        self.derived[col] = (inputs, derive)
+            if v > version or not typed:
+                self.casts.update(m.casts)
+
+    @property
+    def columns(self):
+        return list(self.sources)
+
+    def closure(self, columns=None):
+        """`columns` (all by default) plus the columns their derived columns are computed from."""
+        columns = self.columns if columns is None else list(columns)
+        missing = [c for c in columns if c not in self.sources]
+        if missing:
+            raise SchemaError(f"Columns not in the table: {missing}")
+        need, stack = set(), list(columns)
+        while stack:
+            col = stack.pop()
+            if col not in need:
+                need.add(col)
+                if self.sources[col] is None:
+                    stack.extend(self.derived[col][0])
+        return need
+
+    def needs(self, columns=None):
+        """Source columns to read for `columns`, in file order."""
+        need = self.closure(columns)
+        return [s for c, s in self.sources.items() if c in need and s is not None]
+
+    def apply(self, df, columns=None):
+        """`df` (holding the source columns) migrated, with `columns` in schema order."""
+        need = self.closure(columns)
+        renames = {s: c for c, s in self.sources.items() if s is not None and s != c and s in df.columns}
+        # Copy-on-write: a rename or shallow copy shares the data, and the
+        # assignments below never touch the caller's frame
+        df = df.rename(columns=renames) if renames else df.copy(deep=False)
+        for col, dtype in self.casts.items():
+            if col in need and col in df.columns:
+                df[col] = _cast(df[col], dtype)
+        for col, (_, derive) in self.derived.items():  # registry order: inputs come first
+            if col in need:
+                df[col] = derive(df)
+        return df[self.columns if columns is None else list(columns)]
+
+
+def _cast(series, dtype):
+    """`series` as `dtype`, unchanged if it already is of that kind.
+
+    Missing values stay missing (integers use the nullable "Int64"); values
+    that are present but not of the type raise SchemaError.
+    """
+    integer = dtype.lower().startswith("int")
+    if not integer and pd.api.types.is_float_dtype(series.dtype):
+        return series
+    if integer and pd.api.types.is_integer_dtype(series.dtype):
+        return series
+    values = pd.to_numeric(series, errors="coerce")
+    bad = values.isna() & series.notna()
+    if integer:
+        bad |= values.notna() & (values % 1 != 0)
+    if bad.any():
+        raise SchemaError(f"{series.name}: {int(bad.sum())} values are not {dtype}, "
+                          f"e.g. rows {list(series.index[bad][:5])}: {list(series[bad][:5])}")
+    return values.astype(dtype)
+
+
+# ---------------------------------------
+# READ / WRITE
+# ---------------------------------------
+
+def read_reviews(path, columns=None, validate_rows=True, **read_csv_kwargs):
+    """A review CSV at CURRENT_VERSION, reading only the columns needed for `columns`."""
+    header = read_header(path)
+    plan = Plan(header, file_version(path, header))
+    needed = plan.needs(columns)
+    df = pd.read_csv(path, usecols=needed, **read_csv_kwargs)
+    df = plan.apply(df, columns)
+    if validate_rows:
+        validate(df, required=[c for c in REQUIRED if columns is None or c in columns])
+    return df
+
+
+def project(df, version=None, typed=False):
+    """An in-memory frame at `version` (inferred from its columns by default) migrated to CURRENT_VERSION."""
+    version = infer_version(df.columns) if version is None else version
+    return Plan(df.columns, version, typed).apply(df)
+
+
+def write_reviews(df, path, **to_csv_kwargs):
+    """Write a frame at CURRENT_VERSION as CSV and stamp it."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    df.to_csv(path, index=False, **to_csv_kwargs)
+    stamp(path, CURRENT_VERSION)
+
+
+# ---------------------------------------
+# VALIDATION
+# ---------------------------------------
+
+def _parse_dates(dates):
+    """Datetimes of a column, trying ISO 8601 for the whole column before per-value parsing."""
+    try:
+        return pd.to_datetime(dates, format="ISO8601")
+    except (ValueError, TypeError):
+        return pd.to_datetime(dates, format="mixed", errors="coerce")
+
+
+def review_key(df):
+    """Columns identifying a review: its id within its source."""
+    return ["source", "review_id"] if "source" in df.columns else ["review_id"]
+
+
+def duplicate_reviews(df):
+    """Mask of rows repeating an earlier row's review key (rows without an id never repeat)."""
+    if "review_id" not in df.columns:
+        return pd.Series(False, index=df.index)
+    return df["review_id"].notna() & df.duplicated(review_key(df), keep="first")
+
+
+def problems(df, required=REQUIRED):
+    """(check, mask of bad rows) for every failed check on a batch."""
+    out = []
+    missing = [c for c in required if c not in df.columns]
+    if missing:
+        out.append((f"missing columns {missing}", None))
+    if "rating_0_5" in df.columns:
+        rating = pd.to_numeric(df["rating_0_5"], errors="coerce")
+        out.append(("rating_0_5 not a number in [0, 5]",
+                    df["rating_0_5"].notna() & ~rating.between(0, 5)))
+    if "sentiment" in df.columns:
+        out.append((f"sentiment not one of {SENTIMENTS}",
+                    df["sentiment"].notna() & ~df["sentiment"].isin(SENTIMENTS)))
+    if "date" in df.columns:
+        out.append(("date not parseable", df["date"].notna() & _parse_dates(df["date"]).isna()))
+    if "lda_topic" in df.columns:
+        out.append(("lda_topic negative", pd.to_numeric(df["lda_topic"], errors="coerce") < 0))
+    if "review_id" in df.columns:
+        out.append((f"duplicate {'/'.join(review_key(df))}", duplicate_reviews(df)))
+    return [(name, mask) for name, mask in out if mask is None or mask.any()]
+
+
+def validate(df, required=REQUIRED, name="batch"):
+    """Raise SchemaError describing every failed check of `df`; returns `df` when it is clean."""
+    failed = problems(df, required)
+    if failed:
+        lines = []
+        for check, mask in failed:
+            if mask is None:
+                lines.append(f"  {check}")
+            else:
+                lines.append(f"  {check}: {int(mask.sum())} of {len(df)} rows, e.g. {list(df.index[mask][:5])}")
+        raise SchemaError(f"{name} failed validation:\n" + "\n".join(lines))
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or stamp the schema version of review CSVs.")
+    parser.add_argument("command", choices=["status", "stamp", "validate"])
+    parser.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    print(f"Current schema version: {CURRENT_VERSION}")
+    for path in args.paths:
+        if args.command == "stamp":
+            print(f"{path}: stamped as version {stamp(path)}")
+        elif args.command == "validate":
+            validate(read_reviews(path, validate_rows=False), name=path)
+            print(f"{path}: ok")
+        else:
+            header = read_header(path)
+            version = file_version(path, header)
+            pending = [MIGRATIONS[v].description for v in sorted(MIGRATIONS) if v > version]
+            print(f"{path}: version {version}, {len(header)} columns"
+                  + ("".join(f"\n  at read time: {d}" for d in pending) if pending else ""))
@@ -0,0 +1,167 @@
+# src/data/shared_table.py
+"""Read-only review table shared by every dashboard session and process on a host.
+
+The pipeline publishes the reviews as an uncompressed Arrow IPC file, and
+readers memory-map it: the pages live once in the OS page cache however
+many processes map them, and the pandas frame wraps the Arrow buffers
+(pd.ArrowDtype columns) instead of copying them into numpy.
+
+Publishing writes a new version file, then atomically replaces the CURRENT
+pointer. Readers pick the new version up on their next call. An old
+version stays readable while it is mapped, even after it is unlinked.
+Each file records its schema version (src/data/schema.py) in the Arrow
+metadata, and a file from an older schema is migrated when it is opened.
+
+    python -m src.data.shared_table --publish datasets/clean/haile_reviews_with_topics.csv
+"""
+import os
+import time
+import argparse
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.data.schema import CURRENT_VERSION, project, read_reviews, validate
+
+SHARED_DIR = "datasets/shared"
+POINTER = "CURRENT"
+KEEP_VERSIONS = 3
+
+
+def _atomic_write(path, write):
+    """Write through `write(tmp_path)`, then rename over `path` in one step."""
+    tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def publish(df, shared_dir=SHARED_DIR):
+    """Validate `df`, write it as a new version and make it the current one; returns the version name."""
+    import pyarrow as pa
+
+    df = validate(project(df), name="published reviews")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                           b"schema_version": str(CURRENT_VERSION).encode()})
+    os.makedirs(shared_dir, exist_ok=True)
+    version = f"reviews-{time.time_ns():020d}-{os.getpid()}.arrow"  # names sort by publish time
+
+    def write_table(path):
+        # No compression: a compressed file would have to be decoded into private memory
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    def write_pointer(path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(version)
+
+    _atomic_write(os.path.join(shared_dir, version), write_table)
+    _atomic_write(os.path.join(shared_dir, POINTER), write_pointer)
+    _prune(shared_dir, version)
+    return version
+
+
+def _prune(shared_dir, current, keep=KEEP_VERSIONS):
+    """Delete all but the newest `keep` versions (mapped readers keep their pages)."""
+    versions = sorted(f for f in os.listdir(shared_dir) if f.startswith("reviews-") and f.endswith(".arrow"))
+    for name in versions[:-keep]:
+        if name != current:
+            os.remove(os.path.join(shared_dir, name))
+
+
+def current_version(shared_dir=SHARED_DIR):
+    try:
+        with open(os.path.join(shared_dir, POINTER), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def open_version(path):
+    """Memory-map one version as a DataFrame whose columns are views of the mapped buffers."""
+    import pyarrow as pa
+
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    df = table.to_pandas(types_mapper=pd.ArrowDtype)
+    version = (table.schema.metadata or {}).get(b"schema_version")
+    if version is None or int(version) < CURRENT_VERSION:
+        # Renames are metadata; only columns a newer schema changes are converted
+        df = project(df, None if version is None else int(version), typed=True)
+    return df
+
+
+def select_rows(df, mask):
+    """Rows of `df` where `mask` is True, as a zero-copy slice when they are contiguous.
+
+    The unfiltered table and single-run selections (e.g. one hotel in a
+    table sorted by hotel) share the parent's buffers; anything else takes
+    only the selected rows.
+    """
+    rows = np.flatnonzero(mask)
+    if rows.size == len(df):
+        return df
+    if rows.size == 0 or rows[-1] - rows[0] + 1 == rows.size:
+        start = rows[0] if rows.size else 0
+        return df.iloc[start:start + rows.size]
+    return df.iloc[rows]
+
+
+def _with_explanations(df):
+    """Model predictions and top terms for a CSV written before the pipeline stored them."""
+    if "explanation" in df.columns:
+        return df
+    from src.modeling.explain import add_explanations
+    return add_explanations(df)
+
+
+class SharedReviewTable:
+    """The current published review table of this host, reopened when a new version is published."""
+
+    def __init__(self, shared_dir=SHARED_DIR):
+        self.shared_dir = shared_dir
+        self.version = None
+        self._frame = None
+        # Shared by all dashboard sessions (st.cache_resource)
+        self._lock = threading.Lock()
+
+    def frame(self):
+        """The current frame; checks the version pointer, one small file read."""
+        version = current_version(self.shared_dir)
+        if version is None:
+            raise FileNotFoundError(f"No review table has been published to {self.shared_dir}")
+        if version == self.version:
+            return self._frame
+        with self._lock:
+            for _ in range(3):
+                if version == self.version:
+                    break
+                try:
+                    self._frame = open_version(os.path.join(self.shared_dir, version))
+                    self.version = version
+                except FileNotFoundError:
+                    # Pruned by newer publishes between reading the pointer and opening it
+                    version = current_version(self.shared_dir)
+        return self._frame
+
+    @classmethod
+    def open_or_publish(cls, csv_path, shared_dir=SHARED_DIR):
+        """Open the shared table, publishing `csv_path` first if nothing was published yet."""
+        if current_version(shared_dir) is None:
+            publish(_with_explanations(read_reviews(csv_path)), shared_dir)
+        return cls(shared_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish the review table for the dashboard.")
+    parser.add_argument("--publish", metavar="CSV", required=True)
+    parser.add_argument("--dir", default=SHARED_DIR)
+    args = parser.parse_args()
+
+    version = publish(_with_explanations(read_reviews(args.publish)), args.dir)
+    print("Published", args.publish, "as", os.path.join(args.dir, version))
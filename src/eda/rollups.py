@@ -0,0 +1,210 @@
+# src/eda/rollups.py
+"""Hotel x time-bucket rollups for rating and sentiment trends.
+
+Each granularity (day, week, month) keeps one small table indexed by
+(hotel_name, bucket) holding review counts per sentiment, rating sums and
+LDA topic counts. New reviews are folded in with `ingest` (cost grows with
+the batch and the number of buckets, not with the history), and trend
+queries read the buckets instead of regrouping every review. The store
+keeps a hash of every review it folded in (`row_hashes`), so `load_or_build`
+ingests only the reviews a newly published table adds, wherever they are in
+it, and rolls everything up again only when reviews were removed or edited.
+
+    python -m src.eda.rollups --rebuild datasets/clean/haile_reviews_with_topics.csv
+    python -m src.eda.rollups --ingest new_reviews.csv
+"""
+import os
+import argparse
+import numpy as np
+import pandas as pd
+
+from src.data.schema import read_reviews
+
+ROLLUP_DIR = "datasets/clean/rollups"
+GRANULARITIES = ["day", "week", "month"]
+SENTIMENTS = ["positive", "neutral", "negative"]
+FREQ = {"day": "D", "week": "W-MON", "month": "MS"}
+
+
+def bucket_start(dates, granularity):
+    """Start date of the bucket each date falls in (weeks start on Monday)."""
+    dates = pd.to_datetime(dates, errors="coerce").dt.normalize()
+    if granularity == "day":
+        return dates
+    if granularity == "week":
+        return dates - pd.to_timedelta(dates.dt.weekday, unit="D")
+    if granularity == "month":
+        return dates.dt.to_period("M").dt.start_time
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def aggregate(df, granularity):
+    """Roll a batch of reviews up to (hotel_name, bucket) counts and sums."""
+    buckets = bucket_start(df["date"], granularity)
+    valid = buckets.notna()
+    sub = df[valid]
+    batch = pd.DataFrame({
+        "hotel_name": sub["hotel_name"],
+        "bucket": buckets[valid],
+        "n_reviews": 1,
+    }, index=sub.index)
+    for s in SENTIMENTS:
+        batch[f"n_{s}"] = (sub["sentiment"] == s).astype(int)
+    rating = pd.to_numeric(sub["rating_0_5"], errors="coerce")
+    batch["rating_sum"] = rating.fillna(0)
+    batch["rating_count"] = rating.notna().astype(int)
+    if "lda_topic" in sub.columns:
+        batch = batch.join(pd.get_dummies(sub["lda_topic"].astype("Int64"), prefix="topic", dtype=int))
+    return batch.groupby(["hotel_name", "bucket"]).sum().fillna(0)
+
+
+def row_hashes(df):
+    """One uint64 hash per review of the columns the rollups read.
+
+    Values are normalised first (dates to days, numbers to float, labels to
+    str), so the same reviews hash the same from a CSV or an Arrow table.
+    """
+    n = len(df)
+    canon = pd.DataFrame({
+        "hotel_name": df["hotel_name"].to_numpy(dtype=object, na_value=""),
+        "day": bucket_start(df["date"], "day").to_numpy(dtype="datetime64[ns]"),
+        "sentiment": df["sentiment"].to_numpy(dtype=object, na_value="") if "sentiment" in df.columns
+        else np.full(n, "", dtype=object),
+    })
+    for col in ["rating_0_5", "lda_topic"]:
+        canon[col] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float, na_value=np.nan) \
+            if col in df.columns else np.full(n, np.nan)
+    return pd.util.hash_pandas_object(canon, index=False).to_numpy()
+
+
+def new_rows(folded, hashes):
+    """Mask of the rows with `hashes` not among the `folded` ones; None if some folded ones are gone.
+
+    Equal hashes (e.g. two 5-star reviews of a hotel on one day) pair up
+    one to one: a value folded in twice marks its first two rows as known.
+    """
+    values, counts = np.unique(folded, return_counts=True)
+    order = np.argsort(hashes, kind="stable")
+    ranked = hashes[order]
+    present = np.searchsorted(ranked, values, "right") - np.searchsorted(ranked, values, "left")
+    if (present < counts).any():
+        return None
+    occurrence = np.empty(hashes.size, dtype=np.int64)
+    occurrence[order] = np.arange(hashes.size) - np.searchsorted(ranked, ranked, "left")
+    pos = np.minimum(np.searchsorted(values, hashes), max(values.size - 1, 0))
+    known = np.where(values[pos] == hashes, counts[pos], 0) if values.size else np.zeros(hashes.size, dtype=np.int64)
+    return occurrence >= known
+
+
+class RollupStore:
+    def __init__(self, tables=None, hashes=None):
+        self.tables = tables or {g: pd.DataFrame() for g in GRANULARITIES}
+        # row_hashes of every review folded in; None if unknown
+        self.hashes = np.zeros(0, dtype=np.uint64) if tables is None else hashes
+
+    @classmethod
+    def build(cls, df):
+        return cls().ingest(df)
+
+    def ingest(self, df):
+        """Fold a batch of new reviews into every granularity."""
+        for g in GRANULARITIES:
+            agg = aggregate(df, g)
+            table = self.tables[g]
+            table = agg if table.empty else table.add(agg, fill_value=0)
+            table = table.fillna(0)
+            counts = table.columns.drop("rating_sum")
+            table[counts] = table[counts].astype("int64")
+            self.tables[g] = table.sort_index()
+        if self.hashes is not None:
+            self.hashes = np.concatenate([self.hashes, row_hashes(df)])
+        return self
+
+    @property
+    def n_reviews(self):
+        table = self.tables["month"]
+        return 0 if table.empty else int(table["n_reviews"].sum())
+
+    def trend(self, granularity="month", hotel=None, window=1):
+        """Per-bucket metrics for one hotel (or all hotels), plus rolling averages.
+
+        The rolling rating is sum(rating_sum) / sum(rating_count) over the
+        last `window` buckets, so busy buckets weigh more than quiet ones.
+        """
+        table = self.tables[granularity]
+        if table.empty:
+            return pd.DataFrame()
+        if hotel is None:
+            rows = table.groupby(level="bucket").sum()
+        elif hotel in table.index.get_level_values("hotel_name"):
+            rows = table.xs(hotel, level="hotel_name")
+        else:
+            return pd.DataFrame()
+
+        # Empty buckets count as zero reviews, not as missing rows
+        full = pd.date_range(rows.index.min(), rows.index.max(), freq=FREQ[granularity])
+        rows = rows.reindex(full, fill_value=0)
+        rows.index.name = "bucket"
+
+        out = rows.copy()
+        out["avg_rating"] = rows["rating_sum"] / rows["rating_count"].where(rows["rating_count"] > 0)
+        for s in SENTIMENTS:
+            out[f"share_{s}"] = rows[f"n_{s}"] / rows["n_reviews"].where(rows["n_reviews"] > 0)
+        rolled = rows.rolling(window, min_periods=1).sum()
+        out["rolling_avg_rating"] = rolled["rating_sum"] / rolled["rating_count"].where(rolled["rating_count"] > 0)
+        out["rolling_share_negative"] = rolled["n_negative"] / rolled["n_reviews"].where(rolled["n_reviews"] > 0)
+        return out
+
+    def save(self, out_dir=ROLLUP_DIR):
+        os.makedirs(out_dir, exist_ok=True)
+        for g, table in self.tables.items():
+            table.to_csv(os.path.join(out_dir, f"{g}.csv"))
+        if self.hashes is not None:
+            np.save(os.path.join(out_dir, "row_hashes.npy"), self.hashes)
+        return out_dir
+
+    @classmethod
+    def load(cls, out_dir=ROLLUP_DIR):
+        tables = {}
+        for g in GRANULARITIES:
+            path = os.path.join(out_dir, f"{g}.csv")
+            if os.path.exists(path):
+                tables[g] = pd.read_csv(path, parse_dates=["bucket"]).set_index(["hotel_name", "bucket"])
+            else:
+                tables[g] = pd.DataFrame()
+        path = os.path.join(out_dir, "row_hashes.npy")
+        hashes = np.load(path) if os.path.exists(path) else None  # None: saved before the store kept them
+        return cls(tables, hashes)
+
+
+def load_or_build(df, out_dir=ROLLUP_DIR):
+    """Saved rollups brought up to the reviews of `df`.
+
+    Reviews of `df` not folded in yet are ingested; the rollups are built
+    again only if some folded-in review is no longer in `df` (or unknown).
+    """
+    store = RollupStore.load(out_dir)
+    new = None if store.hashes is None else new_rows(store.hashes, row_hashes(df))
+    if new is None:
+        store = RollupStore.build(df)
+        store.save(out_dir)
+    elif new.any():
+        store.ingest(df[new])
+        store.save(out_dir)
+    return store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the hotel x time rollups.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--rebuild", metavar="CSV", help="rebuild all rollups from a full dataset")
+    group.add_argument("--ingest", metavar="CSV", help="fold a batch of new reviews into the rollups")
+    parser.add_argument("--out", default=ROLLUP_DIR)
+    args = parser.parse_args()
+
+    if args.rebuild:
+        store = RollupStore.build(read_reviews(args.rebuild))
+    else:
+        store = RollupStore.load(args.out).ingest(read_reviews(args.ingest))
+    store.save(args.out)
+    print("Rollups cover", store.n_reviews, "reviews. Saved to", args.out)
@@ -1,5 +1,6 @@
 # src/modeling/sentiment_pipeline.py
 import os
+import sys
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
@@ -10,6 +11,14 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report, confusion_matrix
 import joblib
 
+# Allow `python src/modeling/sentiment_pipeline.py` from the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.data.schema import read_reviews
+from src.preprocessing.language_id import ENGLISH_ROUTE
+
 CLEAN_PATH = "datasets/clean/haile_reviews_cleaned.csv"
 OUT_DIR = "models/sentiment"
 os.makedirs(OUT_DIR, exist_ok=True)
@@ -34,18 +43,24 @@ def prepare_data(df):
         df['sentiment'] = df['rating_0_5'].apply(label_from_rating)
     # Use only known labels
     df = df[df['sentiment'].isin(['positive','neutral','negative'])].copy()
+    # The vectorizer is English; other languages are cleaned without lemmas
+    if 'lang' in df.columns:
+        df = df[df['lang'].isin(ENGLISH_ROUTE)].copy()
     df['text'] = df['clean_full_text'].fillna("")
     # optionally balance classes or show counts
     print("Class distribution:\n", df['sentiment'].value_counts())
     return df
 
-def train_and_save(df):
+def make_vectorizer():
+    return TfidfVectorizer(max_features=15000, ngram_range=(1,2))
+
+def train_and_save(df, out_dir=OUT_DIR):
     X = df['text']
     y = df['sentiment']
 
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
 
-    tfidf = TfidfVectorizer(max_features=15000, ngram_range=(1,2))
+    tfidf = make_vectorizer()
     Xtr = tfidf.fit_transform(X_train)
     Xt = tfidf.transform(X_test)
 
@@ -63,13 +78,14 @@ def train_and_save(df):
         print(f"=== {name} classification report ===")
         print(classification_report(y_test, preds))
         results[name] = m
-        joblib.dump(m, os.path.join(OUT_DIR, f"{name}.joblib"))
+        joblib.dump(m, os.path.join(out_dir, f"{name}.joblib"))
 
-    joblib.dump(tfidf, os.path.join(OUT_DIR, "tfidf.joblib"))
-    print("Saved vectorizer and models to", OUT_DIR)
+    joblib.dump(tfidf, os.path.join(out_dir, "tfidf.joblib"))
+    print("Saved vectorizer and models to", out_dir)
+    return tfidf, results
 
 def run():
-    df = pd.read_csv(CLEAN_PATH)
+    df = read_reviews(CLEAN_PATH)
     df = prepare_data(df)
     train_and_save(df)
 
@@ -1,21 +1,37 @@
 # src/modeling/topic_modeling.py
 import os
+import sys
 import pandas as pd
 import joblib
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.decomposition import LatentDirichletAllocation
 
+# Allow `python src/modeling/topic_modeling.py` from the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.data.schema import read_reviews, write_reviews
+from src.data.shared_table import publish
+from src.modeling.explain import add_explanations
+from src.preprocessing.language_id import ENGLISH_ROUTE
+from src.preprocessing.topic_labeling import label_topics
+
 CLEAN_PATH = "datasets/clean/haile_reviews_cleaned.csv"
 OUT_FILE = "datasets/clean/haile_reviews_with_topics.csv"
 MODEL_DIR = "models/topics"
 os.makedirs(MODEL_DIR, exist_ok=True)
 
-def lda_topics(df, n_topics=6):
+def lda_topics(df, n_topics=6, model_dir=MODEL_DIR):
     texts = df['clean_full_text'].fillna("").tolist()
     vec = CountVectorizer(max_features=5000, stop_words='english')
-    X = vec.fit_transform(texts)
+    # Topics are learned from the reviews cleaned as English, then assigned to all
+    english = df['lang'].isin(ENGLISH_ROUTE).to_numpy() if 'lang' in df.columns else slice(None)
+    if 'lang' in df.columns and not english.any():
+        raise ValueError(f"No English reviews to fit topics on; languages: {df['lang'].value_counts().to_dict()}")
+    X = vec.fit(df['clean_full_text'].fillna("")[english]).transform(texts)
     lda = LatentDirichletAllocation(n_components=n_topics, random_state=42, learning_method='batch')
-    lda.fit(X)
+    lda.fit(X[english])
     # get dominant topic for each doc
     doc_topic = lda.transform(X)
     dominant = doc_topic.argmax(axis=1)
@@ -26,7 +42,7 @@ def lda_topics(df, n_topics=6):
     for i, comp in enumerate(lda.components_):
         top_idx = comp.argsort()[-15:][::-1]
         topic_keywords[i] = [words[t] for t in top_idx]
-    joblib.dump({'lda':lda, 'vectorizer':vec, 'keywords':topic_keywords}, os.path.join(MODEL_DIR, "lda_topics.joblib"))
+    joblib.dump({'lda':lda, 'vectorizer':vec, 'keywords':topic_keywords}, os.path.join(model_dir, "lda_topics.joblib"))
     return df, topic_keywords
 
 def try_bertopic(df):
@@ -44,15 +60,20 @@ def try_bertopic(df):
         return df, None
 
 def run():
-    df = pd.read_csv(CLEAN_PATH)
+    df = read_reviews(CLEAN_PATH)
     df_lda, keywords = lda_topics(df, n_topics=8)
     print("LDA topic keywords:")
     for k,v in keywords.items():
         print(k, v[:10])
     # optional: try bertopic
     # df_bert, bert_model = try_bertopic(df_lda)
-    df_lda.to_csv(OUT_FILE, index=False)
+    # Aspects, predictions and their top terms are stored with the table, the dashboard only reads them
+    df_lda, _ = label_topics(df_lda)
+    df_lda = add_explanations(df_lda)
+    write_reviews(df_lda, OUT_FILE)
     print("Saved with topics to", OUT_FILE)
+    # Running dashboards switch to the new table on their next rerun
+    print("Published shared table", publish(df_lda))
 
 if __name__ == "__main__":
     run()
@@ -0,0 +1,410 @@
+# src/monitoring/drift.py
+"""Drift and quality monitoring of review batches against the training data.
+
+Every ingested batch is summarised per (hotel, day) into a `ReviewSketch`:
+a count-min sketch of token counts, a HyperLogLog of the vocabulary,
+rating and predicted-sentiment histograms, out-of-vocabulary counts for
+the sentiment and LDA vectorizers, and the heaviest tokens. Sketches have
+a fixed size and merge, so any hotel x date range is one merge away. The
+store keeps RETENTION_DAYS of daily sketches per hotel and folds older
+days into one sketch per hotel, so memory does not grow with the stream.
+
+Reports compare a merged sketch with the training snapshot (the same
+sketch built over the training data): OOV rates, Jensen-Shannon
+divergence of token frequencies, PSI of the rating and sentiment
+histograms, and frequent tokens the models have never seen.
+
+    python -m src.monitoring.drift --snapshot          # (re)build the training snapshot
+    python -m src.monitoring.drift --ingest new_reviews.csv
+    python -m src.monitoring.drift --report --days 30
+"""
+import os
+import argparse
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.data.schema import read_reviews
+from src.monitoring.sketches import CountMinSketch, HyperLogLog, Histogram, token_hashes
+
+TRAIN_PATH = "datasets/clean/haile_reviews_cleaned.csv"
+SENTIMENT_DIR = "models/sentiment"
+LDA_PATH = "models/topics/lda_topics.joblib"
+SNAPSHOT_PATH = "models/monitoring/training_snapshot.joblib"
+STORE_PATH = "datasets/monitoring/sketches.joblib"
+
+SENTIMENTS = ["positive", "neutral", "negative"]
+RATING_EDGES = [0, 1, 2, 3, 4, 5]
+TOP_K = 50               # heavy-hitter tokens kept per sketch
+SNAPSHOT_TOP_TOKENS = 500  # training tokens compared by the token divergence
+RETENTION_DAYS = 90
+UNKNOWN_DAY = "unknown"
+ARCHIVED = "archived"
+
+# Alert thresholds
+PSI_ALERT = 0.2          # the usual "significant shift" level for PSI
+JS_ALERT = 0.1
+OOV_ALERT_FACTOR = 2.0   # OOV rate this many times the training rate
+MIN_ALERT_REVIEWS = 50   # smaller windows are reported but never alert
+
+
+# ------------------------------
+# SKETCH
+# ------------------------------
+class ReviewSketch:
+    def __init__(self, vocabularies=("sentiment", "lda")):
+        self.n_reviews = 0
+        self.n_tokens = 0
+        self.n_oov = {v: 0 for v in vocabularies}
+        self.tokens = CountMinSketch()
+        self.vocab = HyperLogLog()
+        self.ratings = Histogram(edges=RATING_EDGES)
+        self.sentiment = Histogram(categories=SENTIMENTS)
+        self.top = {}          # heavy hitters: token -> estimated count
+        self._top_hashes = {}  # token -> hash, so re-estimating needs no rehashing
+
+    def _keep_top(self, candidates):
+        """Re-estimate candidate heavy hitters (token -> hash) from the count-min sketch, keep TOP_K."""
+        tokens = list(candidates)
+        counts = self.tokens.query(np.fromiter(candidates.values(), dtype=np.uint64, count=len(tokens)))
+        order = np.argsort(-counts, kind="stable")[:TOP_K]
+        self.top = {tokens[i]: int(counts[i]) for i in order}
+        self._top_hashes = {t: candidates[t] for t in self.top}
+
+    def add_counts(self, tokens, hashes, counts, oov):
+        """Fold in one group's token counts (`oov`: vocabulary name -> OOV mask)."""
+        self.tokens.add(hashes, counts)
+        self.vocab.add(hashes)
+        self.n_tokens += int(counts.sum())
+        for name, mask in oov.items():
+            self.n_oov[name] = self.n_oov.get(name, 0) + int(counts[mask].sum())
+        batch_top = np.argsort(-counts, kind="stable")[:TOP_K]
+        self._keep_top({**self._top_hashes, **{tokens[i]: hashes[i] for i in batch_top}})
+        return self
+
+    def merge(self, other):
+        self.n_reviews += other.n_reviews
+        self.n_tokens += other.n_tokens
+        for name, n in other.n_oov.items():
+            self.n_oov[name] = self.n_oov.get(name, 0) + n
+        self.tokens.merge(other.tokens)
+        self.vocab.merge(other.vocab)
+        self.ratings.merge(other.ratings)
+        self.sentiment.merge(other.sentiment)
+        self._keep_top({**self._top_hashes, **other._top_hashes})
+        return self
+
+    @property
+    def nbytes(self):
+        return self.tokens.table.nbytes + self.vocab.registers.nbytes + self.ratings.counts.nbytes \
+            + self.sentiment.counts.nbytes
+
+
+def review_texts(df):
+    """Model input text: clean_full_text when the batch is cleaned, else title + comment."""
+    if "clean_full_text" in df.columns:
+        return df["clean_full_text"].fillna("").astype(str)
+    return (df["review_title"].fillna("").astype(str) + " " + df["review_comment"].fillna("").astype(str))
+
+
+def review_days(df):
+    days = pd.to_datetime(df["date"], errors="coerce") if "date" in df.columns else pd.Series(pd.NaT, index=df.index)
+    return days.dt.strftime("%Y-%m-%d").fillna(UNKNOWN_DAY)
+
+
+def sketch_batch(df, vocabularies, predict=None, days=None):
+    """One ReviewSketch per (hotel_name, day) of a batch of reviews.
+
+    `vocabularies` maps a name to the set of tokens a model knows (OOV
+    reference); `predict` maps a list of texts to sentiment labels. `days`
+    overrides the day key of each row (default: its review date).
+    """
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    texts = review_texts(df).tolist()
+    days = review_days(df) if days is None else days
+    keys = list(zip(df["hotel_name"].astype(str), days))
+    codes, uniques = pd.factorize(pd.Series(keys, dtype=object))
+    sketches = {key: ReviewSketch(tuple(vocabularies)) for key in uniques}
+
+    # Same tokenization as the TF-IDF and LDA vectorizers (lowercase, 2+ chars)
+    vectorizer = CountVectorizer()
+    try:
+        counts = vectorizer.fit_transform(texts)
+        tokens = vectorizer.get_feature_names_out().tolist()
+    except ValueError:  # no tokens at all in the batch
+        tokens, counts = [], sparse.csr_matrix((len(texts), 0), dtype=np.int64)
+    hashes = token_hashes(tokens)
+    oov = {name: np.fromiter((t not in vocab for t in tokens), dtype=bool, count=len(tokens))
+           for name, vocab in vocabularies.items()}
+
+    # Token counts per group: one sparse product with the group indicator
+    groups = sparse.csr_matrix((np.ones(len(codes)), (codes, np.arange(len(codes)))),
+                               shape=(len(uniques), len(codes)))
+    per_group = (groups @ counts).tocsr()
+
+    ratings = pd.to_numeric(df["rating_0_5"], errors="coerce").to_numpy() if "rating_0_5" in df.columns \
+        else np.full(len(df), np.nan)
+    labels = np.asarray(predict(texts), dtype=object) if predict is not None and texts else None
+
+    for g, key in enumerate(uniques):
+        sketch = sketches[key]
+        rows = codes == g
+        sketch.n_reviews += int(rows.sum())
+        start, stop = per_group.indptr[g], per_group.indptr[g + 1]
+        idx = per_group.indices[start:stop]
+        if idx.size:
+            sketch.add_counts([tokens[i] for i in idx], hashes[idx], per_group.data[start:stop].astype(np.int64),
+                              {name: mask[idx] for name, mask in oov.items()})
+        sketch.ratings.add(ratings[rows])
+        if labels is not None:
+            sketch.sentiment.add(labels[rows])
+    return sketches
+
+
+# ------------------------------
+# TRAINING SNAPSHOT
+# ------------------------------
+def load_models(sentiment_dir=SENTIMENT_DIR, lda_path=LDA_PATH):
+    """(vocabularies, predict) from the saved models; LDA is optional."""
+    import joblib
+
+    tfidf = joblib.load(os.path.join(sentiment_dir, "tfidf.joblib"))
+    model = joblib.load(os.path.join(sentiment_dir, "logreg.joblib"))
+    # OOV is counted per token, so compare with the unigram part of the vocabulary
+    vocabularies = {"sentiment": {t for t in tfidf.vocabulary_ if " " not in t}}
+    if os.path.exists(lda_path):
+        vocabularies["lda"] = set(joblib.load(lda_path)["vectorizer"].vocabulary_)
+
+    def predict(texts):
+        return model.predict(tfidf.transform(texts))
+
+    return vocabularies, predict
+
+
+class TrainingSnapshot:
+    """The training data as one ReviewSketch, plus the exact counts of its top tokens."""
+
+    def __init__(self, df, vocabularies, predict=None):
+        self.vocabularies = vocabularies
+        days = pd.Series(UNKNOWN_DAY, index=df.index)  # one sketch, whatever the dates
+        self.sketch = sketch_batch(df.assign(hotel_name="training"), vocabularies, predict, days)[("training", UNKNOWN_DAY)]
+
+        from sklearn.feature_extraction.text import CountVectorizer
+        vec = CountVectorizer()
+        totals = np.asarray(vec.fit_transform(review_texts(df)).sum(axis=0)).ravel()
+        names = vec.get_feature_names_out()
+        order = np.argsort(-totals, kind="stable")[:SNAPSHOT_TOP_TOKENS]
+        self.top_tokens = [str(names[i]) for i in order]
+        self.top_counts = totals[order].astype(np.int64)
+        self.top_hashes = token_hashes(self.top_tokens)
+
+
+def build_snapshot(train_path=TRAIN_PATH, out_path=SNAPSHOT_PATH):
+    import joblib
+
+    vocabularies, predict = load_models()
+    snapshot = TrainingSnapshot(read_reviews(train_path), vocabularies, predict)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    joblib.dump(snapshot, out_path)
+    return snapshot
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    import joblib
+
+    if os.path.exists(path):
+        return joblib.load(path)
+    return build_snapshot(out_path=path)
+
+
+# ------------------------------
+# STORE
+# ------------------------------
+class MonitorStore:
+    def __init__(self, retention_days=RETENTION_DAYS):
+        self.retention_days = retention_days
+        self.daily = {}     # (hotel, day) -> ReviewSketch
+        self.archive = {}   # hotel -> ReviewSketch of the days past retention
+        self.latest = None  # most recent review day seen
+
+    def _cutoff(self):
+        return (pd.Timestamp(self.latest) - pd.Timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+
+    def ingest(self, df, snapshot, predict=None):
+        """Sketch a batch and merge it in; returns one sketch of the whole batch."""
+        days = review_days(df)
+        known = days[days != UNKNOWN_DAY]
+        if len(known):
+            self.latest = max(self.latest or known.max(), known.max())
+            # Rows already past retention go straight to the archive, not to a daily sketch
+            days = days.mask((days != UNKNOWN_DAY) & (days < self._cutoff()), ARCHIVED)
+
+        summary = ReviewSketch(tuple(snapshot.vocabularies))
+        for (hotel, day), sketch in sketch_batch(df, snapshot.vocabularies, predict, days).items():
+            summary.merge(sketch)
+            if day == ARCHIVED:
+                self._merge_into(self.archive, hotel, sketch)
+            else:
+                self._merge_into(self.daily, (hotel, day), sketch)
+        self._expire()
+        return summary
+
+    @staticmethod
+    def _merge_into(sketches, key, sketch):
+        if key in sketches:
+            sketches[key].merge(sketch)
+        else:
+            sketches[key] = sketch
+
+    def _expire(self):
+        if self.latest is None:
+            return
+        cutoff = self._cutoff()
+        for key in [k for k in self.daily if k[1] != UNKNOWN_DAY and k[1] < cutoff]:
+            self._merge_into(self.archive, key[0], self.daily.pop(key))
+
+    def merged(self, hotel=None, since=None):
+        """One sketch of `hotel` (all hotels if None) since `since` (everything, archive included, if None)."""
+        out = None
+        archived = [((h, UNKNOWN_DAY), s) for h, s in self.archive.items()] if since is None else []
+        for (h, day), sketch in archived + sorted(self.daily.items()):
+            if (hotel is None or h == hotel) and (since is None or (day != UNKNOWN_DAY and day >= since)):
+                if out is None:
+                    out = ReviewSketch(tuple(sketch.n_oov))
+                out.merge(sketch)
+        return out
+
+    @property
+    def hotels(self):
+        return sorted({h for h, _ in self.daily} | set(self.archive))
+
+    @property
+    def nbytes(self):
+        return sum(s.nbytes for s in self.daily.values()) + sum(s.nbytes for s in self.archive.values())
+
+    def save(self, path=STORE_PATH):
+        import joblib
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump(self, path)
+        return path
+
+    @classmethod
+    def load(cls, path=STORE_PATH):
+        import joblib
+        return joblib.load(path) if os.path.exists(path) else cls()
+
+
+# ------------------------------
+# REPORT
+# ------------------------------
+def _distribution(counts, smoothing=0.5):
+    """Additively smoothed proportions, so empty bins do not blow up the log ratios."""
+    counts = np.asarray(counts, dtype=np.float64) + smoothing
+    return counts / counts.sum()
+
+
+def psi(expected, actual):
+    """Population stability index between two histograms."""
+    p, q = _distribution(expected), _distribution(actual)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def js_divergence(expected, actual):
+    """Jensen-Shannon divergence (base 2, in [0, 1]) between two histograms."""
+    p, q = _distribution(expected), _distribution(actual)
+    m = (p + q) / 2
+    return float(0.5 * np.sum(p * np.log2(p / m)) + 0.5 * np.sum(q * np.log2(q / m)))
+
+
+def drift_report(sketch, snapshot):
+    """Drift metrics of `sketch` against the training snapshot, with alerts."""
+    train = snapshot.sketch
+    report = {"reviews": sketch.n_reviews, "tokens": sketch.n_tokens,
+              "vocab_estimate": round(sketch.vocab.estimate()),
+              "train_vocab_estimate": round(train.vocab.estimate())}
+    alerts = []
+    can_alert = sketch.n_reviews >= MIN_ALERT_REVIEWS
+
+    for name, n in sketch.n_oov.items():
+        if name not in train.n_oov:
+            continue
+        rate = n / sketch.n_tokens if sketch.n_tokens else 0.0
+        train_rate = train.n_oov[name] / train.n_tokens if train.n_tokens else 0.0
+        report[f"oov_rate_{name}"] = round(rate, 4)
+        report[f"train_oov_rate_{name}"] = round(train_rate, 4)
+        if can_alert and rate > max(train_rate * OOV_ALERT_FACTOR, 0.01):
+            alerts.append(f"OOV rate for the {name} model is {rate:.1%} (training {train_rate:.1%})")
+
+    # Token frequencies over the training top tokens, everything else in one bin
+    current = sketch.tokens.query(snapshot.top_hashes)
+    expected = np.append(snapshot.top_counts, max(train.n_tokens - snapshot.top_counts.sum(), 0))
+    actual = np.append(current, max(sketch.n_tokens - current.sum(), 0))
+    report["token_js"] = round(js_divergence(expected, actual), 4) if sketch.n_tokens else None
+    if can_alert and report["token_js"] is None:
+        alerts.append(f"No text tokens in {sketch.n_reviews} reviews")
+    elif can_alert and report["token_js"] > JS_ALERT:
+        alerts.append(f"Token distribution shifted (JS {report['token_js']:.3f})")
+
+    for name, hist, train_hist in [("rating", sketch.ratings, train.ratings),
+                                   ("sentiment", sketch.sentiment, train.sentiment)]:
+        if hist.counts.sum() and train_hist.counts.sum():
+            value = psi(train_hist.counts, hist.counts)
+            report[f"{name}_psi"] = round(value, 4)
+            report[f"{name}_distribution"] = {label: round(float(share), 3) for label, share
+                                              in zip(hist.labels, hist.counts / hist.counts.sum())}
+            if can_alert and value > PSI_ALERT:
+                alerts.append(f"{name.capitalize()} distribution shifted (PSI {value:.2f})")
+
+    known = set().union(*snapshot.vocabularies.values()) | set(snapshot.top_tokens)
+    report["new_frequent_tokens"] = {t: c for t, c in sketch.top.items() if t not in known}
+    report["alerts"] = alerts
+    return report
+
+
+def print_report(title, report):
+    print(f"\n=== {title} ===")
+    for k, v in report.items():
+        if k != "alerts":
+            print(f"{k:<24} {v}")
+    for alert in report["alerts"]:
+        print("  !", alert)
+    if report["reviews"] < MIN_ALERT_REVIEWS:
+        print(f"  fewer than {MIN_ALERT_REVIEWS} reviews, alerts are off")
+    elif not report["alerts"]:
+        print("  no drift alerts")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sketch-based drift monitoring of review batches.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--snapshot", action="store_true", help="rebuild the training snapshot")
+    group.add_argument("--ingest", metavar="CSV", help="sketch a batch of reviews and report its drift")
+    group.add_argument("--report", action="store_true", help="report drift per hotel from the store")
+    parser.add_argument("--days", type=int, default=30, help="report window in days (--report)")
+    parser.add_argument("--store", default=STORE_PATH)
+    args = parser.parse_args()
+
+    if args.snapshot:
+        snapshot = build_snapshot()
+        print("Training snapshot:", snapshot.sketch.n_reviews, "reviews,",
+              snapshot.sketch.n_tokens, "tokens. Saved to", SNAPSHOT_PATH)
+    elif args.ingest:
+        snapshot = load_snapshot()
+        _, predict = load_models()
+        store = MonitorStore.load(args.store)
+        batch = store.ingest(read_reviews(args.ingest), snapshot, predict)
+        store.save(args.store)
+        print_report(f"batch {args.ingest}", drift_report(batch, snapshot))
+        print(f"\nStore: {len(store.daily)} hotel-days, {store.nbytes / 2**20:.1f} MB of sketches -> {args.store}")
+    else:
+        snapshot = load_snapshot()
+        store = MonitorStore.load(args.store)
+        since = None
+        if store.latest is not None:
+            since = (pd.Timestamp(store.latest) - pd.Timedelta(days=args.days)).strftime("%Y-%m-%d")
+        for hotel in [None] + store.hotels:
+            sketch = store.merged(hotel, since)
+            if sketch is not None:
+                print_report(f"{hotel or 'all hotels'} since {since}", drift_report(sketch, snapshot))
@@ -0,0 +1,153 @@
+# src/monitoring/sketches.py
+"""Fixed-size, mergeable sketches for monitoring review streams.
+
+Each sketch has the same size however many items it has seen, and two
+sketches built with the same parameters merge into the sketch of the
+combined stream (count-min: add tables, HyperLogLog: max registers,
+histograms: add counts). Items are identified by 64-bit hashes from
+`token_hashes`, which are stable across processes and runs.
+"""
+import hashlib
+
+import numpy as np
+
+CMS_WIDTH = 2048
+CMS_DEPTH = 4
+HLL_PRECISION = 12
+SEED = 20240601
+
+_MASK64 = np.uint64(2**64 - 1)
+
+
+def token_hashes(tokens):
+    """Stable 64-bit hash of each token (Python's hash() is salted per process)."""
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "little") for t in tokens),
+        dtype=np.uint64, count=len(tokens),
+    )
+
+
+def _bit_length(x):
+    """Exact bit length of each uint64 (0 for 0), without float rounding."""
+    x = x.copy()
+    n = np.zeros(x.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        big = x >= np.uint64(1 << shift)
+        n[big] += shift
+        x[big] >>= np.uint64(shift)
+    return n + (x > 0)
+
+
+class CountMinSketch:
+    """Approximate item counts; overestimates by at most e/width of the total w.h.p."""
+
+    def __init__(self, width=CMS_WIDTH, depth=CMS_DEPTH, seed=SEED):
+        self.width, self.depth, self.seed = width, depth, seed
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        rng = np.random.default_rng(seed)
+        # One multiply-shift hash per row, applied on top of the item hash
+        self._mult = rng.integers(1, 2**63, size=depth, dtype=np.uint64) | np.uint64(1)
+        self._add = rng.integers(0, 2**63, size=depth, dtype=np.uint64)
+
+    def _columns(self, hashes):
+        with np.errstate(over="ignore"):
+            mixed = hashes[None, :] * self._mult[:, None] + self._add[:, None]
+        return (mixed >> np.uint64(32)) % np.uint64(self.width)
+
+    def add(self, hashes, counts=None):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        counts = np.ones(hashes.size, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        cols = self._columns(hashes).astype(np.int64)
+        for row in range(self.depth):
+            np.add.at(self.table[row], cols[row], counts)
+        self.total += int(counts.sum())
+        return self
+
+    def query(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if hashes.size == 0:
+            return np.zeros(0, dtype=np.int64)
+        cols = self._columns(hashes).astype(np.int64)
+        return self.table[np.arange(self.depth)[:, None], cols].min(axis=0)
+
+    def merge(self, other):
+        if (other.width, other.depth, other.seed) != (self.width, self.depth, self.seed):
+            raise ValueError("Count-min sketches with different parameters cannot be merged")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+
+class HyperLogLog:
+    """Approximate number of distinct items; ~1.04/sqrt(2**precision) relative error."""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(2**precision, dtype=np.uint8)
+
+    def add(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if hashes.size == 0:
+            return self
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        rest = hashes & (_MASK64 >> p)
+        # Position of the first 1 bit in the remaining 64 - p bits
+        rank = (64 - self.precision) - _bit_length(rest) + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+        return self
+
+    def estimate(self):
+        m = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int((self.registers == 0).sum())
+        if raw <= 2.5 * m and zeros:
+            return m * np.log(m / zeros)  # linear counting for small cardinalities
+        return float(raw)
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("HyperLogLogs with different precision cannot be merged")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+
+class Histogram:
+    """Counts over fixed numeric bins or fixed categories, plus a missing count."""
+
+    def __init__(self, edges=None, categories=None):
+        if (edges is None) == (categories is None):
+            raise ValueError("Give either bin edges or categories")
+        self.edges = None if edges is None else np.asarray(edges, dtype=np.float64)
+        self.categories = None if categories is None else list(categories)
+        n_bins = len(self.edges) - 1 if self.edges is not None else len(self.categories)
+        self.counts = np.zeros(n_bins, dtype=np.int64)
+        self.missing = 0
+
+    @property
+    def labels(self):
+        if self.categories is not None:
+            return self.categories
+        return [f"{lo:g}-{hi:g}" for lo, hi in zip(self.edges[:-1], self.edges[1:])]
+
+    def add(self, values):
+        if self.categories is not None:
+            codes = np.asarray([self.categories.index(v) if v in self.categories else -1 for v in values])
+        else:
+            values = np.asarray(values, dtype=np.float64)
+            codes = np.searchsorted(self.edges, values, side="right") - 1
+            codes[values == self.edges[-1]] = len(self.counts) - 1  # right edge is inclusive
+            codes[np.isnan(values) | (values < self.edges[0]) | (values > self.edges[-1])] = -1
+        codes = np.asarray(codes, dtype=np.int64)
+        self.counts += np.bincount(codes[codes >= 0], minlength=len(self.counts))
+        self.missing += int((codes < 0).sum())
+        return self
+
+    def merge(self, other):
+        if other.labels != self.labels:
+            raise ValueError("Histograms with different bins cannot be merged")
+        self.counts += other.counts
+        self.missing += other.missing
+        return self
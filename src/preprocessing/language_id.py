@@ -0,0 +1,242 @@
+# src/preprocessing/language_id.py
+"""Offline language identification for review text, run in batches.
+
+Amharic is recognised by script: text that is mostly Ge'ez (Ethiopic)
+letters is "am", text that mixes a real share of Ge'ez with Latin letters
+is "mixed". Latin-script text is scored by a character n-gram naive Bayes
+model over English, Afaan Oromo and a handful of other European languages,
+trained on the small sample corpora below when the identifier is created
+(no downloads, no model files). A whole batch is hashed and scored with a
+few numpy passes, without a Python loop per review.
+
+Labels: "en", "om", "am", "mixed", "other" (another Latin-script language)
+and "und" for text too short or too ambiguous to call.
+
+    python -m src.preprocessing.language_id datasets/clean/haile_reviews_combined.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+LATIN_LANGUAGES = ["en", "om", "other"]
+UNDETERMINED = "und"
+# Cleaned, trained on and topic-modelled as English: Latin text too short
+# or ambiguous to call ("Good", "Nice stay") is nearly always English
+ENGLISH_ROUTE = ["en", UNDETERMINED]
+GEEZ_SHARE = 0.5     # at least this share of letters in Ge'ez -> "am"
+MIXED_SHARE = 0.1    # between this and GEEZ_SHARE -> "mixed"
+MIN_LETTERS = 8      # fewer Latin letters than this -> "und"
+MIN_MARGIN = 0.15    # per-n-gram log-likelihood margin below this -> "und"
+N_FEATURES = 2**18
+NGRAM_SIZES = (1, 2, 3, 4)
+HASH_PRIME = np.uint64(1_000_003)
+ALPHA = 0.1
+BATCH_SIZE = 20_000
+
+# Code point ranges (after lowercasing) counted as letters of each script
+LATIN_RANGES = [(0x61, 0x7A), (0xDF, 0xF6), (0xF8, 0x24F)]
+GEEZ_RANGES = [(0x1200, 0x135A), (0x1380, 0x138F), (0x2D80, 0x2DDF), (0xAB00, 0xAB2F)]
+
+# Function words per non-English language, for the cheap cleaning path
+STOP_WORDS = {
+    "om": {
+        "fi", "kan", "kana", "sana", "keessa", "keessatti", "irra", "irratti", "akka", "ni", "dha",
+        "isaa", "isaanii", "ture", "turan", "jira", "jiru", "hin", "garuu", "waliin", "bira", "kee",
+        "koo", "keenya", "nu", "nan", "ani", "isaan", "inni", "ishee", "yoo", "yeroo", "hunda",
+        "itti", "gara", "irraa", "akkam", "miti", "immoo", "ammo",
+    },
+    "am": {
+        "እና", "ነው", "ናቸው", "ነበር", "ላይ", "ውስጥ", "ግን", "በጣም", "ይህ", "ያ", "እኔ", "እኛ",
+        "እሱ", "እሷ", "እነሱ", "ወደ", "ከ", "የ", "ም", "አለ", "አሉ", "ነገር", "ጋር", "ሁሉ", "ምንም",
+    },
+}
+
+SAMPLES = {
+    "en": [
+        "The hotel was very good and the staff were friendly.",
+        "Our room was clean and spacious with a beautiful view of the lake.",
+        "Breakfast was delicious but the coffee was cold.",
+        "The service at the reception was slow and the check-in took an hour.",
+        "There was no hot water in the shower for two days.",
+        "Great location, close to the airport and the city center.",
+        "The pool was dirty and the towels were not replaced.",
+        "I would recommend this resort to families with children.",
+        "The wifi did not work in our room, which was disappointing.",
+        "Excellent food, friendly waiters and a peaceful garden.",
+        "The price is a bit expensive for what you get.",
+        "Noisy at night because of the music from the bar.",
+        "We stayed three nights and enjoyed every moment of it.",
+        "The manager apologised and moved us to a better room.",
+        "Beds were comfortable and the sheets were fresh.",
+        "Thank you for the warm welcome, we will come back again.",
+        "The spa and massage were relaxing after a long trip.",
+        "The air conditioning was broken and nobody came to fix it.",
+        "Housekeeping was quick and the rooms were always tidy.",
+        "Amazing experience, everything was perfect.",
+        "It was okay, nothing special, but good value for money.",
+        "The restaurant menu had many choices and the dinner buffet was great.",
+        "Terrible experience, the room smelled and the carpet was stained.",
+        "Lovely staff who made our stay memorable.",
+        "The gym was small but well equipped.",
+    ],
+    "om": [
+        "Hoteelli kun baay'ee gaarii dha.",
+        "Tajaajilli isaanii saffisaa fi gaarii ture.",
+        "Kutaan qulqulluu fi bal'aa dha.",
+        "Nyaanni mi'aawaa ture, garuu gatiin isaa ol'aanaa dha.",
+        "Hojjettoonni baay'ee nama simatu.",
+        "Bishaan ho'aa hin jiru ture.",
+        "Iddoon hoteelichaa bareedaa dha, haroo bira jira.",
+        "Galatoomaa, deebi'ee dhufuuf nan yaada.",
+        "Interneetiin hin hojjetu ture.",
+        "Siree fi barcumni haaraa dha.",
+        "Kan biraa caalaa gatiin isaa gaarii dha.",
+        "Daa'immaniif iddoo taphaa qaba.",
+        "Dhiheessa nyaata ganamaa baay'ee jaalladheen.",
+        "Hojjettoonni keessummaa kabajuu qabu.",
+        "Sagaleen muuziqaa halkan guutuu nu jeequ ture.",
+        "Hoteela kana hundaaf nan gorsa.",
+        "Bakki bishaan itti daakan qulqulluu miti.",
+        "Qilleensi kutaa keessaa hin hojjetu.",
+        "Mana fincaanii qulqulluu hin turre.",
+        "Yeroo hunda gammachuun nu simatan.",
+        "Bakka boqonnaa gaarii dha, maatii waliin dhufuu dandeessu.",
+        "Tajaajilli kutaa suuta ture.",
+        "Haroo Hawaasaa irraa ilaalchi isaa nama hawwata.",
+        "Hoteela Haile keessa bultii sadii bulle.",
+        "Nageenyi fi qulqullinni isaa gaarii dha.",
+    ],
+    # Other Latin-script languages seen on the booking sites; quarantined
+    "other": [
+        "Très bel hôtel, le personnel était très sympathique.",
+        "La chambre était propre mais le petit déjeuner était froid.",
+        "Sehr schönes Hotel mit einem tollen Blick auf den See.",
+        "Das Zimmer war sauber, aber das Frühstück war enttäuschend.",
+        "El hotel es muy bonito y el personal muy amable.",
+        "La habitación estaba limpia pero el desayuno era caro.",
+        "L'albergo è molto bello e il personale gentile.",
+        "La camera era pulita ma la colazione era fredda.",
+        "O hotel é muito bonito e os funcionários são simpáticos.",
+        "Het hotel was mooi en het personeel was vriendelijk.",
+    ],
+}
+
+
+def _in_ranges(codes, ranges):
+    hit = np.zeros(codes.shape, dtype=bool)
+    for lo, hi in ranges:
+        hit |= (codes >= lo) & (codes <= hi)
+    return hit
+
+
+def char_ngrams(texts):
+    """Hashed character n-grams of a batch of texts.
+
+    All texts are lowercased, space-padded and concatenated into one code
+    point array; each n-gram is a rolling hash over it, and n-grams that
+    would span two texts are dropped. Returns (codes, doc, hashes,
+    hash_doc): every code point with the text it belongs to, and every
+    n-gram hash with its text.
+    """
+    padded = [" " + t.lower() + " " for t in texts]
+    lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+    codes = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    doc = np.repeat(np.arange(len(padded)), lengths)
+
+    hashes, hash_doc = [], []
+    for n in NGRAM_SIZES:
+        stop = codes.size - n + 1
+        if stop <= 0:
+            continue
+        h = codes[:stop].copy()
+        for k in range(1, n):
+            h = h * HASH_PRIME + codes[k:stop + k]  # wraps around, which is fine for hashing
+        within = doc[:stop] == doc[n - 1:]
+        hashes.append((h[within] % np.uint64(N_FEATURES)).astype(np.int64))
+        hash_doc.append(doc[:stop][within])
+    if not hashes:
+        return codes, doc, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return codes, doc, np.concatenate(hashes), np.concatenate(hash_doc)
+
+
+class LanguageIdentifier:
+    def __init__(self, samples=SAMPLES):
+        self.languages = [lang for lang in LATIN_LANGUAGES if lang in samples]
+        # Multinomial naive Bayes: one smoothed log-probability row per language
+        counts = np.vstack([
+            np.bincount(char_ngrams(samples[lang])[2], minlength=N_FEATURES)
+            for lang in self.languages
+        ]).astype(np.float64)
+        self.log_prob = np.log(counts + ALPHA) - np.log(counts.sum(axis=1, keepdims=True) + ALPHA * N_FEATURES)
+
+    def detect(self, texts, batch_size=BATCH_SIZE):
+        """Language label and confidence for each text.
+
+        Returns (labels, scores) as numpy arrays. The score of a Latin-script
+        text is the log-likelihood margin per n-gram between the best and
+        second-best language; Ge'ez shares are returned for "am"/"mixed".
+        """
+        texts = [t if isinstance(t, str) else "" for t in texts]
+        labels, scores = [], []
+        # Batches bound the size of the per-code-point arrays
+        for start in range(0, len(texts), batch_size):
+            batch_labels, batch_scores = self._detect_batch(texts[start:start + batch_size])
+            labels.append(batch_labels)
+            scores.append(batch_scores)
+        if not labels:
+            return np.zeros(0, dtype=object), np.zeros(0)
+        return np.concatenate(labels), np.concatenate(scores)
+
+    def _detect_batch(self, texts):
+        n = len(texts)
+        codes, doc, hashes, hash_doc = char_ngrams(texts)
+        n_latin = np.bincount(doc[_in_ranges(codes, LATIN_RANGES)], minlength=n)
+        n_geez = np.bincount(doc[_in_ranges(codes, GEEZ_RANGES)], minlength=n)
+        n_letters = n_latin + n_geez
+        geez_share = np.divide(n_geez, n_letters, out=np.zeros(n), where=n_letters > 0)
+
+        labels = np.full(n, UNDETERMINED, dtype=object)
+        scores = geez_share.copy()
+        labels[geez_share >= GEEZ_SHARE] = "am"
+        labels[(geez_share >= MIXED_SHARE) & (geez_share < GEEZ_SHARE)] = "mixed"
+
+        latin = (geez_share < MIXED_SHARE) & (n_latin >= MIN_LETTERS)
+        if latin.any() and len(self.languages) > 1:
+            # Sum of log-probabilities of each text's n-grams, per language
+            loglik = np.column_stack([
+                np.bincount(hash_doc, weights=row[hashes], minlength=n) for row in self.log_prob
+            ])
+            n_grams = np.maximum(np.bincount(hash_doc, minlength=n), 1)
+            ranked = np.sort(loglik, axis=1)
+            margin = (ranked[:, -1] - ranked[:, -2]) / n_grams
+            best = np.asarray(self.languages, dtype=object)[loglik.argmax(axis=1)]
+            labels[latin] = np.where(margin >= MIN_MARGIN, best, UNDETERMINED)[latin]
+            scores[latin] = margin[latin]
+        elif latin.any():
+            labels[latin] = self.languages[0]
+        return labels, scores
+
+
+def review_language_texts(df):
+    """Title and comment together: more text makes short reviews easier to call."""
+    title = df["review_title"].fillna("").astype(str) if "review_title" in df.columns else ""
+    return (title + " " + df["review_comment"].fillna("").astype(str)).str.strip()
+
+
+def detect_languages(df, identifier=None):
+    """Add `lang` and `lang_score` columns to `df` and return it."""
+    identifier = identifier or LanguageIdentifier()
+    labels, scores = identifier.detect(review_language_texts(df))
+    df["lang"] = labels
+    df["lang_score"] = np.round(scores, 4)
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Detect the language of each review.")
+    parser.add_argument("input")
+    args = parser.parse_args()
+
+    df = detect_languages(pd.read_csv(args.input))
+    print(df["lang"].value_counts().to_string())
@@ -0,0 +1,187 @@
+# src/preprocessing/topic_labeling.py
+"""Aspect tagging: fills the pipe-separated `topics` column (e.g. "pool|staff").
+
+The aspect lexicon is compiled into one Aho-Corasick automaton over word
+tokens, so each review is scanned once, left to right, whatever the number
+of keywords; multi-word phrases ("hot water", "front desk") are ordinary
+patterns. Tagging returns the `topics` strings plus a sparse review x aspect
+indicator matrix, from which aspect x sentiment counts are one product.
+
+topic_modeling.py tags the reviews before it writes and publishes them, so
+readers rebuild the matrix from the stored column (`AspectTagger.matrix`)
+instead of scanning the text again. To tag a file by hand:
+
+    python -m src.preprocessing.topic_labeling IN.csv OUT.csv
+"""
+import re
+import argparse
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+TEXT_COLUMNS = ["review_title", "review_comment"]
+FALLBACK_TOPIC = "general"
+SENTIMENTS = ["positive", "neutral", "negative"]
+# Sentence punctuation is kept as a token: it never continues a phrase, so
+# matches cannot run across sentences (or from the title into the comment)
+WORD_RE = re.compile(r"[a-z]+(?:-[a-z]+)*|[.!?;]")
+
+ASPECT_LEXICON = {
+    "rooms": ["room", "rooms", "bed", "beds", "bedroom", "suite", "sheets", "bedsheet", "pillow", "pillows"],
+    "food": ["food", "breakfast", "buffet", "dinner", "lunch", "restaurant", "meal", "meals", "dishes",
+             "pastries", "menu", "coffee", "cuisine"],
+    "maintenance": ["ac", "air conditioning", "hot water", "shower", "furniture", "renovation", "broken",
+                    "not working", "carpet", "carpets", "worn out", "odor", "leak", "leaking"],
+    "staff": ["staff", "employees", "team", "waiter", "waiters", "manager", "personnel"],
+    "ambience": ["ambience", "atmosphere", "environment", "compound", "garden", "lobby", "lighting",
+                 "decor", "design", "peaceful", "calm"],
+    "cleaning": ["clean", "cleaned", "cleaning", "cleanliness", "dirty", "unclean", "stains", "stain",
+                 "hygiene", "mold", "moldy", "dust", "towels"],
+    "service": ["service", "check-in", "check in", "checkout", "check-out", "waited", "requests",
+                "room service", "housekeeping"],
+    "view": ["view", "views", "lake view", "scenery", "sunset", "lakeside", "breathtaking"],
+    "internet": ["wi-fi", "wifi", "internet", "connection", "network"],
+    "pool": ["pool", "swimming", "swimming pool"],
+    "noise": ["noise", "noisy", "loud", "music", "construction"],
+    "price": ["price", "prices", "pricey", "expensive", "cheap", "affordable", "value", "worth"],
+    "family": ["family", "kids", "children", "playground", "child"],
+    "location": ["location", "located", "airport", "close to", "downtown", "malls"],
+    "spa": ["spa", "massage", "sauna", "steam", "gym"],
+    "reception": ["reception", "front desk", "receptionist"],
+}
+
+
+class AspectTagger:
+    """Word-level Aho-Corasick automaton over an aspect lexicon."""
+
+    def __init__(self, lexicon=ASPECT_LEXICON):
+        self.aspects = list(lexicon)
+        aspect_ids = {a: i for i, a in enumerate(self.aspects)}
+
+        # State 0 is the root; goto[s] maps a word to the next state
+        self.goto = [{}]
+        self.output = [set()]
+        for aspect, phrases in lexicon.items():
+            for phrase in phrases:
+                state = 0
+                for word in WORD_RE.findall(phrase.lower()):
+                    nxt = self.goto[state].get(word)
+                    if nxt is None:
+                        nxt = len(self.goto)
+                        self.goto[state][word] = nxt
+                        self.goto.append({})
+                        self.output.append(set())
+                    state = nxt
+                self.output[state].add(aspect_ids[aspect])
+
+        # Breadth-first failure links (depth-1 states fail to the root);
+        # outputs are inherited along them
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and word not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(word, 0)
+                self.output[nxt] |= self.output[self.fail[nxt]]
+        self.output = [sorted(o) for o in self.output]
+
+    def scan(self, text):
+        """Aspect ids found in `text`, in order of first appearance."""
+        goto, fail, output = self.goto, self.fail, self.output
+        found = {}
+        state = 0
+        for word in WORD_RE.findall(str(text).lower()):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for a in output[state]:
+                found.setdefault(a, None)
+        return list(found)
+
+    def tag(self, texts):
+        """Tag an iterable of texts.
+
+        Returns (topics, matrix): the pipe-joined aspect names per text
+        (FALLBACK_TOPIC when nothing matched) and a CSR review x aspect
+        indicator matrix.
+        """
+        topics, indices, indptr = [], [], [0]
+        for text in texts:
+            found = self.scan(text)
+            indices.extend(found)
+            indptr.append(len(indices))
+            topics.append("|".join(self.aspects[a] for a in found) or FALLBACK_TOPIC)
+        return topics, self._indicator(indices, indptr)
+
+    def matrix(self, topics):
+        """CSR review x aspect indicator matrix of stored `topics` strings.
+
+        Names outside the lexicon (FALLBACK_TOPIC included) are skipped.
+        """
+        ids = {a: i for i, a in enumerate(self.aspects)}
+        indices, indptr = [], [0]
+        for value in topics:
+            if isinstance(value, str):
+                indices.extend(ids[a] for a in dict.fromkeys(value.split("|")) if a in ids)
+            indptr.append(len(indices))
+        return self._indicator(indices, indptr)
+
+    def _indicator(self, indices, indptr):
+        data = np.ones(len(indices), dtype=np.int32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, len(self.aspects)))
+
+
+def review_texts(df, columns=TEXT_COLUMNS):
+    """Title and comment of each review, separated by a sentence break."""
+    cols = [c for c in columns if c in df.columns]
+    if not cols:
+        raise ValueError(f"No review text to tag: none of the columns {list(columns)} "
+                         f"is in the table ({list(df.columns)})")
+    text = df[cols[0]].fillna("").astype(str)
+    for c in cols[1:]:
+        text = text + " . " + df[c].fillna("").astype(str)
+    return text
+
+
+def aspect_sentiment_matrix(matrix, sentiments, labels=SENTIMENTS):
+    """Sparse aspect x sentiment review counts from the review x aspect matrix."""
+    codes = pd.Categorical(sentiments, categories=labels).codes
+    keep = np.flatnonzero(codes >= 0)
+    onehot = sparse.csr_matrix(
+        (np.ones(keep.size, dtype=np.int32), (keep, codes[keep])),
+        shape=(matrix.shape[0], len(labels)),
+    )
+    return (matrix.T @ onehot).tocsr()
+
+
+def label_topics(df, tagger=None, columns=TEXT_COLUMNS):
+    """Set df["topics"] from the review text; returns (df, review x aspect matrix)."""
+    tagger = tagger or AspectTagger()
+    topics, matrix = tagger.tag(review_texts(df, columns))
+    df["topics"] = topics
+    return df, matrix
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tag reviews with hospitality aspects.")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    args = parser.parse_args()
+
+    from src.data.schema import read_reviews, write_reviews
+
+    df = read_reviews(args.input)
+    tagger = AspectTagger()
+    df, matrix = label_topics(df, tagger)
+    write_reviews(df, args.output, encoding="utf-8")
+
+    if "sentiment" in df.columns:
+        counts = aspect_sentiment_matrix(matrix, df["sentiment"])
+        print(pd.DataFrame(counts.toarray(), index=tagger.aspects, columns=SENTIMENTS))
+    print("Tagged", len(df), "reviews. Saved to", args.output)
@@ -1,15 +1,23 @@
 # booking_scraper.py
-import requests
-import time
 import os
-import pandas as pd
+import sys
+import re
+from urllib.parse import urljoin, urlparse, parse_qs, urlencode, urlunparse
+
 from bs4 import BeautifulSoup
 
+# Allow `python src/scraping/booking_scraper.py` from the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.scraping.pipeline import ReviewSource, ScrapePipeline, register
+
 # ------------------------------
 # CONFIG
 # ------------------------------
 OUT_DIR = "datasets/raw/booking"
-os.makedirs(OUT_DIR, exist_ok=True)
+PAGE_SIZE = 10
 
 HOTEL_URLS = {
     "haile_addis_ababa_grand": "https://www.booking.com/reviews/et/hotel/haile-grand-addis-ababa.html",
@@ -24,6 +32,7 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
     "Accept-Language": "en-US,en;q=0.9",
 }
+DATE_PREFIX_RE = re.compile(r"^\s*reviewed:?\s*", re.IGNORECASE)
 
 
 # ------------------------------
@@ -39,6 +48,87 @@ def normalize_rating(rating_raw):
         return None
 
 
+def next_page_url(soup, url):
+    """The page's own "next" link, else the next ?offset= page."""
+    link = soup.select_one("a#review_next_page_link") or soup.select_one("a.pagenext")
+    if link and link.get("href"):
+        return urljoin(url, link["href"])
+    parts = urlparse(url)
+    if parts.scheme == "file":
+        return None
+    query = parse_qs(parts.query)
+    offset = int(query.get("offset", ["0"])[0]) + PAGE_SIZE
+    query["offset"] = [str(offset)]
+    return urlunparse(parts._replace(query=urlencode(query, doseq=True)))
+
+
+def parse_booking_page(html, url):
+    """Return (rows, next_url) for one Booking.com review page."""
+    soup = BeautifulSoup(html, "html.parser")
+
+    # MAIN SELECTORS
+    blocks = soup.select(".review_list_item")
+
+    # FALLBACK SELECTOR
+    if not blocks:
+        blocks = soup.select("div[data-review-id]")
+
+    # If no reviews appear → stop
+    if not blocks:
+        return [], None
+
+    reviews = []
+    for b in blocks:
+        try:
+            # Rating
+            rating_tag = (
+                b.select_one(".review-score-badge") or
+                b.select_one(".bui-review-score__badge")
+            )
+            rating_raw = rating_tag.get_text(strip=True) if rating_tag else None
+
+            # Title
+            title_tag = (
+                b.select_one(".review_item_header_content") or
+                b.select_one(".c-review-block__title")
+            )
+            title = title_tag.get_text(strip=True) if title_tag else ""
+
+            # Comment
+            comment_tag = (
+                b.select_one(".review_item_review_content") or
+                b.select_one(".c-review__body")
+            )
+            comment = comment_tag.get_text(strip=True) if comment_tag else ""
+
+            # Date
+            date_tag = b.select_one(".review_item_date") or b.select_one(".c-review-block__date")
+            review_date = DATE_PREFIX_RE.sub("", date_tag.get_text(strip=True)) if date_tag else None
+
+            reviews.append({
+                "review_id": b.get("data-review-id"),
+                "rating_raw": rating_raw,
+                "rating_0_5": normalize_rating(rating_raw),
+                "review_title": title,
+                "review_comment": comment,
+                "date": review_date,
+            })
+        except Exception:
+            continue
+
+    return reviews, next_page_url(soup, url)
+
+
+@register
+class BookingSource(ReviewSource):
+    name = "booking"
+    hotel_urls = HOTEL_URLS
+    headers = HEADERS
+
+    def parse(self, text, url, hotel_key):
+        return parse_booking_page(text, url)
+
+
 # ------------------------------
 # SCRAPER FUNCTION
 # ------------------------------
@@ -49,78 +139,13 @@ def scrape_booking(hotel_key, base_url, pages=3, delay=2):
     print("========================================")
     print("")
 
-    reviews = []
-
-    for page in range(pages):
-        offset = page * 10
-        url = f"{base_url}?offset={offset}"
+    stats = ScrapePipeline(max_pages=pages, delay=delay).run([(BookingSource(), hotel_key, base_url)])
+    for e in stats["errors"]:
+        print("[Error]", e)
 
-        print("[Page", page+1, "] Fetching:", url)
-
-        try:
-            r = requests.get(url, headers=HEADERS, timeout=20)
-            r.raise_for_status()
-        except Exception as e:
-            print("[Error] Failed to load page:", e)
-            break
-
-        soup = BeautifulSoup(r.text, "html.parser")
-
-        # MAIN SELECTORS
-        blocks = soup.select(".review_list_item")
-
-        # FALLBACK SELECTOR
-        if not blocks:
-            blocks = soup.select("div[data-review-id]")
-
-        # If no reviews appear → stop
-        if not blocks:
-            print("[Warning] No review blocks found on this page. Stopping.")
-            break
-
-        for b in blocks:
-            try:
-                # Rating
-                rating_tag = (
-                    b.select_one(".review-score-badge") or
-                    b.select_one(".bui-review-score__badge")
-                )
-                rating_raw = rating_tag.get_text(strip=True) if rating_tag else None
-                rating = normalize_rating(rating_raw)
-
-                # Title
-                title_tag = (
-                    b.select_one(".review_item_header_content") or
-                    b.select_one(".c-review-block__title")
-                )
-                title = title_tag.get_text(strip=True) if title_tag else ""
-
-                # Comment
-                comment_tag = (
-                    b.select_one(".review_item_review_content") or
-                    b.select_one(".c-review__body")
-                )
-                comment = comment_tag.get_text(strip=True) if comment_tag else ""
-
-                reviews.append({
-                    "hotel_name": hotel_key,
-                    "source": "booking",
-                    "rating": rating,
-                    "review_title": title,
-                    "review_comment": comment,
-                })
-            except Exception:
-                continue
-
-        time.sleep(delay)
-
-    # Save CSV
-    out_file = f"{OUT_DIR}/{hotel_key}.csv"
-
-    if reviews:
-        df = pd.DataFrame(reviews)
-        df.to_csv(out_file, index=False, encoding="utf-8")
-        print("[Saved]", len(df), "reviews to", out_file)
+    out_file = BookingSource().out_file(OUT_DIR, hotel_key)
+    if stats["rows"]:
+        print("[Saved]", stats["rows"], "reviews to", out_file)
     else:
         print("[Stop] No reviews collected for", hotel_key)
 
@@ -132,6 +157,5 @@ def scrape_booking(hotel_key, base_url, pages=3, delay=2):
 # ------------------------------
 if __name__ == "__main__":
     print("--- Starting Booking.com Scraper ---")
-    for key, url in HOTEL_URLS.items():
-        scrape_booking(key, url, pages=5)
+    ScrapePipeline(max_pages=5).run([(BookingSource(), key, url) for key, url in HOTEL_URLS.items()])
     print("--- Finished ---")
@@ -0,0 +1,90 @@
+# facebook_reviews.py
+import os
+import sys
+import json
+from urllib.parse import urljoin, urlparse, parse_qs, urlencode, urlunparse
+
+import requests
+
+# Allow `python src/scraping/facebook_reviews.py` from the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.scraping.pipeline import ReviewSource, ScrapePipeline, register
+
+# ------------------------------
+# CONFIG
+# ------------------------------
+OUT_DIR = "datasets/raw/facebook"
+GRAPH_URL = "https://graph.facebook.com/v19.0"
+FIELDS = "created_time,recommendation_type,rating,review_text,open_graph_story{id}"
+
+# Facebook page id per hotel (hotel_key -> page id); fill in to scrape
+HOTEL_PAGES = {}
+
+# Page access token with pages_read_user_content; never written to the CSVs
+TOKEN_ENV = "FACEBOOK_ACCESS_TOKEN"
+
+
+# ------------------------------
+# HELPERS
+# ------------------------------
+def ratings_url(page_id, limit=100):
+    return f"{GRAPH_URL}/{page_id}/ratings?" + urlencode({"fields": FIELDS, "limit": limit})
+
+
+def strip_token(url):
+    """Graph API paging links embed the access token; keep it out of the data."""
+    parts = urlparse(url)
+    query = {k: v for k, v in parse_qs(parts.query).items() if k != "access_token"}
+    return urlunparse(parts._replace(query=urlencode(query, doseq=True)))
+
+
+def parse_ratings_page(text, url):
+    """Return (rows, next_url) for one page of the Graph API /ratings edge."""
+    payload = json.loads(text)
+    reviews = []
+    for item in payload.get("data", []):
+        # Recommendations are positive/negative; only older reviews carry stars
+        rating = item.get("rating")
+        reviews.append({
+            "review_id": (item.get("open_graph_story") or {}).get("id"),
+            "rating_raw": rating if rating is not None else item.get("recommendation_type"),
+            "rating_0_5": float(rating) if rating is not None else None,
+            "review_title": "",
+            "review_comment": item.get("review_text", ""),
+            "date": (item.get("created_time") or "")[:10] or None,
+        })
+    next_url = payload.get("paging", {}).get("next")
+    return reviews, strip_token(urljoin(url, next_url)) if reviews and next_url else None
+
+
+@register
+class FacebookSource(ReviewSource):
+    name = "facebook"
+    delay = 1.0
+
+    @property
+    def hotel_urls(self):
+        return {key: ratings_url(page_id) for key, page_id in HOTEL_PAGES.items()}
+
+    def fetch(self, url):
+        if url.startswith("file:"):
+            return super().fetch(url)
+        r = requests.get(url, params={"access_token": os.environ[TOKEN_ENV]}, timeout=20)
+        r.raise_for_status()
+        return r.text
+
+    def parse(self, text, url, hotel_key):
+        return parse_ratings_page(text, url)
+
+
+# ------------------------------
+# RUN
+# ------------------------------
+if __name__ == "__main__":
+    print("--- Starting Facebook Reviews Scraper ---")
+    source = FacebookSource()
+    ScrapePipeline(max_pages=10).run([(source, key, url) for key, url in source.hotel_urls.items()])
+    print("--- Finished ---")
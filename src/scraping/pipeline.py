@@ -0,0 +1,329 @@
+# src/scraping/pipeline.py
+"""Review source plugins and the fetch -> parse -> write scraping pipeline.
+
+Every review site is a `ReviewSource` subclass registered with `@register`.
+A run is three stages joined by bounded queues:
+
+    fetch (threads, network I/O) -> parse (process pool, CPU) -> write (one thread)
+
+Fetchers download pages. Worker processes parse them into rows plus the
+next page URL, which goes back to the fetchers. Parsed pages are handed
+from the pool's callback to a collector thread, so a slow writer never
+holds up the delivery of parse results. The writer appends rows to
+one CSV per hotel in batches, so a run never holds all rows in memory. A
+full queue blocks the stage in front of it instead of buffering more. Each
+parsed page is validated against the review schema before it is queued; a
+page with bad rows is reported as an error and none of its rows are written.
+
+    python -m src.scraping --sources booking tripadvisor --pages 5
+    python -m src.scraping --fixtures --out /tmp/raw     # offline smoke run
+"""
+import os
+import csv
+import time
+import queue
+import importlib
+import threading
+import multiprocessing
+from datetime import date
+from pathlib import Path
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+from concurrent.futures import ProcessPoolExecutor
+
+import requests
+import pandas as pd
+
+from src.data.schema import validate
+
+RAW_ROOT = "datasets/raw"
+FIXTURE_DIR = "src/scraping/fixtures"
+PLUGIN_MODULES = [
+    "src.scraping.booking_scraper",
+    "src.scraping.tripadvisor_scraper",
+    "src.scraping.tripdotcom_scraper",
+    "src.scraping.facebook_reviews",
+]
+COLUMNS = [
+    "hotel_name", "source", "review_id", "rating_raw", "rating_0_5",
+    "review_title", "review_comment", "date", "scraped_at", "url",
+]
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+FETCH_WORKERS = 4
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
+QUEUE_SIZE = 16
+WRITE_BATCH = 500
+
+SOURCES = {}
+
+
+def register(cls):
+    """Class decorator: make a ReviewSource available to the pipeline by name."""
+    SOURCES[cls.name] = cls
+    return cls
+
+
+def load_sources():
+    """Import every plugin module so their sources register themselves."""
+    for module in PLUGIN_MODULES:
+        importlib.import_module(module)
+    return SOURCES
+
+
+# ------------------------------
+# SOURCE PLUGINS
+# ------------------------------
+class ReviewSource:
+    name = None
+    hotel_urls = {}       # hotel_key -> first review page
+    delay = 2.0           # seconds between two requests to this source
+    headers = HEADERS
+
+    @property
+    def out_dir(self):
+        return os.path.join(RAW_ROOT, self.name)
+
+    def out_file(self, out_dir, hotel_key):
+        return os.path.join(out_dir, f"{hotel_key}.csv")
+
+    def fetch(self, url):
+        """Page body as text; file:// URLs are read from disk (fixtures)."""
+        if url.startswith("file:"):
+            with open(url2pathname(urlparse(url).path), encoding="utf-8") as f:
+                return f.read()
+        r = requests.get(url, headers=self.headers, timeout=20)
+        r.raise_for_status()
+        return r.text
+
+    def parse(self, text, url, hotel_key):
+        """Return (rows, next_url) for one page.
+
+        Runs in a worker process, so it must only use its arguments. Rows are
+        dicts keyed by COLUMNS; hotel_name, source, url and scraped_at are
+        filled in by the pipeline when missing.
+        """
+        raise NotImplementedError
+
+    def fixture_urls(self, fixture_dir=FIXTURE_DIR):
+        """hotel_key -> file URL of the first page under fixtures/<source>/<hotel_key>/."""
+        root = Path(fixture_dir, self.name)
+        if not root.is_dir():
+            return {}
+        urls = {}
+        for hotel_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+            pages = sorted(hotel_dir.glob("page1.*"))
+            if pages:
+                urls[hotel_dir.name] = pages[0].resolve().as_uri()
+        return urls
+
+
+# ------------------------------
+# PIPELINE
+# ------------------------------
+class ScrapePipeline:
+    def __init__(self, max_pages=5, out_root=None, fetch_workers=FETCH_WORKERS,
+                 parse_workers=PARSE_WORKERS, queue_size=QUEUE_SIZE, batch_size=WRITE_BATCH,
+                 delay=None):
+        self.max_pages = max_pages
+        self.out_root = out_root
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.delay = delay
+
+    def run(self, jobs):
+        """Scrape `jobs`, a list of (source, hotel_key, first_url); returns run stats."""
+        self.stats = {"pages": 0, "rows": 0, "errors": [], "files": {}}
+        if not jobs:
+            return self.stats
+
+        self._fetch_q = queue.Queue()  # holds at most one page per hotel being crawled
+        self._parse_q = queue.Queue(maxsize=self.queue_size)
+        self._write_q = queue.Queue(maxsize=self.queue_size)
+        self._parsed_q = queue.Queue()  # bounded by _in_flight: a page keeps its slot until collected
+        self._in_flight = threading.BoundedSemaphore(2 * self.parse_workers)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._done = threading.Event()
+        self._next_request = {}
+
+        for source, hotel_key, url in jobs:
+            self._schedule(source, hotel_key, url, 1)
+
+        # spawn: worker processes must not inherit the fetcher threads' state
+        pool = ProcessPoolExecutor(self.parse_workers, mp_context=multiprocessing.get_context("spawn"))
+        fetchers = [threading.Thread(target=self._fetch_loop, daemon=True) for _ in range(self.fetch_workers)]
+        dispatcher = threading.Thread(target=self._dispatch_loop, args=(pool,), daemon=True)
+        collector = threading.Thread(target=self._collect_loop, daemon=True)
+        writer = threading.Thread(target=self._write_loop, daemon=True)
+        for t in fetchers + [dispatcher, collector, writer]:
+            t.start()
+
+        self._done.wait()
+        for _ in fetchers:
+            self._fetch_q.put(None)
+        self._parse_q.put(None)
+        for t in fetchers + [dispatcher]:
+            t.join()
+        pool.shutdown(wait=True)
+        self._parsed_q.put(None)
+        collector.join()
+        self._write_q.put(None)
+        writer.join()
+        return self.stats
+
+    def _schedule(self, source, hotel_key, url, page):
+        with self._lock:
+            self._pending += 1
+        self._fetch_q.put((source, hotel_key, url, page))
+
+    def _finish_page(self):
+        with self._lock:
+            self._pending -= 1
+            if self._pending == 0:
+                self._done.set()
+
+    def _error(self, job, e):
+        self._record_error(f"{job[0].name} {job[2]}", e)
+
+    def _record_error(self, what, e):
+        with self._lock:
+            self.stats["errors"].append(f"{what}: {type(e).__name__}: {e}")
+
+    def _wait_turn(self, source):
+        """Space out requests to the same source by its delay."""
+        delay = source.delay if self.delay is None else self.delay
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_request.get(source.name, now))
+            self._next_request[source.name] = start + delay
+        time.sleep(start - now)
+
+    def _fetch_loop(self):
+        while True:
+            job = self._fetch_q.get()
+            if job is None:
+                return
+            source, hotel_key, url, page = job
+            self._wait_turn(source)
+            try:
+                text = source.fetch(url)
+            except Exception as e:
+                self._error(job, e)
+                self._finish_page()
+                continue
+            with self._lock:
+                self.stats["pages"] += 1
+            self._parse_q.put((job, text))  # blocks while the parsers are behind
+
+    def _dispatch_loop(self, pool):
+        while True:
+            item = self._parse_q.get()
+            if item is None:
+                return
+            job, text = item
+            source, hotel_key, url, _ = job
+            self._in_flight.acquire()  # bounds the pages handed to the pool
+            try:
+                future = pool.submit(source.parse, text, url, hotel_key)
+            except Exception as e:  # e.g. BrokenProcessPool: the page is done, with an error
+                self._in_flight.release()
+                self._error(job, e)
+                self._finish_page()
+                continue
+            # Runs on the pool's result thread: only hand the page on, never block there
+            future.add_done_callback(lambda f, job=job: self._parsed_q.put((job, f)))
+
+    def _collect_loop(self):
+        while True:
+            item = self._parsed_q.get()
+            if item is None:
+                return
+            self._on_parsed(*item)
+
+    def _on_parsed(self, job, future):
+        source, hotel_key, url, page = job
+        try:
+            try:
+                rows, next_url = future.result()
+                if rows:
+                    validate(pd.DataFrame(rows), required=("review_comment",), name=f"page {page}")
+            except Exception as e:
+                self._error(job, e)
+                return
+            if rows:
+                self._write_q.put((source, hotel_key, url, rows))  # blocks while the writer is behind
+            if next_url and next_url != url and page < self.max_pages:
+                self._schedule(source, hotel_key, next_url, page + 1)
+        finally:
+            self._in_flight.release()  # the dispatcher waits on this while the writer is behind
+            self._finish_page()
+
+    def _write_loop(self):
+        # Keeps taking pages after a failed write, so the collector never blocks on a full queue
+        buffers = {}
+        failed = set()  # files a write failed for; their later rows are dropped
+        scraped_at = date.today().isoformat()
+        while True:
+            item = self._write_q.get()
+            if item is None:
+                break
+            source, hotel_key, url, rows = item
+            out_dir = os.path.join(self.out_root, source.name) if self.out_root else source.out_dir
+            path = source.out_file(out_dir, hotel_key)
+            if path in failed:
+                continue
+            buf = buffers.setdefault(path, [])
+            for row in rows:
+                row.setdefault("hotel_name", hotel_key)
+                row.setdefault("source", source.name)
+                row.setdefault("url", url)
+                row.setdefault("scraped_at", scraped_at)
+                buf.append(row)
+            if len(buf) >= self.batch_size:
+                self._flush_or_drop(path, buf, failed)
+        for path, buf in buffers.items():
+            if path not in failed:
+                self._flush_or_drop(path, buf, failed)
+
+    def _flush_or_drop(self, path, buf, failed):
+        try:
+            self._flush(path, buf)
+        except Exception as e:  # disk full, permissions, ...
+            self._record_error(f"write {path}", e)
+            failed.add(path)
+            buf.clear()
+
+    def _flush(self, path, buf):
+        if not buf:
+            return
+        # The first batch of a run replaces the file, later ones append
+        first = path not in self.stats["files"]
+        if first:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w" if first else "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction="ignore")
+            if first:
+                writer.writeheader()
+            writer.writerows(buf)
+        self.stats["files"][path] = self.stats["files"].get(path, 0) + len(buf)
+        self.stats["rows"] += len(buf)
+        buf.clear()
+
+
+def build_jobs(source_names=None, hotels=None, fixtures=False, fixture_dir=FIXTURE_DIR):
+    """(source, hotel_key, first_url) for every selected source and hotel."""
+    load_sources()
+    jobs = []
+    for name in source_names or list(SOURCES):
+        source = SOURCES[name]()
+        urls = source.fixture_urls(fixture_dir) if fixtures else source.hotel_urls
+        for hotel_key, url in urls.items():
+            if hotels is None or hotel_key in hotels:
+                jobs.append((source, hotel_key, url))
+    return jobs
@@ -1,11 +1,19 @@
-import requests
+import os
+import sys
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urljoin
+
 from bs4 import BeautifulSoup
-import time, csv, os
-import pandas as pd
-from typing import List, Dict, Any
+
+# Allow `python src/scraping/tripadvisor_scraper.py` from the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.scraping.pipeline import ReviewSource, ScrapePipeline, register
 
 OUT_DIR = "datasets/raw/tripadvisor"
-os.makedirs(OUT_DIR, exist_ok=True)
+BASE_URL = "https://www.tripadvisor.com"
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
@@ -48,7 +56,8 @@ def extract_reviews_from_page(soup) -> List[Dict[str, Any]]:
             if rating_tag:
                 cls = rating_tag.get("class", [])
                 for c in cls:
-                    if "bubble_" in c:
+                    # "ui_bubble_rating" also contains "bubble_"
+                    if c.startswith("bubble_"):
                         rating_raw = int(c.replace("bubble_", "")) / 10  # e.g., bubble_40 -> 4.0 stars
 
             # Title
@@ -59,11 +68,18 @@ def extract_reviews_from_page(soup) -> List[Dict[str, Any]]:
             comment_tag = block.select_one("p.partial_entry")
             comment = comment_tag.text.strip() if comment_tag else None
 
+            # Date ("ratingDate" carries the full date in its title)
+            date_tag = block.select_one("span.ratingDate")
+            review_date = (date_tag.get("title") or date_tag.text.strip()) if date_tag else None
+
             reviews.append({
                 "source": "tripadvisor",
-                "rating": rating_raw,
+                "review_id": block.get("data-reviewid"),
+                "rating_raw": rating_raw,
+                "rating_0_5": rating_raw,
                 "review_title": title,
-                "review_comment": comment
+                "review_comment": comment,
+                "date": review_date,
             })
 
         except Exception as e:
@@ -73,52 +89,44 @@ def extract_reviews_from_page(soup) -> List[Dict[str, Any]]:
     return reviews
 
 
-def get_next_page(soup):
+def get_next_page(soup, url: str = BASE_URL) -> Optional[str]:
     """Find next page URL."""
     next_btn = soup.select_one("a.next")
     if next_btn and next_btn.get("href"):
-        return "https://www.tripadvisor.com" + next_btn["href"]
+        return urljoin(url, next_btn["href"])
     return None
 
 
-def scrape_tripadvisor(hotel_key: str, url: str, max_pages: int = 5) -> str:
-    print("\n========================================")
-    print(f"Scraping TripAdvisor for: {hotel_key}")
-    print("========================================\n")
+def parse_tripadvisor_page(html: str, url: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    soup = BeautifulSoup(html, "html.parser")
+    return extract_reviews_from_page(soup), get_next_page(soup, url)
 
-    all_reviews = []
-    current_url = url
 
-    for page in range(max_pages):
-        print(f"[Page {page+1}] {current_url}")
+@register
+class TripAdvisorSource(ReviewSource):
+    name = "tripadvisor"
+    hotel_urls = HOTEL_URLS
+    headers = HEADERS
 
-        try:
-            r = requests.get(current_url, headers=HEADERS, timeout=20)
-            soup = BeautifulSoup(r.text, "html.parser")
-        except Exception as e:
-            print(f"[Error] Failed to load page: {e}")
-            break
+    def out_file(self, out_dir, hotel_key):
+        return os.path.join(out_dir, f"{hotel_key}_tripadvisor.csv")
 
-        reviews = extract_reviews_from_page(soup)
-        all_reviews.extend(reviews)
+    def parse(self, text, url, hotel_key):
+        return parse_tripadvisor_page(text, url)
 
-        # Find next page
-        next_url = get_next_page(soup)
-        if not next_url:
-            print("[Info] No more pages.")
-            break
 
-        current_url = next_url
-        time.sleep(2)
+def scrape_tripadvisor(hotel_key: str, url: str, max_pages: int = 5) -> str:
+    print("\n========================================")
+    print(f"Scraping TripAdvisor for: {hotel_key}")
+    print("========================================\n")
 
-    # Save to CSV
-    out_file = f"{OUT_DIR}/{hotel_key}_tripadvisor.csv"
+    stats = ScrapePipeline(max_pages=max_pages).run([(TripAdvisorSource(), hotel_key, url)])
+    for e in stats["errors"]:
+        print(f"[Error] {e}")
 
-    if all_reviews:
-        df = pd.DataFrame(all_reviews)
-        df["hotel_name"] = hotel_key
-        df.to_csv(out_file, index=False, encoding="utf-8", quoting=csv.QUOTE_ALL)
-        print(f"[Success] Saved → {out_file} ({len(df)} reviews)\n")
+    out_file = TripAdvisorSource().out_file(OUT_DIR, hotel_key)
+    if stats["rows"]:
+        print(f"[Success] Saved → {out_file} ({stats['rows']} reviews)\n")
     else:
         print(f"[Stop] No reviews collected for {hotel_key}")
 
@@ -126,6 +134,4 @@ def scrape_tripadvisor(hotel_key: str, url: str, max_pages: int = 5) -> str:
 
 
 if __name__ == "__main__":
-    for key, url in HOTEL_URLS.items():
-        scrape_tripadvisor(hotel_key=key, url=url, max_pages=5)
-
+    ScrapePipeline(max_pages=5).run([(TripAdvisorSource(), key, url) for key, url in HOTEL_URLS.items()])
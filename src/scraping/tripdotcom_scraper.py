@@ -0,0 +1,85 @@
+# tripdotcom_scraper.py
+import os
+import sys
+import re
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+# Allow `python src/scraping/tripdotcom_scraper.py` from the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.scraping.pipeline import ReviewSource, ScrapePipeline, register
+
+# ------------------------------
+# CONFIG
+# ------------------------------
+OUT_DIR = "datasets/raw/tripdotcom"
+
+# Trip.com review pages per hotel (hotel_key -> first page); none of the
+# Haile properties has been mapped to a Trip.com hotel id yet
+HOTEL_URLS = {}
+
+SCORE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:/\s*(\d+))?")
+
+
+# ------------------------------
+# HELPERS
+# ------------------------------
+def normalize_rating(rating_raw):
+    """Convert a Trip.com score such as "9.2/10" or "4.5/5" to the 0–5 scale."""
+    match = SCORE_RE.search(rating_raw or "")
+    if not match:
+        return None
+    value, scale = float(match.group(1)), float(match.group(2) or 10)
+    return round(value / scale * 5, 1)
+
+
+def parse_tripdotcom_page(html, url):
+    """Return (rows, next_url) for one Trip.com review page."""
+    soup = BeautifulSoup(html, "html.parser")
+
+    reviews = []
+    for b in soup.select("div.review-item") or soup.select("[data-review-id]"):
+        try:
+            rating_tag = b.select_one(".review-score") or b.select_one(".score")
+            rating_raw = rating_tag.get_text(strip=True) if rating_tag else None
+
+            title_tag = b.select_one(".review-title")
+            comment_tag = b.select_one(".review-content") or b.select_one(".review-text")
+            date_tag = b.select_one(".review-date")
+
+            reviews.append({
+                "review_id": b.get("data-review-id"),
+                "rating_raw": rating_raw,
+                "rating_0_5": normalize_rating(rating_raw),
+                "review_title": title_tag.get_text(strip=True) if title_tag else "",
+                "review_comment": comment_tag.get_text(" ", strip=True) if comment_tag else "",
+                "date": (date_tag.get("datetime") or date_tag.get_text(strip=True)) if date_tag else None,
+            })
+        except Exception:
+            continue
+
+    next_tag = soup.select_one("a.next-page") or soup.select_one("a[rel=next]")
+    next_url = urljoin(url, next_tag["href"]) if reviews and next_tag and next_tag.get("href") else None
+    return reviews, next_url
+
+
+@register
+class TripDotComSource(ReviewSource):
+    name = "tripdotcom"
+    hotel_urls = HOTEL_URLS
+
+    def parse(self, text, url, hotel_key):
+        return parse_tripdotcom_page(text, url)
+
+
+# ------------------------------
+# RUN
+# ------------------------------
+if __name__ == "__main__":
+    print("--- Starting Trip.com Scraper ---")
+    ScrapePipeline(max_pages=5).run([(TripDotComSource(), key, url) for key, url in HOTEL_URLS.items()])
+    print("--- Finished ---")
@@ -0,0 +1,147 @@
+# src/search/index_files.py
+"""On-disk layout shared by the search indexes.
+
+An index directory holds append-only segment files, whole-index arrays and
+a manifest naming them. Every save writes its new files under fresh names
+and then replaces the manifest in one step, so a reader (or a crash) sees
+either the previous index or the new one, never a mix. Files no longer
+named by the manifest are removed afterwards.
+
+Callers see doc ids as row positions in the indexed frame. Internally an
+index numbers documents in the order they were added and keeps a key per
+document (`row_keys`) plus the frame row of each one (`rows`, None when
+they coincide). `update` matches a frame's rows to the saved documents by
+key, so rows inserted anywhere in the frame are added as a new segment and
+rows that moved keep their vectors and postings. Documents whose rows are
+gone are dropped by rewriting the index as one segment in frame order,
+which also happens once there are more than MAX_SEGMENTS segments.
+"""
+import os
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+MANIFEST = "manifest.json"
+MAX_SEGMENTS = 8
+
+
+def row_keys(texts):
+    """One uint64 key per text (vectorized): its hash, salted with how many equal texts came before.
+
+    Only the text decides what a document contributes to an index, and the
+    salt keeps the keys of repeated texts unique.
+    """
+    hashes = pd.util.hash_pandas_object(pd.Series(texts, dtype=object), index=False).to_numpy()
+    seen = pd.Series(hashes).groupby(hashes).cumcount().to_numpy()
+    return pd.util.hash_pandas_object(pd.DataFrame({"hash": hashes, "seen": seen}), index=False).to_numpy()
+
+
+def update(index, texts):
+    """Bring a loaded `index` in line with a frame of `texts`; returns True if it changed.
+
+    `index` provides `keys`, `rows`, `segments`, `n_docs`, `add_texts(texts, keys)`
+    and `keep(docs)`, which keeps only `docs` (internal ids), renumbered in
+    the given order, as one segment.
+    """
+    keys = row_keys(texts)
+    # Keys are unique unless texts were added outside of `update`; later copies are then dropped
+    first = np.flatnonzero(~pd.Index(index.keys).duplicated())
+    docs = pd.Index(index.keys[first]).get_indexer(keys)  # doc of each row, -1 if not indexed
+    docs = np.where(docs >= 0, first[docs], -1)
+    known = docs >= 0
+    changed = False
+    if known.sum() < index.n_docs or len(index.segments) > MAX_SEGMENTS:
+        index.keep(docs[known])
+        docs[known] = np.arange(int(known.sum()))
+        changed = True
+    new = np.flatnonzero(~known)
+    if new.size:
+        docs[new] = np.arange(index.n_docs, index.n_docs + new.size)
+        index.add_texts([texts[i] for i in new], keys=keys[new])
+        changed = True
+    rows = np.empty(docs.size, dtype=np.int64)
+    rows[docs] = np.arange(docs.size)
+    rows = identity_or(rows)
+    if not same_rows(rows, index.rows):
+        index.rows = rows
+        changed = True
+    return changed
+
+
+def identity_or(rows):
+    """None if `rows` maps every doc to the row of the same number, else `rows`."""
+    return None if rows is None or np.array_equal(rows, np.arange(rows.size)) else rows
+
+
+def same_rows(a, b):
+    return (a is None and b is None) or (a is not None and b is not None and np.array_equal(a, b))
+
+
+def append_rows(rows, count):
+    """`rows` after `count` documents were added for rows appended to the frame."""
+    return None if rows is None else np.concatenate([rows, np.arange(rows.size, rows.size + count)])
+
+
+def commit(index_dir, segments, save_segment, arrays, manifest, prefix):
+    """Write unsaved segments and `arrays`, then switch the manifest to them.
+
+    `save_segment(path, segment)` writes one segment; segments already on
+    disk keep their file. Returns the manifest written.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    generation = time.time_ns()
+    names = []
+    for i, seg in enumerate(segments):
+        name = getattr(seg, "_file", None)
+        if name is None or not os.path.exists(os.path.join(index_dir, name)):
+            name = f"{prefix}_{generation}_{i:05d}.npz"
+            save_segment(os.path.join(index_dir, name), seg)
+            seg._file = name
+        names.append(name)
+    files = {}
+    for key, values in arrays.items():
+        files[key] = f"{key}_{generation}.npy"
+        np.save(os.path.join(index_dir, files[key]), values)
+
+    manifest = {**manifest, "segments": names, "arrays": files}
+    tmp = os.path.join(index_dir, f"{MANIFEST}.tmp-{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, os.path.join(index_dir, MANIFEST))
+
+    # Files of earlier saves (and of an older layout) are no longer named
+    keep = set(names) | set(files.values())
+    for fname in os.listdir(index_dir):
+        if fname.endswith((".npz", ".npy")) and fname not in keep:
+            os.remove(os.path.join(index_dir, fname))
+    return manifest
+
+
+def open_index(index_dir, load_segment):
+    """(manifest, segments, arrays) of a saved index; None if there is none in `index_dir`.
+
+    An index written before the manifest listed its arrays counts as none,
+    so it gets rebuilt.
+    """
+    for attempt in range(2):
+        try:
+            with open(os.path.join(index_dir, MANIFEST), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        if "arrays" not in manifest:
+            return None
+        try:
+            segments = []
+            for name in manifest["segments"]:
+                seg = load_segment(os.path.join(index_dir, name))
+                seg._file = name
+                segments.append(seg)
+            arrays = {key: np.load(os.path.join(index_dir, name)) for key, name in manifest["arrays"].items()}
+            return manifest, segments, arrays
+        except FileNotFoundError:
+            if attempt:
+                raise
+            # Another process saved (and pruned) between reading the manifest and the files
@@ -0,0 +1,347 @@
+# src/search/inverted_index.py
+"""Full-text search over reviews: inverted index with compressed postings and BM25.
+
+Postings are stored per segment as delta-encoded doc ids and term
+frequencies, packed with variable-byte encoding into one uint8 blob each.
+New reviews are added as a new segment (nothing already on disk is
+rewritten); `compact()` folds all segments back into one. Files are
+written through src/search/index_files.py, which also matches the rows of
+a changed frame to the saved documents, so `load_or_build` only indexes
+rows it has not seen, wherever they are in the frame.
+
+    index = ReviewIndex.build(df)
+    index.save("datasets/index/reviews")
+    doc_ids, scores = index.search("shower hawassa", limit=50)
+"""
+import re
+from collections import OrderedDict
+import numpy as np
+
+from src.search.index_files import append_rows, commit, identity_or, open_index, row_keys, update
+
+INDEX_DIR = "datasets/index/reviews"
+TEXT_COLUMNS = ["clean_full_text", "review_comment"]
+TOKEN_PATTERN = r"(?u)[^\W\d_]{2,}"
+TOKEN_RE = re.compile(TOKEN_PATTERN)
+
+DECODE_CACHE_SIZE = 64
+
+# BM25 parameters (standard defaults)
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(str(text).lower())
+
+
+def review_texts(df, columns=TEXT_COLUMNS):
+    """Concatenate the searchable text columns of each review."""
+    cols = [c for c in columns if c in df.columns]
+    if not cols:
+        raise KeyError(f"None of the text columns {columns} found in the frame.")
+    text = df[cols[0]].fillna("").astype(str)
+    for c in cols[1:]:
+        text = text + " " + df[c].fillna("").astype(str)
+    return text.tolist()
+
+
+# ------------------------------
+# VARIABLE-BYTE CODEC (vectorized)
+# 7 data bits per byte, little-endian groups; high bit set on every byte
+# except the last byte of a value.
+# ------------------------------
+def vbyte_sizes(values):
+    """Encoded length in bytes of each value."""
+    values = np.asarray(values, dtype=np.uint64)
+    nbytes = np.ones(values.size, dtype=np.int64)
+    for k in range(1, 10):
+        nbytes += values >= (np.uint64(1) << np.uint64(7 * k))
+    return nbytes
+
+
+def vbyte_encode(values):
+    values = np.asarray(values, dtype=np.uint64)
+    if values.size == 0:
+        return np.zeros(0, dtype=np.uint8)
+    nbytes = vbyte_sizes(values)
+    starts = np.concatenate(([0], np.cumsum(nbytes)[:-1]))
+    out = np.zeros(int(nbytes.sum()), dtype=np.uint8)
+    for k in range(int(nbytes.max())):
+        has = nbytes > k
+        chunk = (values[has] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        cont = (nbytes[has] - 1 > k).astype(np.uint64) << np.uint64(7)
+        out[starts[has] + k] = (chunk | cont).astype(np.uint8)
+    return out
+
+
+def vbyte_decode(buf):
+    buf = np.asarray(buf, dtype=np.uint8)
+    if buf.size == 0:
+        return np.zeros(0, dtype=np.uint64)
+    last = (buf & 0x80) == 0
+    ends = np.flatnonzero(last)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    group = np.repeat(np.arange(ends.size), ends - starts + 1)
+    shift = (np.arange(buf.size) - starts[group]).astype(np.uint64) * np.uint64(7)
+    parts = (buf & 0x7F).astype(np.uint64) << shift
+    return np.add.reduceat(parts, starts)
+
+
+# ------------------------------
+# SEGMENT
+# ------------------------------
+class Segment:
+    """Immutable block of postings for a contiguous range of doc ids."""
+
+    def __init__(self, terms, doc_blob, doc_offsets, tf_blob, tf_offsets, df_counts):
+        self.terms = terms
+        self.term_ids = {t: i for i, t in enumerate(terms)}
+        self.doc_blob = doc_blob
+        self.doc_offsets = doc_offsets
+        self.tf_blob = tf_blob
+        self.tf_offsets = tf_offsets
+        self.df_counts = df_counts
+        self._decoded = OrderedDict()
+
+    @classmethod
+    def from_counts(cls, counts, terms, first_doc):
+        """Build from a (docs x terms) sparse count matrix."""
+        csc = counts.tocsc()
+        csc.sort_indices()
+        term_ids = np.repeat(np.arange(len(terms)), np.diff(csc.indptr))
+        docs = first_doc + csc.indices.astype(np.int64)
+        return _segment_from_postings(terms, term_ids, docs, csc.data.astype(np.int64))
+
+    def postings(self, term):
+        i = self.term_ids.get(term)
+        if i is None:
+            return None, None
+        # Search-as-you-type repeats the same terms, keep recent decodes around
+        if term in self._decoded:
+            self._decoded.move_to_end(term)
+            return self._decoded[term]
+        docs = np.cumsum(vbyte_decode(self.doc_blob[self.doc_offsets[i]:self.doc_offsets[i + 1]]))
+        tf = vbyte_decode(self.tf_blob[self.tf_offsets[i]:self.tf_offsets[i + 1]])
+        result = docs.astype(np.int64), tf.astype(np.float64)
+        self._decoded[term] = result
+        if len(self._decoded) > DECODE_CACHE_SIZE:
+            self._decoded.popitem(last=False)
+        return result
+
+    def doc_freq(self, term):
+        i = self.term_ids.get(term)
+        return 0 if i is None else int(self.df_counts[i])
+
+    def save(self, path):
+        np.savez(path, terms=np.array(self.terms, dtype=str), doc_blob=self.doc_blob,
+                 doc_offsets=self.doc_offsets, tf_blob=self.tf_blob,
+                 tf_offsets=self.tf_offsets, df_counts=self.df_counts)
+
+    @classmethod
+    def load(cls, path):
+        z = np.load(path, allow_pickle=False)
+        return cls(z["terms"].tolist(), z["doc_blob"], z["doc_offsets"],
+                   z["tf_blob"], z["tf_offsets"], z["df_counts"])
+
+
+def _pack(values, bounds):
+    """vbyte-encode `values` and return the blob plus per-term byte offsets."""
+    blob = vbyte_encode(values)
+    byte_ends = np.concatenate(([0], np.cumsum(vbyte_sizes(values))))
+    return blob, byte_ends[bounds]
+
+
+# ------------------------------
+# INDEX
+# ------------------------------
+class ReviewIndex:
+    """Segmented BM25 index. Results and candidate masks are over row positions of the indexed frame."""
+
+    def __init__(self, segments=None, doc_lengths=None, keys=None, rows=None):
+        self.segments = segments or []
+        self.doc_lengths = doc_lengths if doc_lengths is not None else np.zeros(0, dtype=np.int32)
+        self.keys = keys if keys is not None else np.zeros(0, dtype=np.uint64)  # row_keys of the indexed texts
+        self.rows = identity_or(rows)  # frame row of each doc id; None when they are the same
+
+    @property
+    def n_docs(self):
+        return int(self.doc_lengths.size)
+
+    @classmethod
+    def build(cls, df, columns=TEXT_COLUMNS):
+        index = cls()
+        index.add_texts(review_texts(df, columns))
+        return index
+
+    def add_texts(self, texts, keys=None):
+        """Index new documents; they get the next doc ids in order.
+
+        `keys` are their row_keys within the whole frame (those of `texts` alone by default).
+        """
+        texts = list(texts)
+        if not texts:
+            return self
+        # Only indexing needs scikit-learn; loading a saved index does not
+        from scipy import sparse
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        self.keys = np.concatenate([self.keys, row_keys(texts) if keys is None else keys])
+        self.rows = append_rows(self.rows, len(texts))
+        vec = CountVectorizer(token_pattern=TOKEN_PATTERN, dtype=np.int32)
+        try:
+            counts = vec.fit_transform(texts)
+            terms = vec.get_feature_names_out().tolist()
+        except ValueError:  # nothing but empty documents
+            counts = sparse.csr_matrix((len(texts), 0), dtype=np.int32)
+            terms = []
+        self.segments.append(Segment.from_counts(counts, terms, first_doc=self.n_docs))
+        lengths = np.asarray(counts.sum(axis=1), dtype=np.int32).ravel()
+        self.doc_lengths = np.concatenate([self.doc_lengths, lengths])
+        return self
+
+    def add_reviews(self, df, columns=TEXT_COLUMNS):
+        return self.add_texts(review_texts(df, columns))
+
+    def compact(self):
+        """Merge all segments into one, doc ids in row order (re-encodes postings, no re-tokenizing)."""
+        if len(self.segments) <= 1 and self.rows is None:
+            return self
+        return self.keep(np.arange(self.n_docs) if self.rows is None else np.argsort(self.rows))
+
+    def keep(self, docs):
+        """Keep only the doc ids `docs`, renumbered in that order, as one segment."""
+        docs = np.asarray(docs, dtype=np.int64)
+        new_ids = np.full(self.n_docs, -1, dtype=np.int64)
+        new_ids[docs] = np.arange(docs.size)
+        term_ids, doc_parts, tfs = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)], \
+            [np.zeros(0, dtype=np.int64)]
+        vocab = {}
+        for seg in self.segments:
+            for t in seg.terms:
+                d, f = seg.postings(t)
+                d = new_ids[d]
+                live = d >= 0
+                if live.any():
+                    term_ids.append(np.full(int(live.sum()), vocab.setdefault(t, len(vocab))))
+                    doc_parts.append(d[live])
+                    tfs.append(f[live].astype(np.int64))
+        self.segments = [_segment_from_postings(list(vocab), np.concatenate(term_ids),
+                                                np.concatenate(doc_parts), np.concatenate(tfs))]
+        self.doc_lengths = self.doc_lengths[docs]
+        self.keys = self.keys[docs]
+        self.rows = None
+        return self
+
+    def search(self, query, limit=None, candidates=None):
+        """BM25-ranked doc ids for `query` (OR semantics over its terms).
+
+        `candidates` is an optional boolean mask over rows (e.g. the
+        dashboard's sidebar filters); only those rows are returned.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or self.n_docs == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        if candidates is not None and self.rows is not None:
+            candidates = candidates[self.rows]
+
+        n = self.n_docs
+        avgdl = max(float(self.doc_lengths.mean()), 1.0)
+        doc_parts, score_parts = [], []
+        for term in terms:
+            df_t = sum(seg.doc_freq(term) for seg in self.segments)
+            if df_t == 0:
+                continue
+            idf = np.log1p((n - df_t + 0.5) / (df_t + 0.5))
+            for seg in self.segments:
+                docs, tf = seg.postings(term)
+                if docs is None:
+                    continue
+                if candidates is not None:
+                    keep = candidates[docs]
+                    docs, tf = docs[keep], tf[keep]
+                dl = self.doc_lengths[docs]
+                score = idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * dl / avgdl))
+                doc_parts.append(docs)
+                score_parts.append(score)
+
+        if not doc_parts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        docs = np.concatenate(doc_parts)
+        scores = np.concatenate(score_parts)
+        if docs.size > n // 16:
+            # Dense accumulator is cheaper than sorting long posting lists
+            acc = np.bincount(docs, weights=scores, minlength=n)
+            uniq = np.flatnonzero(acc)
+            totals = acc[uniq]
+        else:
+            uniq, inv = np.unique(docs, return_inverse=True)
+            totals = np.bincount(inv, weights=scores)
+        if self.rows is not None:
+            uniq = self.rows[uniq]
+
+        if limit is not None and limit < uniq.size:
+            top = np.argpartition(-totals, limit)[:limit]
+            uniq, totals = uniq[top], totals[top]
+        order = np.lexsort((uniq, -totals))
+        return uniq[order], totals[order]
+
+    # ------------------------------
+    # PERSISTENCE
+    # ------------------------------
+    def save(self, index_dir=INDEX_DIR):
+        """Write segments not on disk yet and the per-doc arrays, then switch the manifest."""
+        arrays = {"doc_lengths": self.doc_lengths, "keys": self.keys}
+        if self.rows is not None:
+            arrays["rows"] = self.rows
+        commit(index_dir, self.segments, lambda path, seg: seg.save(path), arrays,
+               {"n_docs": self.n_docs}, prefix="segment")
+        return index_dir
+
+    @classmethod
+    def load(cls, index_dir=INDEX_DIR):
+        """The saved index, or None if `index_dir` has none."""
+        saved = open_index(index_dir, Segment.load)
+        if saved is None:
+            return None
+        _, segments, arrays = saved
+        return cls(segments, arrays["doc_lengths"], arrays["keys"], arrays.get("rows"))
+
+
+def _segment_from_postings(terms, term_ids, docs, tfs):
+    """Build a segment from parallel (term id, doc id, tf) arrays.
+
+    Terms are re-numbered alphabetically so segment files are stable.
+    """
+    terms = np.array(terms, dtype=object)
+    order = np.argsort(terms)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    pair_terms = rank[term_ids]
+    resort = np.lexsort((docs, pair_terms))
+    pair_terms, docs, tfs = pair_terms[resort], docs[resort], tfs[resort]
+    df_counts = np.bincount(pair_terms, minlength=terms.size)
+    bounds = np.concatenate(([0], np.cumsum(df_counts)))
+    deltas = docs.copy()
+    deltas[1:] -= docs[:-1]
+    deltas[bounds[:-1]] = docs[bounds[:-1]]
+    doc_blob, doc_offsets = _pack(deltas, bounds)
+    tf_blob, tf_offsets = _pack(tfs, bounds)
+    return Segment(terms[order].tolist(), doc_blob, doc_offsets, tf_blob, tf_offsets, df_counts)
+
+
+def load_or_build(df, index_dir=INDEX_DIR):
+    """Load the on-disk index and bring it in line with `df` (see src/search/index_files.py).
+
+    Only rows the index has not seen are tokenized, wherever they are in
+    the frame; an edited row counts as a removed row plus a new one.
+    """
+    texts = review_texts(df)
+    index = ReviewIndex.load(index_dir)
+    if index is None:
+        index = ReviewIndex().add_texts(texts)
+        index.save(index_dir)
+    elif update(index, texts):
+        index.save(index_dir)
+    return index
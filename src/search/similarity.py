@@ -0,0 +1,304 @@
+# src/search/similarity.py
+"""Similar-review lookup: cosine top-k over the sentiment model's TF-IDF vectors.
+
+The saved TfidfVectorizer (models/sentiment) produces L2-normalised rows,
+so cosine similarity is a sparse dot product. The N nearest neighbours of
+every review are precomputed with a blocked product: row blocks of the
+matrix are multiplied with its transpose on a thread pool, and each dense
+block is cut down to its top k with argpartition, so no more than one
+block x n score matrix per thread is ever alive. Queries with free text, a
+larger n or a candidate mask are computed on demand.
+
+New reviews are appended incrementally: their neighbours are found among
+all reviews, and a product of the old reviews with only the new ones
+offers them as candidates to the old neighbour lists, so the cost of an
+update grows with n x batch, not n x n. Vectors are stored as append-only
+segments with the inverted index's file layout (src/search/index_files.py),
+which matches a changed frame's rows to the saved reviews, so rows inserted
+anywhere in the frame are added this way too. When reviews are removed,
+only the reviews that listed one of them as a neighbour are recomputed.
+
+    index = SimilarityIndex.build(texts, tfidf)
+    index.save("datasets/index/similarity")
+    doc_ids, scores = index.similar(42, n=10)
+    doc_ids, scores = index.query("cold shower, no hot water", n=10)
+"""
+import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy import sparse
+
+from src.search.index_files import append_rows, commit, identity_or, open_index, row_keys, update
+
+INDEX_DIR = "datasets/index/similarity"
+MODEL_DIR = "models/sentiment"
+TEXT_COLUMN = "clean_full_text"
+TOP_K = 20                 # neighbours precomputed per review
+BLOCK_CELLS = 2**23        # dense scores per block (x4 bytes): rows per block = BLOCK_CELLS // n
+WORKERS = min(4, os.cpu_count() or 1)
+
+
+def review_texts(df, column=TEXT_COLUMN):
+    return df[column].fillna("").astype(str).tolist()
+
+
+def _model_key(tfidf):
+    """Identifies the vectorizer: vectors from another vocabulary are not comparable."""
+    vocabulary = "\n".join(tfidf.get_feature_names_out())
+    return hashlib.blake2b(vocabulary.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _top_k(scores, k, self_offset=None):
+    """Top-k columns of each row of a dense block, best first; -1 / -inf padding.
+
+    With `self_offset`, row r is the same review as column r + self_offset,
+    which is never its own neighbour.
+    """
+    n_rows, n_cols = scores.shape
+    if self_offset is not None:
+        rows = np.arange(n_rows)
+        cols = rows + self_offset
+        inside = (cols >= 0) & (cols < n_cols)
+        scores[rows[inside], cols[inside]] = -np.inf
+    k_eff = min(k, n_cols)
+    ids = np.full((n_rows, k), -1, dtype=np.int32)
+    vals = np.full((n_rows, k), -np.inf, dtype=np.float32)
+    if k_eff == 0:
+        return ids, vals
+    part = np.argpartition(-scores, k_eff - 1, axis=1)[:, :k_eff] if k_eff < n_cols else \
+        np.tile(np.arange(n_cols), (n_rows, 1))
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    ids[:, :k_eff] = np.take_along_axis(part, order, axis=1)
+    vals[:, :k_eff] = np.take_along_axis(part_scores, order, axis=1)
+    # Zero similarity is no similarity (nothing in common), and self is excluded
+    empty = vals <= 0
+    ids[empty], vals[empty] = -1, -np.inf
+    return ids, vals
+
+
+def blocked_top_k(A, B, k, self_offset=None, workers=WORKERS):
+    """Top-k of each row of A @ B.T, computed in row blocks on a thread pool.
+
+    `self_offset`: when A's rows are also rows of B, the row of B that
+    A[0] is (A[i] is B[i + self_offset]); those pairs are skipped.
+    """
+    A, BT = A.tocsr(), B.T.tocsc()
+    n_a, n_b = A.shape[0], B.shape[0]
+    block = max(1, min(n_a, BLOCK_CELLS // max(n_b, 1)))
+    starts = list(range(0, n_a, block))
+
+    def run(start):
+        stop = min(start + block, n_a)
+        scores = (A[start:stop] @ BT).toarray().astype(np.float32, copy=False)
+        return _top_k(scores, k, None if self_offset is None else start + self_offset)
+
+    ids = np.full((n_a, k), -1, dtype=np.int32)
+    vals = np.full((n_a, k), -np.inf, dtype=np.float32)
+    with ThreadPoolExecutor(workers) as pool:
+        for start, (i, v) in zip(starts, pool.map(run, starts)):
+            ids[start:start + len(i)] = i
+            vals[start:start + len(i)] = v
+    return ids, vals
+
+
+def _merge_top_k(ids_a, vals_a, ids_b, vals_b, k):
+    """Per-row top-k of two candidate lists (ids are disjoint)."""
+    ids = np.concatenate([ids_a, ids_b], axis=1)
+    vals = np.concatenate([vals_a, vals_b], axis=1)
+    order = np.argsort(-vals, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(ids, order, axis=1), np.take_along_axis(vals, order, axis=1)
+
+
+class SimilarityIndex:
+    """Precomputed cosine neighbours. Results and candidate masks are over row positions of the indexed frame."""
+
+    def __init__(self, tfidf, segments=None, neighbors=None, scores=None, k=TOP_K,
+                 keys=None, model_key=None, rows=None):
+        self.tfidf = tfidf
+        self.segments = segments or []  # append-only blocks of L2-normalised TF-IDF rows
+        self.k = k
+        self.neighbors = neighbors if neighbors is not None else np.zeros((0, k), dtype=np.int32)
+        self.scores = scores if scores is not None else np.zeros((0, k), dtype=np.float32)
+        self.keys = keys if keys is not None else np.zeros(0, dtype=np.uint64)  # row_keys of the indexed texts
+        self.model_key = model_key or _model_key(tfidf)
+        self.rows = identity_or(rows)  # frame row of each doc id; None when they are the same
+        self._matrix = None
+
+    @property
+    def n_docs(self):
+        return int(self.neighbors.shape[0])
+
+    @property
+    def matrix(self):
+        """All vectors as one CSR matrix (stacked on first use after a change)."""
+        if self._matrix is None:
+            self._matrix = sparse.vstack(self.segments, format="csr") if self.segments else \
+                sparse.csr_matrix((0, len(self.tfidf.vocabulary_)), dtype=np.float32)
+        return self._matrix
+
+    @classmethod
+    def build(cls, texts, tfidf, k=TOP_K, workers=WORKERS):
+        return cls(tfidf, k=k).add_texts(texts, workers=workers)
+
+    def add_texts(self, texts, workers=WORKERS, keys=None):
+        """Vectorise new reviews (next doc ids) and update every neighbour list.
+
+        `keys` are their row_keys within the whole frame (those of `texts` alone by default).
+        """
+        texts = list(texts)
+        if not texts:
+            return self
+        self.keys = np.concatenate([self.keys, row_keys(texts) if keys is None else keys])
+        self.rows = append_rows(self.rows, len(texts))
+        new = self.tfidf.transform(texts).astype(np.float32).tocsr()
+        first = self.n_docs
+        self.segments.append(new)
+        self._matrix = None
+        full = self.matrix
+
+        # New reviews against everything, new ones included
+        ids, vals = blocked_top_k(new, full, self.k, self_offset=first, workers=workers)
+        if first:
+            # Old reviews gain the new ones as candidates
+            old_ids, old_vals = blocked_top_k(full[:first], new, self.k, workers=workers)
+            old_ids = np.where(old_ids >= 0, old_ids + first, -1)
+            self.neighbors[:], self.scores[:] = _merge_top_k(
+                self.neighbors, self.scores, old_ids, old_vals, self.k)
+        self.neighbors = np.vstack([self.neighbors, ids])
+        self.scores = np.vstack([self.scores, vals])
+        return self
+
+    def add_reviews(self, df, column=TEXT_COLUMN, workers=WORKERS):
+        return self.add_texts(review_texts(df, column), workers=workers)
+
+    def compact(self):
+        """Stack the vectors into one segment, doc ids in row order."""
+        if len(self.segments) <= 1 and self.rows is None:
+            return self
+        return self.keep(np.arange(self.n_docs) if self.rows is None else np.argsort(self.rows))
+
+    def keep(self, docs, workers=WORKERS):
+        """Keep only the doc ids `docs`, renumbered in that order, as one segment.
+
+        Reviews that lose a neighbour get their list recomputed; the others
+        only lose candidates, so their lists stay the same.
+        """
+        docs = np.asarray(docs, dtype=np.int64)
+        new_ids = np.full(self.n_docs, -1, dtype=np.int32)
+        new_ids[docs] = np.arange(docs.size)
+        old = self.neighbors[docs]
+        neighbors = np.where(old >= 0, new_ids[old], -1)
+        self._matrix = self.matrix[docs]
+        self.segments = [self._matrix]
+        self.neighbors, self.scores = neighbors, self.scores[docs]
+        self.keys = self.keys[docs]
+        self.rows = None
+        lost = np.flatnonzero(((old >= 0) & (neighbors < 0)).any(axis=1))
+        if lost.size:
+            self.neighbors[lost], self.scores[lost] = self._neighbors_of(lost, workers)
+        return self
+
+    def _neighbors_of(self, docs, workers=WORKERS):
+        """Top-k neighbours of `docs` among all reviews, computed from scratch."""
+        ids, vals = blocked_top_k(self.matrix[docs], self.matrix, self.k + 1, workers=workers)
+        # Drop the review itself, or the extra candidate when it was not listed
+        order = np.argsort(ids == docs[:, None], axis=1, kind="stable")[:, :self.k]
+        return np.take_along_axis(ids, order, axis=1), np.take_along_axis(vals, order, axis=1)
+
+    def similar(self, row, n=10, candidates=None):
+        """The n reviews most similar to the review in `row` (excluding itself)."""
+        doc = row if self.rows is None else int(np.flatnonzero(self.rows == row)[0])
+        if n <= self.k and candidates is None:
+            ids, vals = self.neighbors[doc], self.scores[doc]
+            keep = ids >= 0
+            ids = ids[keep][:n].astype(np.int64)
+            return ids if self.rows is None else self.rows[ids], vals[keep][:n].astype(np.float64)
+        return self._rank(self.matrix[doc], n, candidates, exclude=row)
+
+    def query(self, text, n=10, candidates=None):
+        """The n reviews most similar to a free text."""
+        return self._rank(self.tfidf.transform([text]).astype(np.float32), n, candidates)
+
+    def _rank(self, vector, n, candidates=None, exclude=None):
+        """Top `n` rows by similarity to `vector`; `exclude` and `candidates` are over rows."""
+        scores = np.asarray((self.matrix @ vector.T).todense()).ravel()
+        if self.rows is not None:
+            by_row = np.empty_like(scores)
+            by_row[self.rows] = scores
+            scores = by_row
+        if exclude is not None:
+            scores[exclude] = 0
+        if candidates is not None:
+            scores[~candidates] = 0
+        hits = np.flatnonzero(scores > 0)
+        if n < hits.size:
+            hits = hits[np.argpartition(-scores[hits], n - 1)[:n]]
+        hits = hits[np.lexsort((hits, -scores[hits]))]
+        return hits.astype(np.int64), scores[hits].astype(np.float64)
+
+    # ------------------------------
+    # PERSISTENCE
+    # ------------------------------
+    def save(self, index_dir=INDEX_DIR):
+        """Write vector segments not on disk yet and the neighbour lists, then switch the manifest."""
+        arrays = {"neighbors": self.neighbors, "scores": self.scores, "keys": self.keys}
+        if self.rows is not None:
+            arrays["rows"] = self.rows
+        commit(index_dir, self.segments, sparse.save_npz, arrays,
+               {"n_docs": self.n_docs, "k": self.k, "model_key": self.model_key}, prefix="vectors")
+        return index_dir
+
+    @classmethod
+    def load(cls, tfidf, index_dir=INDEX_DIR):
+        """The saved index, or None if `index_dir` has none."""
+        saved = open_index(index_dir, lambda path: sparse.load_npz(path).tocsr())
+        if saved is None:
+            return None
+        manifest, segments, arrays = saved
+        return cls(tfidf, segments, arrays["neighbors"], arrays["scores"], manifest["k"],
+                   arrays["keys"], manifest["model_key"], arrays.get("rows"))
+
+
+def load_tfidf(model_dir=MODEL_DIR):
+    import joblib
+    return joblib.load(os.path.join(model_dir, "tfidf.joblib"))
+
+
+def load_or_build(df, tfidf=None, index_dir=INDEX_DIR, column=TEXT_COLUMN):
+    """Load the on-disk index and bring it in line with `df` (see src/search/index_files.py).
+
+    Only rows the index has not seen are vectorised, wherever they are in
+    the frame. Rebuilds from scratch if the vectorizer was retrained.
+    """
+    tfidf = tfidf if tfidf is not None else load_tfidf()
+    texts = review_texts(df, column)
+    index = SimilarityIndex.load(tfidf, index_dir)
+    if index is None or index.model_key != _model_key(tfidf):
+        index = SimilarityIndex.build(texts, tfidf)
+        index.save(index_dir)
+    elif update(index, texts):
+        index.save(index_dir)
+    return index
+
+
+if __name__ == "__main__":
+    import argparse
+    from src.data.schema import read_reviews
+
+    parser = argparse.ArgumentParser(description="Build or update the similar-reviews index.")
+    parser.add_argument("input", help="reviews CSV (rows are indexed in order)")
+    parser.add_argument("--out", default=INDEX_DIR)
+    parser.add_argument("--query", help="print the reviews most similar to this text")
+    parser.add_argument("-n", type=int, default=5)
+    args = parser.parse_args()
+
+    df = read_reviews(args.input)
+    index = load_or_build(df, index_dir=args.out)
+    print("Similarity index covers", index.n_docs, "reviews. Saved to", args.out)
+    if args.query:
+        doc_ids, scores = index.query(args.query, n=args.n)
+        for d, s in zip(doc_ids, scores):
+            print(f"{s:.3f}  {df['hotel_name'].iloc[d]}: {str(df['review_comment'].iloc[d])[:100]}")
@@ -0,0 +1,8 @@
+# tests/conftest.py
+import os
+import sys
+
+# Allow `pytest` from the repo root without installing the package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,105 @@
+# tests/test_browser.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.dashboard.browser import VIEW_CACHE_SIZE, ReviewBrowser
+
+PAGE_SIZE = 4
+
+
+def _reviews(n=23):
+    rng = np.random.default_rng(0)
+    rating = rng.integers(0, 6, n).astype(float)
+    rating[[2, 7, 8, 15, 22]] = np.nan
+    dates = pd.date_range("2025-01-01", periods=n, freq="3D").strftime("%Y-%m-%d").tolist()
+    dates[5], dates[11] = None, "not a date"
+    return pd.DataFrame({
+        "hotel_name": rng.choice(["Haile Hawassa", "Haile Gondar", "Haile Adama"], n),
+        "review_comment": [f"review {i}" for i in range(n)],
+        "rating_0_5": rating,
+        "date": dates,
+    })
+
+
+def _all_pages(browser, mask, filter_key, sort_by, ascending):
+    pages, total = [], None
+    for page in range(100):
+        rows, total = browser.page(mask, filter_key, sort_by=sort_by, ascending=ascending,
+                                   page=page, page_size=PAGE_SIZE)
+        if rows.empty:
+            break
+        pages.append(rows)
+    return pages, total
+
+
+def _total_pages(n):
+    return -(-n // PAGE_SIZE)
+
+
+def _expected(df, sort_by, ascending):
+    """Sorted values of the column, nulls (and unparseable dates) last in both directions."""
+    col = {"Rating": "rating_0_5", "Date": "date", "Hotel": "hotel_name"}[sort_by]
+    values = pd.to_datetime(df[col], errors="coerce") if col == "date" else df[col]
+    present = values.dropna().sort_values(ascending=ascending).tolist()
+    return present + [None] * int(values.isna().sum())
+
+
+@pytest.mark.parametrize("sort_by", ["Rating", "Date", "Hotel"])
+@pytest.mark.parametrize("ascending", [True, False])
+@pytest.mark.parametrize("filtered", [False, True])
+def test_pages_cover_the_view_in_order(sort_by, ascending, filtered):
+    df = _reviews()
+    mask = (np.arange(len(df)) % 3 != 1) if filtered else None
+    view = df if mask is None else df[mask]
+    browser = ReviewBrowser(df)
+
+    pages, total = _all_pages(browser, mask, None, sort_by, ascending)
+    assert total == len(view)
+    assert [len(p) for p in pages[:-1]] == [PAGE_SIZE] * (len(pages) - 1)
+    # The last page holds the remainder
+    assert len(pages[-1]) == total - PAGE_SIZE * (len(pages) - 1)
+
+    rows = pd.concat(pages)
+    assert sorted(rows.index) == sorted(view.index)  # every row once
+    col = {"Rating": "rating_0_5", "Date": "date", "Hotel": "hotel_name"}[sort_by]
+    got = pd.to_datetime(rows[col], errors="coerce") if col == "date" else rows[col]
+    assert [None if pd.isna(v) else v for v in got] == _expected(view, sort_by, ascending)
+
+
+def test_pages_past_the_end_are_empty_and_negative_pages_start_at_zero():
+    df = _reviews()
+    browser = ReviewBrowser(df)
+    rows, total = browser.page(sort_by="Rating", page=_total_pages(len(df)), page_size=PAGE_SIZE)
+    assert rows.empty and total == len(df)
+    first, _ = browser.page(sort_by="Rating", page=0, page_size=PAGE_SIZE)
+    negative, _ = browser.page(sort_by="Rating", page=-3, page_size=PAGE_SIZE)
+    assert negative.index.tolist() == first.index.tolist()
+
+
+def test_cached_views_match_uncached_ones_per_filter():
+    df = _reviews()
+    browser = ReviewBrowser(df)
+    masks = {"gondar": (df["hotel_name"] == "Haile Gondar").to_numpy(),
+             "rated": df["rating_0_5"].notna().to_numpy()}
+    for ascending in (True, False):
+        for key, mask in masks.items():
+            for _ in range(2):  # second request is served from the cache
+                cached = pd.concat(_all_pages(browser, mask, key, "Rating", ascending)[0])
+                uncached = pd.concat(_all_pages(browser, mask, None, "Rating", ascending)[0])
+                assert cached.index.tolist() == uncached.index.tolist()
+    assert set(browser._views) == {(key, "Rating") for key in masks}
+
+
+def test_view_cache_is_bounded():
+    df = _reviews()
+    browser = ReviewBrowser(df)
+    for i in range(VIEW_CACHE_SIZE + 5):
+        browser.page(np.arange(len(df)) != i % len(df), ("drop", i), sort_by="Date")
+    assert len(browser._views) == VIEW_CACHE_SIZE
+    assert ("drop", 0) not in {key for key, _ in browser._views}
+
+
+def test_selected_columns_only():
+    rows, _ = ReviewBrowser(_reviews()).page(columns=["hotel_name", "missing", "rating_0_5"])
+    assert list(rows.columns) == ["hotel_name", "rating_0_5"]
@@ -0,0 +1,15 @@
+# tests/test_callbacks.py
+import numpy as np
+import pandas as pd
+
+from src.dashboard.callbacks import compute_kpis
+from src.data.shared_table import open_version, publish, select_rows
+
+
+def test_kpis_of_an_empty_selection(tmp_path):
+    df = pd.DataFrame({"hotel_name": ["h", "h"], "review_comment": ["a", "b"], "rating_0_5": [5.0, 1.0]})
+    shared = open_version(str(tmp_path / publish(df, str(tmp_path))))
+
+    assert compute_kpis(shared) == {"total": 2, "avg_rating": 3.0, "positive": 1, "negative": 1}
+    empty = select_rows(shared, np.zeros(len(shared), dtype=bool))
+    assert compute_kpis(empty) == {"total": 0, "avg_rating": None, "positive": 0, "negative": 0}
@@ -0,0 +1,59 @@
+# tests/test_clean_reviews.py
+from types import SimpleNamespace
+
+import pandas as pd
+
+from src.data import clean_reviews
+from src.data.clean_reviews import LemmaMemo, language_routes
+from src.preprocessing.language_id import detect_languages
+
+SHORT_ENGLISH = ["Good", "Nice stay", "Great!", "Clean room", "ok"]
+QUARANTINED = ["Das Zimmer war sehr sauber und das Personal war freundlich",
+               "La chambre était propre et le personnel très aimable"]
+
+
+def _routes(comments):
+    df = detect_languages(pd.DataFrame({"review_title": "", "review_comment": comments}))
+    return df, language_routes(df)
+
+
+def test_short_english_reviews_are_cleaned_not_quarantined():
+    df, (english, light, quarantine) = _routes(SHORT_ENGLISH)
+    assert english.all(), df[["review_comment", "lang"]]
+    assert not quarantine.any()
+
+
+def test_other_languages_are_quarantined():
+    df, (english, light, quarantine) = _routes(QUARANTINED)
+    assert (df["lang"] == "other").all(), df[["review_comment", "lang"]]
+    assert quarantine.all() and not english.any()
+
+
+def test_empty_reviews_are_not_quarantined():
+    _, (english, light, quarantine) = _routes(["", "   "])
+    assert not quarantine.any()
+
+
+class _Doc:
+    """Stand-in for a spaCy doc: one token per word, lemma = the word."""
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens, start = [], 0
+        for word in text.split(" "):
+            self.tokens.append(SimpleNamespace(idx=start, text=word, lemma_=word))
+            start += len(word) + 1
+
+    def __iter__(self):
+        return iter(self.tokens)
+
+
+def test_memo_keeps_the_words_it_saw_last(monkeypatch):
+    monkeypatch.setattr(clean_reviews, "_stop_words", {"the"})
+    memo = LemmaMemo(max_size=3)
+    memo.learn(_Doc("room staff food"))
+    memo.learn(_Doc("room view"))  # "room" is known: it is used again, "staff" is oldest
+    assert list(memo.table) == ["food", "room", "view"]
+    assert memo.lookup(["food"]) == ["food"]
+    memo.learn(_Doc("pool"))
+    assert list(memo.table) == ["view", "food", "pool"]
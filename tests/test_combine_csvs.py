@@ -0,0 +1,30 @@
+# tests/test_combine_csvs.py
+import pandas as pd
+import pytest
+
+from src.data.combine_csvs import combine_reviews
+from src.data.schema import SchemaError
+
+
+def _write(path, ids, rating=4.0):
+    pd.DataFrame({"hotel_name": "Haile Hawassa", "source": "booking", "review_id": ids,
+                  "rating_0_5": rating, "review_comment": [f"review {i}" for i in ids],
+                  "date": "2025-03-01"}).to_csv(path, index=False)
+
+
+def test_overlapping_scrapes_are_deduplicated(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    _write(raw / "first.csv", ["bk-1", "bk-2", "bk-2"])
+    _write(raw / "second.csv", ["bk-2", "bk-3"])
+    combined = combine_reviews(str(raw), str(tmp_path / "combined.csv"))
+    assert sorted(combined["review_id"]) == ["bk-1", "bk-2", "bk-3"]
+    assert len(pd.read_csv(tmp_path / "combined.csv")) == 3
+
+
+def test_invalid_rows_stop_the_run(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    _write(raw / "bad.csv", ["bk-1"], rating=9.0)
+    with pytest.raises(SchemaError, match="bad.csv"):
+        combine_reviews(str(raw), str(tmp_path / "combined.csv"))
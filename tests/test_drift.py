@@ -0,0 +1,34 @@
+# tests/test_drift.py
+import pandas as pd
+
+from src.monitoring.drift import MIN_ALERT_REVIEWS, MonitorStore, TrainingSnapshot, drift_report
+
+TRAIN_TEXTS = ["great pool and friendly staff", "cold shower no hot water", "lovely breakfast buffet"]
+
+
+def _reviews(texts, rating=4.0):
+    return pd.DataFrame({"hotel_name": "Haile Hawassa", "date": "2025-03-01", "review_title": "",
+                         "review_comment": texts, "clean_full_text": texts, "rating_0_5": rating})
+
+
+def _snapshot():
+    df = _reviews(TRAIN_TEXTS * 20)
+    vocabulary = {t for text in TRAIN_TEXTS for t in text.split()}
+    return TrainingSnapshot(df, {"sentiment": vocabulary})
+
+
+def test_batch_without_tokens_alerts_instead_of_failing():
+    snapshot = _snapshot()
+    batch = MonitorStore().ingest(_reviews(["", "!", "a"] * MIN_ALERT_REVIEWS), snapshot)
+    report = drift_report(batch, snapshot)
+    assert report["tokens"] == 0
+    assert report["token_js"] is None
+    assert any("No text tokens" in alert for alert in report["alerts"])
+
+
+def test_batch_like_training_has_no_token_alert():
+    snapshot = _snapshot()
+    batch = MonitorStore().ingest(_reviews(TRAIN_TEXTS * MIN_ALERT_REVIEWS), snapshot)
+    report = drift_report(batch, snapshot)
+    assert report["token_js"] < 0.01
+    assert not any("Token" in alert or "tokens" in alert for alert in report["alerts"])
@@ -0,0 +1,31 @@
+# tests/test_explain.py
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from src.modeling.explain import LinearExplainer
+
+TRAIN = ["great pool", "friendly staff", "lovely stay", "great food",
+         "cold shower", "dirty room", "rude staff", "bad food"]
+QUERIES = TRAIN + ["", "zzz qqq", "great but cold", "staff", "food was great and room dirty"]
+
+
+def _explainer(labels):
+    tfidf = TfidfVectorizer().fit(TRAIN)
+    model = LogisticRegression().fit(tfidf.transform(TRAIN), labels)
+    return LinearExplainer(tfidf, model), model, tfidf
+
+
+def test_binary_labels_match_predict():
+    # Imbalanced classes give a non-zero intercept, which decides texts without known words
+    explainer, model, tfidf = _explainer(["positive"] * 4 + ["other"] * 3 + ["positive"])
+    labels, _, _ = explainer.explain(QUERIES)
+    assert labels.tolist() == model.predict(tfidf.transform(QUERIES)).tolist()
+
+
+def test_multiclass_labels_match_predict():
+    explainer, model, tfidf = _explainer(["positive"] * 4 + ["negative"] * 2 + ["neutral"] * 2)
+    labels, terms, values = explainer.explain(QUERIES, k=2)
+    assert labels.tolist() == model.predict(tfidf.transform(QUERIES)).tolist()
+    assert terms.shape == values.shape == (len(QUERIES), 2)
+    assert (np.diff(values, axis=1) <= 0).all()
@@ -0,0 +1,99 @@
+# tests/test_inverted_index.py
+import numpy as np
+import pandas as pd
+
+from src.search.index_files import MAX_SEGMENTS
+from src.search.inverted_index import ReviewIndex, load_or_build
+
+
+def _reviews(texts):
+    return pd.DataFrame({"hotel_name": "h", "review_comment": texts})
+
+
+def _same_results(index, df, query, candidates=None):
+    got = index.search(query, candidates=candidates)
+    want = ReviewIndex.build(df).search(query, candidates=candidates)
+    return np.array_equal(got[0], want[0]) and np.allclose(got[1], want[1])
+
+
+def test_appended_rows_are_indexed_incrementally(tmp_path):
+    df = _reviews(["great pool", "cold shower", "friendly staff"])
+    load_or_build(df, tmp_path)
+    df = pd.concat([df, _reviews(["pool was cold"])], ignore_index=True)
+    index = load_or_build(df, tmp_path)
+    assert len(index.segments) == 2
+    assert _same_results(index, df, "pool cold")
+
+
+def test_rows_inserted_in_the_middle_are_indexed_incrementally(tmp_path):
+    old = _reviews(["great pool", "cold shower", "friendly staff", "cold pool"])
+    load_or_build(old, tmp_path)
+    # New reviews of each hotel land between the old ones when files are combined
+    df = pd.concat([old.iloc[:2], _reviews(["pool bar", "great staff"]), old.iloc[2:], _reviews(["cold bar"])],
+                   ignore_index=True)
+    index = load_or_build(df, tmp_path)
+    assert len(index.segments) == 2 and index.n_docs == len(df)
+    candidates = np.arange(len(df)) % 2 == 0
+    for query in ["pool cold", "staff bar", "great"]:
+        assert _same_results(index, df, query)
+        assert _same_results(index, df, query, candidates)
+    assert _same_results(ReviewIndex.load(tmp_path), df, "pool cold")
+
+
+def test_reordered_rows_reuse_the_index(tmp_path):
+    df = _reviews(["great pool", "cold shower", "friendly staff", "great pool"])
+    load_or_build(df, tmp_path)
+    df = df.iloc[[2, 0, 3, 1]].reset_index(drop=True)
+    index = load_or_build(df, tmp_path)
+    assert len(index.segments) == 1
+    assert _same_results(index, df, "pool staff cold")
+
+
+def test_removed_rows_are_dropped_from_the_index(tmp_path):
+    df = _reviews(["great pool", "cold shower", "friendly staff", "noisy bar"])
+    load_or_build(df, tmp_path)
+    df = pd.concat([df.drop(index=1), _reviews(["lovely garden"])], ignore_index=True)
+    index = load_or_build(df, tmp_path)
+    assert index.n_docs == len(df)
+    assert _same_results(index, df, "staff garden noisy shower")
+    assert df["review_comment"].iloc[index.search("garden")[0]].tolist() == ["lovely garden"]
+
+
+def test_edited_row_is_reindexed(tmp_path):
+    df = _reviews(["great pool", "cold shower"])
+    load_or_build(df, tmp_path)
+    df.loc[0, "review_comment"] = "broken lift"
+    index = load_or_build(df, tmp_path)
+    assert index.search("pool")[0].size == 0
+    assert index.search("lift")[0].tolist() == [0]
+
+
+def test_segments_are_compacted_automatically(tmp_path):
+    df = _reviews(["great pool"])
+    load_or_build(df, tmp_path)
+    for i in range(MAX_SEGMENTS + 2):
+        df = pd.concat([_reviews([f"pool staff {'very ' * i}cold"]), df], ignore_index=True)
+        index = load_or_build(df, tmp_path)
+        assert len(index.segments) <= MAX_SEGMENTS + 1
+    assert len(index.segments) < MAX_SEGMENTS
+    assert _same_results(index, df, "pool very cold")
+
+
+def test_save_replaces_files_of_the_previous_save(tmp_path):
+    df = _reviews(["great pool", "cold shower"])
+    index = load_or_build(df, tmp_path)
+    index.add_texts(["pool bar"]).compact().save(tmp_path)
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert len([f for f in files if f.startswith("segment_")]) == 1
+    assert ReviewIndex.load(tmp_path).n_docs == 3
+
+
+def test_repeated_texts_are_indexed_once_each(tmp_path):
+    df = _reviews(["great pool", "cold shower"])
+    load_or_build(df, tmp_path)
+    df = _reviews(["great pool", "cold shower", "great pool", "great pool"])
+    index = load_or_build(df, tmp_path)
+    assert index.search("pool")[0].tolist() == [0, 2, 3]
+    df = df.drop(index=2).reset_index(drop=True)
+    index = load_or_build(df, tmp_path)
+    assert index.n_docs == 3 and index.search("pool")[0].tolist() == [0, 2]
@@ -0,0 +1,84 @@
+# tests/test_rollups.py
+import pandas as pd
+import pytest
+
+from src.data.shared_table import SharedReviewTable, publish
+from src.eda import rollups
+from src.eda.rollups import RollupStore, load_or_build, new_rows, row_hashes
+
+
+def _reviews():
+    return pd.DataFrame({
+        "hotel_name": ["Haile Hawassa", "Haile Hawassa", "Haile Gondar", "Haile Gondar"],
+        "review_comment": ["great pool", "cold shower", "friendly staff", "noisy bar"],
+        "date": ["2025-01-03", "2025-01-20", "2025-02-11", "2025-03-02"],
+        "rating_0_5": [5.0, 2.0, 4.0, None],
+        "sentiment": ["positive", "negative", "positive", "neutral"],
+        "lda_topic": [0, 1, 2, 1],
+    })
+
+
+def _batch():
+    return pd.DataFrame({
+        "hotel_name": ["Haile Hawassa", "Haile Gondar"],
+        "review_comment": ["great pool", "lovely garden"],
+        "date": ["2025-01-03", "2025-03-15"],
+        "rating_0_5": [5.0, 3.0],
+        "sentiment": ["positive", "neutral"],
+        "lda_topic": [0, 2],
+    })
+
+
+def _tables_equal(a, b):
+    for g in rollups.GRANULARITIES:
+        pd.testing.assert_frame_equal(a.tables[g], b.tables[g], check_like=True,
+                                      check_index_type=False, check_dtype=False)
+
+
+def test_row_hashes_match_the_shared_arrow_table(tmp_path):
+    df = _reviews()
+    publish(df, tmp_path)
+    assert (row_hashes(SharedReviewTable(tmp_path).frame()) == row_hashes(df)).all()
+
+
+def test_new_rows_pairs_equal_reviews_one_to_one():
+    folded = row_hashes(_reviews())
+    both = pd.concat([_reviews().iloc[:2], _batch(), _reviews().iloc[2:]], ignore_index=True)
+    # The batch repeats the first review: one copy is new
+    assert new_rows(folded, row_hashes(both)).tolist() == [False, False, True, True, False, False]
+    assert new_rows(folded, row_hashes(_reviews().iloc[1:])) is None
+
+
+def test_published_table_plus_a_batch_is_ingested_not_rebuilt(tmp_path, monkeypatch):
+    shared, out = tmp_path / "shared", tmp_path / "rollups"
+    publish(_reviews(), shared)
+    load_or_build(SharedReviewTable(shared).frame(), out)
+
+    # New reviews land in the middle of the combined table
+    combined = pd.concat([_reviews().iloc[:2], _batch(), _reviews().iloc[2:]], ignore_index=True)
+    publish(combined, shared)
+    ingested = []
+    monkeypatch.setattr(RollupStore, "build", classmethod(lambda cls, df: pytest.fail("rebuilt")))
+    real_ingest = RollupStore.ingest
+    monkeypatch.setattr(RollupStore, "ingest", lambda self, df: ingested.append(len(df)) or real_ingest(self, df))
+    store = load_or_build(SharedReviewTable(shared).frame(), out)
+
+    assert ingested == [len(_batch())]
+    assert store.n_reviews == len(combined)
+    monkeypatch.undo()
+    _tables_equal(store, RollupStore.build(combined))
+    _tables_equal(RollupStore.load(out), store)
+
+
+def test_edited_rows_with_same_count_rebuild(tmp_path):
+    df = _reviews()
+    load_or_build(df, tmp_path)
+    edited = df.assign(rating_0_5=[1.0, 1.0, 1.0, 1.0])
+    store = load_or_build(edited, tmp_path)
+    assert store.trend("month")["rating_sum"].sum() == 4.0
+
+
+def test_ingested_batch_is_not_rebuilt(tmp_path):
+    df = _reviews()
+    RollupStore.build(df.iloc[:2]).ingest(df.iloc[2:]).save(tmp_path)
+    assert new_rows(RollupStore.load(tmp_path).hashes, row_hashes(df.iloc[::-1])).sum() == 0
@@ -0,0 +1,45 @@
+# tests/test_schema.py
+import pandas as pd
+import pytest
+
+from src.data.schema import SchemaError, read_reviews, write_reviews
+
+
+def _write(path, **columns):
+    base = {"hotel_name": ["h", "h", "h"], "review_comment": ["a", "b", "c"]}
+    pd.DataFrame({**base, **columns}).to_csv(path, index=False)
+
+
+def test_missing_topics_are_read_as_missing(tmp_path):
+    path = tmp_path / "reviews.csv"
+    _write(path, rating_0_5=[5.0, None, 3.0], lda_topic=[1, None, 2])
+    df = read_reviews(str(path))
+    assert str(df["lda_topic"].dtype) == "Int64"
+    assert df["lda_topic"].isna().tolist() == [False, True, False]
+    assert df["rating_0_5"].isna().tolist() == [False, True, False]
+
+
+@pytest.mark.parametrize("topic", ["x", 1.5])
+def test_present_topics_that_are_not_integers_fail(tmp_path, topic):
+    path = tmp_path / "reviews.csv"
+    _write(path, lda_topic=[1, topic, 2])
+    with pytest.raises(SchemaError, match="lda_topic"):
+        read_reviews(str(path))
+
+
+def test_old_rating_column_is_renamed_at_read_time(tmp_path):
+    path = tmp_path / "reviews.csv"
+    _write(path, rating_1_5=[5, 3, 1])
+    before = path.read_bytes()
+    df = read_reviews(str(path))
+    assert df["rating_0_5"].tolist() == [5.0, 3.0, 1.0]
+    assert df["sentiment"].tolist() == ["positive", "neutral", "negative"]
+    assert path.read_bytes() == before
+
+
+def test_written_files_read_back_at_the_current_version(tmp_path):
+    path = tmp_path / "reviews.csv"
+    df = pd.DataFrame({"hotel_name": ["h"], "review_comment": ["a"], "rating_0_5": [4.0],
+                       "sentiment": ["positive"], "lda_topic": pd.array([None], dtype="Int64")})
+    write_reviews(df, str(path))
+    pd.testing.assert_frame_equal(read_reviews(str(path)), df, check_dtype=False)
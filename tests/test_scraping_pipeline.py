@@ -0,0 +1,92 @@
+# tests/test_scraping_pipeline.py
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from src.scraping import pipeline as pipeline_module
+from src.scraping.pipeline import COLUMNS, ScrapePipeline, build_jobs
+
+# Reviews and pages per source in src/scraping/fixtures (all for haile_hawassa)
+FIXTURE_ROWS = {"booking": 12, "facebook": 6, "tripadvisor": 10, "tripdotcom": 8}
+FIXTURE_PAGES = {"booking": 3, "facebook": 2, "tripadvisor": 2, "tripdotcom": 2}
+
+
+def _run(tmp_path, **kwargs):
+    pipeline = ScrapePipeline(out_root=str(tmp_path), delay=0, parse_workers=1, **kwargs)
+    return pipeline.run(build_jobs(fixtures=True))
+
+
+def _rows_per_source(stats):
+    return {path.split("/")[-2]: n for path, n in stats["files"].items()}
+
+
+def test_fixture_pages_are_followed_and_written(tmp_path):
+    stats = _run(tmp_path)
+    assert stats["errors"] == []
+    assert stats["pages"] == sum(FIXTURE_PAGES.values())
+    assert _rows_per_source(stats) == FIXTURE_ROWS
+    assert stats["rows"] == sum(FIXTURE_ROWS.values())
+    for path, n in stats["files"].items():
+        df = pd.read_csv(path)
+        assert list(df.columns) == COLUMNS
+        assert len(df) == n
+        assert (df["hotel_name"] == "haile_hawassa").all()
+        assert df["review_id"].is_unique
+
+
+def test_max_pages_stops_following(tmp_path):
+    stats = _run(tmp_path, max_pages=1)
+    assert stats["errors"] == []
+    assert stats["pages"] == len(FIXTURE_PAGES)
+    assert all(n < FIXTURE_ROWS[source] for source, n in _rows_per_source(stats).items())
+
+
+def test_small_queues_and_batches_keep_every_row(tmp_path):
+    # A writer queue of one page and one-row batches exercise the back pressure path
+    stats = _run(tmp_path, queue_size=1, batch_size=1)
+    assert stats["errors"] == []
+    assert _rows_per_source(stats) == FIXTURE_ROWS
+
+
+def test_unreadable_page_is_counted_as_an_error(tmp_path):
+    jobs = build_jobs(["booking"], fixtures=True)
+    source = jobs[0][0]
+    jobs.append((source, "missing_hotel", (tmp_path / "missing" / "page1.html").as_uri()))
+    stats = ScrapePipeline(out_root=str(tmp_path), delay=0, parse_workers=1).run(jobs)
+    assert len(stats["errors"]) == 1 and "missing_hotel" not in "".join(stats["files"])
+    assert _rows_per_source(stats) == {"booking": FIXTURE_ROWS["booking"]}
+
+
+def _run_with_timeout(pipeline, jobs, timeout=120):
+    """pipeline.run(jobs) on a thread, so a hang fails the test instead of the suite."""
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(stats=pipeline.run(jobs)), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "pipeline.run did not return"
+    return result["stats"]
+
+
+def test_failing_writer_is_reported_and_run_returns(tmp_path):
+    # out_root is a file, so no output directory can be created
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    pipeline = ScrapePipeline(out_root=str(blocker), delay=0, parse_workers=1, queue_size=1, batch_size=1)
+    stats = _run_with_timeout(pipeline, build_jobs(fixtures=True))
+    assert stats["rows"] == 0 and stats["files"] == {}
+    assert len(stats["errors"]) == len(FIXTURE_ROWS)
+    assert all(e.startswith(f"write {blocker}") for e in stats["errors"])
+
+
+def test_broken_process_pool_is_reported_and_run_returns(tmp_path, monkeypatch):
+    class BrokenPool(pipeline_module.ProcessPoolExecutor):
+        def submit(self, *args, **kwargs):
+            raise BrokenProcessPool("a worker died")
+
+    monkeypatch.setattr(pipeline_module, "ProcessPoolExecutor", BrokenPool)
+    jobs = build_jobs(fixtures=True)
+    stats = _run_with_timeout(ScrapePipeline(out_root=str(tmp_path), delay=0, parse_workers=1), jobs)
+    assert stats["rows"] == 0
+    assert len(stats["errors"]) == len(jobs)
+    assert all("BrokenProcessPool" in e for e in stats["errors"])
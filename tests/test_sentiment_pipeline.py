@@ -0,0 +1,14 @@
+# tests/test_sentiment_pipeline.py
+import pandas as pd
+
+from src.modeling.sentiment_pipeline import prepare_data
+
+
+def test_short_english_reviews_are_trained_on():
+    df = pd.DataFrame({
+        "clean_full_text": ["great stay", "good", "nice stay", "gaarii dha"],
+        "rating_0_5": [5.0, 4.0, 2.0, 5.0],
+        "sentiment": ["positive", "positive", "negative", "positive"],
+        "lang": ["en", "und", "und", "om"],
+    })
+    assert prepare_data(df)["text"].tolist() == ["great stay", "good", "nice stay"]
@@ -0,0 +1,67 @@
+# tests/test_shared_table.py
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.schema import SchemaError
+from src.data.shared_table import (
+    KEEP_VERSIONS, SharedReviewTable, current_version, open_version, publish, select_rows,
+)
+
+
+def _reviews(n=6, hotel="Haile Hawassa"):
+    return pd.DataFrame({
+        "hotel_name": [hotel] * n,
+        "review_comment": [f"review {i}" for i in range(n)],
+        "rating_0_5": [5.0, 4.0, None, 2.0, 3.0, 1.0][:n],
+    })
+
+
+def test_publish_round_trips_through_the_memory_map(tmp_path):
+    version = publish(_reviews(), str(tmp_path))
+    assert current_version(str(tmp_path)) == version
+    df = open_version(os.path.join(tmp_path, version))
+    assert isinstance(df["rating_0_5"].dtype, pd.ArrowDtype)
+    assert df["review_comment"].tolist() == _reviews()["review_comment"].tolist()
+    # The schema's derived column is stored with the table
+    assert df["sentiment"].tolist()[:2] == ["positive", "positive"]
+
+
+def test_publish_rejects_a_bad_batch_and_keeps_the_current_version(tmp_path):
+    version = publish(_reviews(), str(tmp_path))
+    bad = _reviews().assign(rating_0_5=[9.0, 4.0, None, 2.0, 3.0, 1.0])
+    with pytest.raises(SchemaError, match="rating_0_5"):
+        publish(bad, str(tmp_path))
+    assert current_version(str(tmp_path)) == version
+
+
+def test_readers_switch_to_a_new_version_and_old_ones_are_pruned(tmp_path):
+    table = SharedReviewTable(str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        table.frame()
+    publish(_reviews(), str(tmp_path))
+    first = table.frame()
+    assert table.frame() is first  # unchanged pointer: no reopen
+
+    for i in range(KEEP_VERSIONS + 1):
+        publish(_reviews(hotel=f"Hotel {i}"), str(tmp_path))
+    assert table.frame()["hotel_name"].iloc[0] == f"Hotel {KEEP_VERSIONS}"
+    assert len([f for f in os.listdir(tmp_path) if f.endswith(".arrow")]) == KEEP_VERSIONS
+    # A frame opened before the prune stays readable
+    assert first["hotel_name"].iloc[0] == "Haile Hawassa"
+
+
+def test_select_rows_slices_contiguous_runs():
+    df = _reviews()
+    assert select_rows(df, np.ones(len(df), dtype=bool)) is df
+
+    run = np.array([False, True, True, True, False, False])
+    assert select_rows(df, run).index.tolist() == [1, 2, 3]
+
+    scattered = np.array([True, False, True, False, False, True])
+    assert select_rows(df, scattered).index.tolist() == [0, 2, 5]
+
+    empty = select_rows(df, np.zeros(len(df), dtype=bool))
+    assert empty.empty and list(empty.columns) == list(df.columns)
@@ -0,0 +1,74 @@
+# tests/test_similarity.py
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.search.similarity import SimilarityIndex, load_or_build
+
+TEXTS = ["great pool and friendly staff", "cold shower no hot water", "friendly staff at the bar",
+         "the pool was cold", "hot water in the shower", "noisy bar at night"]
+
+
+def _tfidf():
+    return TfidfVectorizer().fit(TEXTS + ["lovely garden view", "garden breakfast"])
+
+
+def _reviews(texts):
+    return pd.DataFrame({"clean_full_text": texts})
+
+
+def _assert_matches_build(index, df, tfidf):
+    want = SimilarityIndex.build(df["clean_full_text"], tfidf)
+    assert index.n_docs == len(df)
+    for row in range(len(df)):
+        # n covers every review, so ties cannot cut the lists differently
+        got_ids, got_scores = index.similar(row, n=len(df))
+        want_ids, want_scores = want.similar(row, n=len(df))
+        assert set(got_ids) == set(want_ids)
+        np.testing.assert_allclose(got_scores, want_scores, rtol=1e-5)
+        # Precomputed lists, and on-demand ranking over a candidate mask
+        got_ids, got_scores = index.similar(row, n=3)
+        np.testing.assert_allclose(got_scores, want.similar(row, n=3)[1], rtol=1e-5)
+        candidates = np.arange(len(df)) % 2 == 1
+        assert index.similar(row, n=2, candidates=candidates)[0].tolist() == \
+            want.similar(row, n=2, candidates=candidates)[0].tolist()
+
+
+def test_appended_rows_are_added_incrementally(tmp_path):
+    tfidf = _tfidf()
+    df = _reviews(TEXTS[:4])
+    load_or_build(df, tfidf, tmp_path)
+    df = _reviews(TEXTS)
+    index = load_or_build(df, tfidf, tmp_path)
+    assert len(index.segments) == 2
+    _assert_matches_build(index, df, tfidf)
+
+
+def test_rows_inserted_in_the_middle_are_added_incrementally(tmp_path):
+    tfidf = _tfidf()
+    load_or_build(_reviews(TEXTS[:4]), tfidf, tmp_path)
+    df = _reviews(TEXTS[:1] + ["lovely garden view", "garden breakfast"] + TEXTS[1:])
+    index = load_or_build(df, tfidf, tmp_path)
+    assert len(index.segments) == 2
+    _assert_matches_build(index, df, tfidf)
+    _assert_matches_build(SimilarityIndex.load(tfidf, tmp_path), df, tfidf)
+
+
+def test_removed_rows_are_dropped_and_their_neighbours_recomputed(tmp_path):
+    tfidf = _tfidf()
+    df = _reviews(TEXTS)
+    load_or_build(df, tfidf, tmp_path)
+    df = pd.concat([df.drop(index=1), _reviews(["lovely garden view"])], ignore_index=True)
+    index = load_or_build(df, tfidf, tmp_path)
+    _assert_matches_build(index, df, tfidf)
+    assert SimilarityIndex.load(tfidf, tmp_path).n_docs == len(df)
+
+
+def test_removed_rows_with_a_small_k(tmp_path):
+    # With k=1 most lists lose their only neighbour
+    tfidf = _tfidf()
+    index = SimilarityIndex.build(TEXTS, tfidf, k=1)
+    index.keep(np.array([5, 3, 2, 0]))
+    want = SimilarityIndex.build([TEXTS[i] for i in [5, 3, 2, 0]], tfidf, k=1)
+    np.testing.assert_array_equal(index.neighbors, want.neighbors)
+    np.testing.assert_allclose(index.scores, want.scores, rtol=1e-5)
@@ -0,0 +1,17 @@
+# tests/test_synthetic_reviews.py
+import os
+
+import pandas as pd
+
+from src.benchmarks.synthetic_reviews import write_raw_dir
+from src.data.combine_csvs import combine_reviews
+
+
+def test_rewriting_a_raw_dir_replaces_its_files(tmp_path):
+    raw_dir = str(tmp_path / "raw")
+    write_raw_dir(500, raw_dir, chunk_size=200)
+    write_raw_dir(300, raw_dir, chunk_size=200)
+    files = os.listdir(raw_dir)
+    assert sum(len(pd.read_csv(os.path.join(raw_dir, f))) for f in files) == 300
+    combined = combine_reviews(raw_dir=raw_dir, out_file=str(tmp_path / "combined.csv"))
+    assert len(combined) == 300
@@ -0,0 +1,32 @@
+# tests/test_topic_labeling.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.preprocessing.topic_labeling import AspectTagger, label_topics, review_texts
+
+REVIEWS = pd.DataFrame({
+    "review_title": ["Great pool", None, "Fine"],
+    "review_comment": ["The front desk staff were kind. Hot water never worked",
+                       "Lovely lake view from the room", "Nothing to report"],
+})
+
+
+def test_topics_name_the_aspects_in_order_of_mention():
+    df, _ = label_topics(REVIEWS.copy())
+    assert df["topics"].tolist() == ["pool|reception|staff|maintenance", "view|rooms", "general"]
+
+
+def test_matrix_from_stored_topics_matches_tagging():
+    tagger = AspectTagger()
+    df, matrix = label_topics(REVIEWS.copy(), tagger)
+    stored = pd.Series(df["topics"].tolist() + [None], dtype="str")
+    rebuilt = tagger.matrix(stored)
+    assert rebuilt.shape == (len(df) + 1, len(tagger.aspects))
+    np.testing.assert_array_equal(rebuilt[:len(df)].toarray(), matrix.toarray())
+    assert rebuilt[len(df)].nnz == 0
+
+
+def test_table_without_text_columns_is_a_clear_error():
+    with pytest.raises(ValueError, match="review_comment"):
+        review_texts(pd.DataFrame({"hotel_name": ["h"]}))
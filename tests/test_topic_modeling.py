@@ -0,0 +1,24 @@
+# tests/test_topic_modeling.py
+import joblib
+import pandas as pd
+import pytest
+
+from src.modeling.topic_modeling import lda_topics
+
+
+def _reviews(langs):
+    texts = ["pool water cold pool", "staff friendly staff", "breakfast buffet coffee", "sauna gym massage"]
+    return pd.DataFrame({"clean_full_text": texts, "lang": langs})
+
+
+def test_short_english_reviews_are_fitted_on(tmp_path):
+    df, _ = lda_topics(_reviews(["en", "und", "und", "om"]), n_topics=2, model_dir=tmp_path)
+    vocabulary = joblib.load(tmp_path / "lda_topics.joblib")["vectorizer"].vocabulary_
+    assert {"staff", "breakfast"} <= set(vocabulary)
+    assert "sauna" not in vocabulary
+    assert df["lda_topic"].notna().all()
+
+
+def test_no_english_reviews_is_a_clear_error(tmp_path):
+    with pytest.raises(ValueError, match="No English reviews"):
+        lda_topics(_reviews(["om", "am", "other", "mixed"]), n_topics=2, model_dir=tmp_path)